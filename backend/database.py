@@ -1,31 +1,118 @@
-# [database] DB 연결 설정 파일
+# [database] DB 연결 설정 파일 - 엔진은 처음 사용할 때 생성 (import 만으로는 드라이버 로딩/연결 없음)
+import threading
 from sqlalchemy import create_engine
-from sqlalchemy.orm import declarative_base
-from sqlalchemy.orm import sessionmaker
-from dotenv import load_dotenv
-import os
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.orm import Session, declarative_base, sessionmaker
+from settings import get_settings
 
-# [dotenv] .env 파일에서 환경변수 로드
-load_dotenv()
+# [settings] DB URL/풀 설정
+settings = get_settings()
 
-# [env] .env 파일에서 DB URL 가져오기
-DATABASE_URL = os.getenv("DATABASE_URL")
-if not DATABASE_URL:
-    raise ValueError("DATABASE_URL is not set")
+# [const] 동기 드라이버 -> 비동기 드라이버 매핑
+ASYNC_DRIVERS = {
+    "mysql": "mysql+aiomysql",
+    "mariadb": "mariadb+aiomysql",
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
 
-# [engine] DB 연결 엔진 생성
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+# [state] 지연 생성 엔진/세션 팩토리
+_engine: Engine | None = None
+_async_engine = None
+_async_session_factory = None
+_engine_lock = threading.Lock()
+_session_factory = sessionmaker(autocommit=False, autoflush=False)
+
+
+# [function] 동기 DB URL 을 비동기 드라이버 URL 로 변환 (psycopg 3 는 동기/비동기 겸용이라 그대로 사용)
+def to_async_url(url: str) -> str:
+    parsed = make_url(url)
+    if parsed.drivername == "postgresql+psycopg":
+        return url
+    async_driver = ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if not async_driver:
+        return url
+    return parsed.set(drivername=async_driver).render_as_string(hide_password=False)
+
+
+# [function] DB URL 확인
+def _database_url() -> str:
+    if not settings.database_url:
+        raise ValueError("DATABASE_URL is not set")
+    return settings.database_url
+
+
+# [function] 엔진 공통 옵션 - 끊긴 연결 사전 확인 + 풀 크기/오버플로/타임아웃/재활용 주기
+def _engine_options(url: str) -> dict:
+    options = {"pool_pre_ping": True}
+    if make_url(url).get_backend_name() != "sqlite":
+        options.update(
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+            pool_recycle=settings.db_pool_recycle,
+        )
+    return options
+
+
+# [engine] 백그라운드 워커/스크립트용 동기 엔진 (최초 호출 시 생성)
+def get_engine() -> Engine:
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            url = _database_url()
+            _engine = create_engine(url, **_engine_options(url))
+        return _engine
+
+
+# [engine] API 라우터용 비동기 엔진 - DB 대기 중에도 이벤트 루프를 막지 않음 (최초 호출 시 생성)
+def get_async_engine():
+    global _async_engine, _async_session_factory
+    with _engine_lock:
+        if _async_engine is None:
+            from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+            url = settings.async_database_url or to_async_url(_database_url())
+            _async_engine = create_async_engine(
+                url,
+                **_engine_options(settings.async_database_url or _database_url()),
+            )
+            # [session] commit 후에도 조회한 값을 다시 읽지 않도록 expire 비활성화
+            _async_session_factory = async_sessionmaker(
+                _async_engine,
+                autoflush=False,
+                expire_on_commit=False,
+            )
+        return _async_engine
+
+
+# [session] 동기 DB 세션 생성 (기존 sessionmaker 처럼 호출)
+def SessionLocal(**kwargs) -> Session:
+    return _session_factory(bind=get_engine(), **kwargs)
+
+
+# [session] 비동기 DB 세션 생성 (기존 async_sessionmaker 처럼 호출)
+def AsyncSessionLocal(**kwargs):
+    get_async_engine()
+    return _async_session_factory(**kwargs)
+
+
+# [function] 생성된 엔진의 커넥션 풀 정리 (서버 종료 시, 만들지 않은 엔진은 건너뜀)
+async def dispose_engines() -> None:
+    global _engine, _async_engine, _async_session_factory
+    with _engine_lock:
+        engine, async_engine = _engine, _async_engine
+        _engine = _async_engine = _async_session_factory = None
+    if async_engine is not None:
+        await async_engine.dispose()
+    if engine is not None:
+        engine.dispose()
 
-# [session] DB 세션 팩토리 생성
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 # [Base] 모든 모델 클래스가 상속받는 베이스 클래스
 Base = declarative_base()
 
-# [dependency] 라우터에서 DB 세션을 주입받기 위한 함수
-def get_db():
-    db = SessionLocal()
-    try:
+# [dependency] 라우터에서 비동기 DB 세션을 주입받기 위한 함수
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
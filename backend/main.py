@@ -1,12 +1,52 @@
 # [FastAPI] 앱 진입점 - 서버 시작 시 가장 먼저 실행되는 파일
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from database import Base, engine
-from models import summary as summary_models  # noqa: F401
-from routers import summarize
+from database import dispose_engines, get_engine
+from models import summary as summary_models
+from routers import cache, metrics, qa, search, summarize
+from services import (
+    job_service,
+    llm_service,
+    metrics_service,
+    pdf_service,
+    profiling_service,
+    request_limit_service,
+    shared_state_service,
+    warmup_service,
+)
+from settings import get_settings
+
+# [settings] 시작 시 테이블 자동 생성 여부 (serve.py 는 워커 기동 전에 한 번만 만들고 워커에서는 끔)
+AUTO_CREATE_TABLES = get_settings().auto_create_tables
+
+
+# [lifespan] 시작: 테이블 생성 + 공유 상태 준비 + Gemini HTTP 커넥션 풀 + 예열 + 요약 워커 기동
+#            종료: 요약 워커, Gemini HTTP 커넥션 풀, OCR 프로세스 풀, DB 커넥션 풀 정리 + 멀티 워커 메트릭에서 이 프로세스 제외
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if AUTO_CREATE_TABLES:
+        summary_models.create_tables(get_engine())
+    shared_state_service.initialize()
+    await llm_service.init_http_client()
+    await warmup_service.warm_up()
+    await job_service.start_workers()
+    try:
+        yield
+    finally:
+        await job_service.stop_workers()
+        await llm_service.close_http_client()
+        pdf_service.shutdown_ocr_executor()
+        await dispose_engines()
+        metrics_service.mark_process_dead()
+
 
 # [instance] FastAPI 앱 인스턴스 생성
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
+
+# [middleware] 업로드 요청 전체 크기 제한 (multipart 본문 파싱 전에 검사)
+# CORS 보다 먼저 등록해 CORS 가 감싸도록 함 - 413 응답에도 Access-Control-Allow-Origin 이 붙어 브라우저가 상태 코드를 읽을 수 있음
+app.add_middleware(request_limit_service.RequestSizeLimitMiddleware)
 
 # [middleware] CORS 허용 설정 (개발 환경)
 app.add_middleware(
@@ -17,10 +57,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# [startup] 서버 시작 시 테이블 자동 생성
-@app.on_event("startup")
-def on_startup():
-    Base.metadata.create_all(bind=engine)
+# [middleware] 요청 단위 프로파일링 훅 (PROFILING_ENABLED=true 일 때 ?profile=1 요청만)
+app.middleware("http")(profiling_service.profile_request)
 
 # [router] summarize 라우터 등록 - /summarize 관련 엔드포인트 연결
 app.include_router(summarize.router, prefix="/api")
+# [router] search 라우터 등록 - 청크 임베딩 유사도 검색 엔드포인트 연결
+app.include_router(search.router, prefix="/api")
+# [router] cache 라우터 등록 - 캐시 통계 엔드포인트 연결
+app.include_router(cache.router, prefix="/api")
+# [router] qa 라우터 등록 - 저장된 청크 기반 질의응답 엔드포인트 연결
+app.include_router(qa.router, prefix="/api")
+# [router] metrics 라우터 등록 - Prometheus 수집용 /metrics 엔드포인트 연결 (prefix 없음)
+app.include_router(metrics.router)
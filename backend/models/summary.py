@@ -1,7 +1,73 @@
 # [Model] DB 테이블과 매핑되는 클래스 - 테이블 구조 정의
-from sqlalchemy import Column, Integer, String, Text, DateTime
+import gzip
+from sqlalchemy import Column, Index, Integer, LargeBinary, String, Text, DateTime, text
+from sqlalchemy.dialects import mysql
+from sqlalchemy.orm import deferred
+from sqlalchemy.types import TypeDecorator
 from datetime import datetime
 from database import Base
+from settings import get_settings
+
+try:
+    from pgvector.sqlalchemy import Vector
+except ImportError:
+    Vector = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# [settings] 임베딩 차원, HNSW 인덱스 파라미터 (pgvector 컬럼/인덱스 정의에 사용, 메모리 인덱스와 같은 값)
+settings = get_settings()
+EMBEDDING_DIM = settings.embedding_dim
+HNSW_M = settings.hnsw_m
+HNSW_EF_CONSTRUCTION = settings.hnsw_ef_construction
+# [const] PostgreSQL + pgvector 패키지가 있으면 vector 컬럼, 그 외에는 float32 바이너리 컬럼 사용
+USE_PGVECTOR = Vector is not None and (settings.database_url or "").startswith("postgresql")
+
+# [settings] 원문 압축 방식 (gzip | zstd, zstd 는 zstandard 패키지가 없으면 gzip 사용) 및 압축 레벨
+TEXT_COMPRESSION = settings.text_compression
+TEXT_COMPRESSION_LEVEL = settings.text_compression_level
+
+# [const] 압축 형식 판별용 매직 넘버 (설정을 바꿔도 기존 데이터는 그대로 읽힘)
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+# [class] 압축 텍스트 컬럼 타입 - 문자열을 gzip/zstd 로 압축해 바이너리(MariaDB LONGBLOB)로 저장
+class CompressedText(TypeDecorator):
+    impl = LargeBinary
+    cache_ok = True
+
+    # [function] MySQL/MariaDB 는 BLOB(64KB) 대신 LONGBLOB 사용
+    def load_dialect_impl(self, dialect):
+        if dialect.name in ("mysql", "mariadb"):
+            return dialect.type_descriptor(mysql.LONGBLOB())
+        return dialect.type_descriptor(LargeBinary())
+
+    # [function] 저장 시 압축
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        data = value.encode("utf-8")
+        if TEXT_COMPRESSION == "zstd" and zstandard is not None:
+            return zstandard.ZstdCompressor(level=TEXT_COMPRESSION_LEVEL).compress(data)
+        return gzip.compress(data, compresslevel=TEXT_COMPRESSION_LEVEL, mtime=0)
+
+    # [function] 조회 시 매직 넘버로 형식을 판별해 해제
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        data = bytes(value)
+        if data.startswith(ZSTD_MAGIC):
+            if zstandard is None:
+                raise RuntimeError("zstandard is required to read zstd-compressed text")
+            data = zstandard.ZstdDecompressor().decompress(data)
+        elif data.startswith(GZIP_MAGIC):
+            data = gzip.decompress(data)
+        return data.decode("utf-8")
+
 
 # [class] Summary 테이블 정의 - 요약 결과를 저장하는 테이블
 class Summary(Base):
@@ -12,12 +78,10 @@ class Summary(Base):
     id = Column(Integer, primary_key=True, index=True)
     # [Field] 업로드된 원본 파일명
     original_filename = Column(String(255), nullable=False)
-    # [Field] 원본 전체 텍스트
-    original_text = Column(Text, nullable=False)
     # [Field] AI가 생성한 제목
     summary_title = Column(String(255), nullable=True)
-    # [Field] AI가 생성한 요약문
-    summary_text = Column(Text, nullable=True)
+    # [Field] AI가 생성한 요약문 (지연 로딩 - 필요한 조회에서만 명시적으로 선택)
+    summary_text = deferred(Column(Text, nullable=True))
     # [Field] 처리 상태 (PENDING | COMPLETED | FAILED)
     status = Column(String(20), nullable=False, default="PENDING")
     # [Field] 실패 시 에러 메시지
@@ -32,6 +96,39 @@ class Summary(Base):
         nullable=False,
     )
 
+    # [index] 목록 조회용 - (created_at, id) 키셋 페이지네이션, 상태 필터, 파일명 접두사 필터
+    __table_args__ = (
+        Index("ix_documents_created_at_id", "created_at", "id"),
+        Index("ix_documents_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_documents_original_filename", "original_filename"),
+    )
+
+
+# [class] DocumentText 테이블 정의 - 원본 전체 텍스트를 documents 행 밖에 압축 저장
+class DocumentText(Base):
+    # [table] 테이블명
+    __tablename__ = "document_texts"
+
+    # [PK] 문서 ID (documents.id 와 1:1)
+    document_id = Column(Integer, primary_key=True)
+    # [Field] 원본 전체 텍스트 (gzip/zstd 압축)
+    original_text = Column(CompressedText, nullable=False)
+    # [Field] 생성 시각
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+# [class] DocumentSignature 테이블 정의 - 유사 중복 탐지용 원문 MinHash 서명
+class DocumentSignature(Base):
+    # [table] 테이블명
+    __tablename__ = "document_signatures"
+
+    # [PK] 문서 ID (documents.id 와 1:1)
+    document_id = Column(Integer, primary_key=True)
+    # [Field] MinHash 서명 (uint32 배열 바이너리)
+    minhash = Column(LargeBinary, nullable=False)
+    # [Field] 생성 시각
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
 
 # [class] DocumentChunk 테이블 정의 - 원문 청크와 임베딩 저장
 class DocumentChunk(Base):
@@ -46,7 +143,36 @@ class DocumentChunk(Base):
     chunk_index = Column(Integer, nullable=False)
     # [Field] 청크 텍스트
     chunk_text = Column(Text, nullable=False)
-    # [Field] 임베딩 JSON 문자열
-    embedding_json = Column(Text, nullable=False)
+    # [Field] 청크 시작 페이지 (1부터)
+    page_start = Column(Integer, nullable=True)
+    # [Field] 청크 끝 페이지 (1부터)
+    page_end = Column(Integer, nullable=True)
+    # [Field] 임베딩 벡터 (pgvector 또는 float32 바이너리)
+    embedding = Column(
+        Vector(EMBEDDING_DIM) if USE_PGVECTOR else LargeBinary,
+        nullable=False,
+    )
+    # [Field] 임베딩 모델 - 유사 문서 임베딩 재사용 시 같은 모델의 벡터만 사용 (이전 스키마에서 옮긴 행은 NULL)
+    embedding_model = Column(String(100), nullable=True)
     # [Field] 생성 시각
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    # [index] pgvector 사용 시 코사인 거리 HNSW 인덱스
+    if USE_PGVECTOR:
+        __table_args__ = (
+            Index(
+                "ix_document_chunks_embedding_hnsw",
+                "embedding",
+                postgresql_using="hnsw",
+                postgresql_with={"m": HNSW_M, "ef_construction": HNSW_EF_CONSTRUCTION},
+                postgresql_ops={"embedding": "vector_cosine_ops"},
+            ),
+        )
+
+
+# [function] 테이블 생성 - pgvector 면 vector 확장을 먼저 만든 뒤 create_all (확장이 없으면 vector 컬럼 생성 실패)
+def create_tables(engine) -> None:
+    if USE_PGVECTOR:
+        with engine.begin() as connection:
+            connection.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
+    Base.metadata.create_all(bind=engine)
@@ -19,3 +19,39 @@ SUMMARIZE_PROMPT = """
 입력 텍스트:
 {text}
 """
+
+# [str] 구간 요약 프롬프트 (map 단계) - 긴 문서의 일부 구간을 부분 요약
+SUMMARIZE_MAP_PROMPT = """
+너는 문서 요약기다.
+아래 텍스트는 긴 문서의 일부 구간이다. 이 구간의 내용을 한국어로 요약해라.
+
+규칙:
+1) 5~8문장의 일반 텍스트로만 작성한다. (JSON, 마크다운 금지)
+2) 수치, 고유명사, 결론 등 핵심 사실은 빠뜨리지 않는다.
+3) 구간에 없는 내용은 추측하지 않는다.
+
+입력 텍스트:
+{text}
+"""
+
+# [str] 부분 요약 통합 프롬프트 (reduce 단계) - 부분 요약들로 최종 제목/요약 생성
+SUMMARIZE_REDUCE_PROMPT = """
+너는 문서 요약기다.
+아래는 하나의 긴 문서를 앞에서부터 순서대로 구간별 요약한 결과다.
+전체 문서에 대한 한국어 제목과 요약을 작성해라.
+
+규칙:
+1) 반드시 JSON만 출력한다.
+2) 키는 정확히 "title", "summary"만 사용한다.
+3) title은 1줄로 작성한다.
+4) summary는 아래 3개 섹션을 반드시 이 순서로 포함한다.
+   - **요약**
+   - **핵심 내용 분석**
+   - **추가고려사항**
+5) 각 섹션은 2~4문장으로 작성하고, 전체 summary는 가독성 있는 줄바꿈을 포함한다.
+6) JSON 외 설명 문장, 코드블록 마크다운은 절대 포함하지 않는다.
+7) 특정 구간에 치우치지 말고 문서 전체 내용을 고르게 반영한다.
+
+구간별 요약:
+{text}
+"""
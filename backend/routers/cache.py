@@ -0,0 +1,16 @@
+# [Router] 캐시 상태 조회 엔드포인트
+from fastapi import APIRouter
+from schemas.cache import CacheStatsResponse
+from services import cache_service
+
+# [instance] 라우터 인스턴스 생성
+router = APIRouter()
+
+
+# [GET] 캐시 적중/실패 통계 조회
+@router.get("/cache/stats", response_model=CacheStatsResponse)
+async def get_cache_stats():
+    return {
+        "enabled": cache_service.CACHE_ENABLED,
+        "caches": cache_service.get_cache_stats(),
+    }
@@ -0,0 +1,17 @@
+# [Router] Prometheus 메트릭 노출 엔드포인트
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import Response
+from services import metrics_service
+
+# [instance] 라우터 인스턴스 생성
+router = APIRouter()
+
+
+# [GET] Prometheus 텍스트 형식 메트릭 (prometheus_client 미설치 또는 METRICS_ENABLED=false 면 503)
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    rendered = metrics_service.render_latest()
+    if rendered is None:
+        raise HTTPException(status_code=503, detail="METRICS_DISABLED")
+    body, content_type = rendered
+    return Response(content=body, media_type=content_type)
@@ -0,0 +1,34 @@
+# [Router] 저장된 청크 기반 질의응답 엔드포인트 (문서 하나 / 전체 문서)
+import logging
+from fastapi import APIRouter, HTTPException
+from schemas.qa import AskRequest, AskResponse
+from services import qa_service
+from services.llm_service import GeminiServiceError
+
+# [instance] 라우터 인스턴스 생성
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+
+# [function] 질의응답 실행 - 서비스 에러 코드를 HTTP 응답으로 변환
+async def _ask(body: AskRequest, document_id: int | None) -> dict:
+    try:
+        return await qa_service.answer(body.question, document_id=document_id, top_k=body.top_k)
+    except ValueError as exc:
+        code = str(exc)
+        raise HTTPException(status_code=404 if code == "NOT_FOUND" else 400, detail=code) from exc
+    except GeminiServiceError as exc:
+        logger.warning("Gemini failed for ask document_id=%s detail=%s", document_id, exc.detail)
+        raise HTTPException(status_code=502, detail="GEMINI_FAILED") from exc
+
+
+# [POST] 문서 하나에 대한 질문 - 그 문서의 청크만 검색해 답변
+@router.post("/summaries/{id}/ask", response_model=AskResponse)
+async def ask_summary(id: int, body: AskRequest):
+    return await _ask(body, id)
+
+
+# [POST] 전체 문서에 대한 질문 - 모든 문서의 청크를 검색해 답변
+@router.post("/ask", response_model=AskResponse)
+async def ask_all(body: AskRequest):
+    return await _ask(body, None)
@@ -0,0 +1,103 @@
+# [Router] 청크 임베딩 유사도 검색 엔드포인트
+import asyncio
+import logging
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import get_db
+from models.summary import DocumentChunk, Summary
+from schemas.search import SearchResponse
+from services import llm_service, vector_service
+from services.llm_service import GeminiServiceError
+from settings import get_settings
+
+# [instance] 라우터 인스턴스 생성
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# [settings] 검색 결과 개수 설정
+settings = get_settings()
+SEARCH_DEFAULT_TOP_K = settings.search_default_top_k
+SEARCH_MAX_TOP_K = settings.search_max_top_k
+
+
+# [GET] 질의 임베딩 후 유사 청크/문서 top-k 검색
+@router.get("/search", response_model=SearchResponse)
+async def search(
+    q: str = Query(..., min_length=1),
+    top_k: int = Query(SEARCH_DEFAULT_TOP_K, ge=1),
+    db: AsyncSession = Depends(get_db),
+):
+    if not q.strip():
+        raise HTTPException(status_code=400, detail="INVALID_QUERY")
+    top_k = min(top_k, SEARCH_MAX_TOP_K)
+
+    try:
+        query_vector = await llm_service.embed_text(q)
+    except GeminiServiceError as exc:
+        logger.warning("Gemini failed for search detail=%s", exc.detail)
+        raise HTTPException(status_code=502, detail="GEMINI_FAILED") from exc
+
+    hits = await asyncio.to_thread(vector_service.search_chunks, query_vector, top_k)
+    if not hits:
+        return {"query": q, "chunks": [], "documents": []}
+
+    # [load] 검색된 청크/문서의 표시용 컬럼만 조회
+    chunk_rows = (
+        await db.execute(
+            select(
+                DocumentChunk.document_id,
+                DocumentChunk.chunk_index,
+                DocumentChunk.page_start,
+                DocumentChunk.page_end,
+                DocumentChunk.chunk_text,
+            ).where(
+                or_(
+                    *(
+                        and_(
+                            DocumentChunk.document_id == document_id,
+                            DocumentChunk.chunk_index == chunk_index,
+                        )
+                        for document_id, chunk_index, _score in hits
+                    )
+                )
+            )
+        )
+    ).all()
+    chunks_by_key = {(row.document_id, row.chunk_index): row for row in chunk_rows}
+
+    document_ids = {document_id for document_id, _chunk_index, _score in hits}
+    document_rows = (
+        await db.execute(
+            select(Summary.id, Summary.summary_title, Summary.original_filename)
+            .where(Summary.id.in_(document_ids))
+        )
+    ).all()
+    documents_by_id = {row.id: row for row in document_rows}
+
+    chunks = []
+    documents = {}
+    for document_id, chunk_index, score in hits:
+        row = chunks_by_key.get((document_id, chunk_index))
+        document = documents_by_id.get(document_id)
+        if not row or not document:
+            continue
+        chunks.append(
+            {
+                "document_id": document_id,
+                "chunk_index": chunk_index,
+                "page_start": row.page_start,
+                "page_end": row.page_end,
+                "text": row.chunk_text,
+                "score": score,
+            }
+        )
+        if document_id not in documents:
+            documents[document_id] = {
+                "document_id": document_id,
+                "title": document.summary_title,
+                "filename": document.original_filename,
+                "score": score,
+            }
+
+    return {"query": q, "chunks": chunks, "documents": list(documents.values())}
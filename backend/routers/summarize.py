@@ -1,144 +1,475 @@
 # [Router] 엔드포인트 정의 및 서비스 호출
+import asyncio
+import base64
+import binascii
 import json
 import logging
-import os
-from fastapi import APIRouter, UploadFile, File, Depends, HTTPException
-from fastapi.responses import PlainTextResponse
-from sqlalchemy.orm import Session
-from database import get_db
-from models.summary import Summary, DocumentChunk
-from schemas.summary import BatchResponse, SummaryListItemResponse, SummaryResponse
-from services import pdf_service, llm_service
-from services.llm_service import GeminiServiceError
+import time
+from datetime import datetime
+from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import AsyncSessionLocal, get_db
+from models.summary import Summary
+from schemas.summary import BatchResponse, SummaryListResponse, SummaryResponse
+from services import download_service, job_service
+from services.job_service import normalize_error_code
+from settings import get_settings
 
 # [instance] 라우터 인스턴스 생성
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
-# [const] 외부 노출 허용 에러 코드
-ALLOWED_ERROR_CODES = {
-    "INVALID_FILE",
-    "PDF_PARSE_FAILED",
-    "GEMINI_FAILED",
-    "DB_ERROR",
-}
+# [settings] 배치/파일 설정값
+settings = get_settings()
+MAX_UPLOAD_FILES = settings.max_upload_files
+MAX_FILE_SIZE_MB = settings.max_file_size_mb
 
-# [const] 배치/파일/청킹 설정값
-MAX_UPLOAD_FILES = int(os.getenv("MAX_UPLOAD_FILES", "10"))
-MAX_FILE_SIZE_MB = int(os.getenv("MAX_FILE_SIZE_MB", "20"))
-CHUNK_SIZE = int(os.getenv("CHUNK_SIZE", "1200"))
-CHUNK_OVERLAP = int(os.getenv("CHUNK_OVERLAP", "200"))
+# [settings] 목록 조회 페이지 크기 설정
+SUMMARY_LIST_DEFAULT_LIMIT = settings.summary_list_default_limit
+SUMMARY_LIST_MAX_LIMIT = settings.summary_list_max_limit
 
+# [settings] 다운로드 압축 기준 크기, 스트리밍 조각/내보내기 배치 크기
+DOWNLOAD_COMPRESS_MIN_BYTES = settings.download_compress_min_bytes
+DOWNLOAD_CHUNK_BYTES = settings.download_chunk_bytes
+EXPORT_BATCH_SIZE = settings.export_batch_size
 
-# [function] 예외를 표준 에러 코드로 정규화
-def normalize_error_code(exc: Exception) -> str:
-    code = str(exc).strip()
-    if code in ALLOWED_ERROR_CODES:
-        return code
-    return "DB_ERROR"
+# [settings] 진행 스트림이 이벤트 없이 기다리는 최대 시간(초) - 지나면 DB 에서 상태 확인
+BATCH_STREAM_POLL_SECONDS = settings.batch_stream_poll_seconds
 
+# [const] 상태별 배치 결과 메시지
+STATUS_MESSAGES = {
+    "PENDING": "queued",
+    "COMPLETED": "processed",
+}
 
-# [POST] PDF 다중 업로드 및 순차 요약 요청
-@router.post("/summarize/batch", response_model=BatchResponse)
-async def summarize_batch(files: list[UploadFile] = File(...), db: Session = Depends(get_db)):
+# [const] 일괄 내보내기 형식
+EXPORT_FORMATS = ("zip", "ndjson")
+
+
+# [function] 업로드 파일 검증
+def _validate_files(files: list[UploadFile]) -> None:
     if not files:
         raise HTTPException(status_code=400, detail="INVALID_FILE")
     if len(files) > MAX_UPLOAD_FILES:
         raise HTTPException(status_code=400, detail="INVALID_FILE")
 
+
+# [function] 업로드 파일 접수 - 파일별 배치 결과 아이템 목록 반환 (progress_queue 가 있으면 진행 이벤트 구독)
+async def _submit_files(
+    files: list[UploadFile],
+    progress_queue: asyncio.Queue | None = None,
+) -> list[dict]:
     results = []
     for file in files:
+        filename = file.filename or ""
         try:
-            # [pipeline] 텍스트 추출 -> 청킹 -> 임베딩 -> 요약
-            text = await pdf_service.extract_text(
+            document_id = await job_service.submit_upload(
                 file,
                 max_file_size_bytes=MAX_FILE_SIZE_MB * 1024 * 1024,
+                progress_queue=progress_queue,
             )
-            chunks = pdf_service.split_text_into_chunks(
-                text,
-                chunk_size=CHUNK_SIZE,
-                overlap=CHUNK_OVERLAP,
-            )
-            vectors = await llm_service.embed_chunks(chunks)
-            summary_result = await llm_service.summarize(text)
-
-            # [save] 성공 시에만 문서 레코드 저장
-            document = Summary(
-                original_filename=file.filename or "",
-                original_text=text,
-                summary_title=summary_result["title"],
-                summary_text=summary_result["summary"],
-                status="COMPLETED",
-                error_message=None,
-            )
-            db.add(document)
-            db.flush()
-
-            # [save] 청크/임베딩 저장
-            for idx, (chunk_text, embedding) in enumerate(zip(chunks, vectors)):
-                db.add(
-                    DocumentChunk(
-                        document_id=document.id,
-                        chunk_index=idx,
-                        chunk_text=chunk_text,
-                        embedding_json=json.dumps(embedding),
-                    )
-                )
-
-            db.commit()
-            db.refresh(document)
             results.append(
                 {
-                    "document_id": document.id,
-                    "filename": file.filename or "",
-                    "status": "COMPLETED",
-                    "message": "processed",
+                    "document_id": document_id,
+                    "filename": filename,
+                    "status": "PENDING",
+                    "message": "queued",
                 }
             )
         except Exception as exc:
             error_code = normalize_error_code(exc)
-            if isinstance(exc, GeminiServiceError):
-                logger.warning(
-                    "Gemini failed for filename=%s detail=%s",
-                    file.filename or "",
-                    exc.detail,
-                )
+            if error_code == "DB_ERROR":
+                logger.exception("Upload failed for filename=%s", filename)
             else:
-                logger.exception(
-                    "Pipeline failed for filename=%s",
-                    file.filename or "",
-                )
-            db.rollback()
+                logger.warning("Upload rejected for filename=%s code=%s", filename, error_code)
             results.append(
                 {
                     "document_id": 0,
-                    "filename": file.filename or "",
+                    "filename": filename,
                     "status": "FAILED",
                     "message": error_code,
                 }
             )
+    return results
 
+
+# [POST] PDF 다중 업로드 - 접수 후 즉시 문서 ID 반환, 요약은 백그라운드 워커가 처리
+@router.post("/summarize/batch", response_model=BatchResponse)
+async def summarize_batch(files: list[UploadFile] = File(...)):
+    _validate_files(files)
+    results = await _submit_files(files)
     return {"batch_total": len(files), "results": results}
 
-# [GET] 요약 목록 조회
-@router.get("/summaries", response_model=list[SummaryListItemResponse])
-async def get_summaries(db: Session = Depends(get_db)):
-    summaries = db.query(Summary).order_by(Summary.created_at.desc()).all()
-    return [
-        {
-            "id": item.id,
-            "title": item.summary_title,
-            "filename": item.original_filename,
-            "status": item.status,
-            "created_at": item.created_at,
-        }
-        for item in summaries
-    ]
-
-# [GET] 요약 상세 조회
+
+# [function] NDJSON 한 줄 직렬화
+def _ndjson(event: dict) -> bytes:
+    return (json.dumps(event, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+# [function] 문서 ID 목록의 상태 조회 - {문서 ID: 행}
+async def _fetch_statuses(db: AsyncSession, ids) -> dict:
+    rows = (
+        await db.execute(
+            select(
+                Summary.id,
+                Summary.original_filename,
+                Summary.status,
+                Summary.error_message,
+            ).where(Summary.id.in_(list(ids)))
+        )
+    ).all()
+    return {row.id: row for row in rows}
+
+
+# [function] 문서 최종 이벤트를 배치 결과 아이템으로 반영하고 스트림 result 이벤트 반환
+def _finish_result(results: list[dict], index_by_id: dict, event: dict, started: float) -> dict:
+    item = {
+        "document_id": event["document_id"],
+        "filename": event["filename"],
+        "status": event["status"],
+        "message": STATUS_MESSAGES.get(event["status"]) or event["error_code"] or "",
+    }
+    results[index_by_id[event["document_id"]]] = item
+    return {
+        "event": "result",
+        **item,
+        "elapsed_ms": event["elapsed_ms"],
+        "stream_elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+
+
+# [function] 배치 진행 이벤트 스트림 - 접수 결과 -> 문서별 단계 이벤트 -> 문서별 최종 결과 -> 전체 결과
+async def _stream_batch_events(
+    results: list[dict],
+    progress_queue: asyncio.Queue,
+    include_deltas: bool = False,
+):
+    started = time.perf_counter()
+    index_by_id = {
+        item["document_id"]: idx
+        for idx, item in enumerate(results)
+        if item["status"] == "PENDING"
+    }
+    try:
+        for item in results:
+            event = "accepted" if item["status"] == "PENDING" else "result"
+            yield _ndjson({"event": event, **item})
+
+        # [fallback] 워커가 없으면 PENDING 상태로 남으므로 기다리지 않음
+        remaining = set(index_by_id) if job_service.is_running() else set()
+        while remaining:
+            # [poll] 이벤트 없이 BATCH_STREAM_POLL_SECONDS 가 지나면 다른 워커가 처리했을 수 있으므로 DB 상태로 확인
+            try:
+                event = await asyncio.wait_for(progress_queue.get(), timeout=BATCH_STREAM_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                try:
+                    async with AsyncSessionLocal() as db:
+                        rows_by_id = await _fetch_statuses(db, remaining)
+                except Exception:
+                    logger.exception("Failed to poll batch stream status")
+                    continue
+                for document_id in sorted(remaining):
+                    row = rows_by_id.get(document_id)
+                    if row is not None and row.status == "PENDING":
+                        continue
+                    event = {
+                        "document_id": document_id,
+                        "filename": row.original_filename if row else "",
+                        "status": row.status if row else "FAILED",
+                        "error_code": row.error_message if row else "NOT_FOUND",
+                        "elapsed_ms": None,
+                    }
+                    remaining.discard(document_id)
+                    yield _ndjson(_finish_result(results, index_by_id, event, started))
+                continue
+
+            document_id = event["document_id"]
+            if event["event"] == "summary_delta" and not include_deltas:
+                continue
+            if event["event"] != "finished":
+                yield _ndjson(event)
+                continue
+            # [skip] 다른 워커 프로세스가 처리 중(PENDING)이면 DB 상태 확인으로 마저 기다림
+            if document_id not in remaining or event["status"] == "PENDING":
+                continue
+
+            remaining.discard(document_id)
+            yield _ndjson(_finish_result(results, index_by_id, event, started))
+
+        yield _ndjson({"event": "done", "batch_total": len(results), "results": results})
+    finally:
+        for document_id in index_by_id:
+            job_service.unsubscribe(document_id, progress_queue)
+
+
+# [POST] PDF 다중 업로드 + 처리 진행 상황 NDJSON 스트리밍 - 파일별 결과를 끝나는 대로 전송
+@router.post("/summarize/batch/stream")
+async def summarize_batch_stream(files: list[UploadFile] = File(...)):
+    _validate_files(files)
+    # [subscribe] 큐 등록 전에 구독해야 빠르게 끝난 문서의 이벤트도 놓치지 않음
+    progress_queue: asyncio.Queue = asyncio.Queue()
+    results = await _submit_files(files, progress_queue=progress_queue)
+    return StreamingResponse(
+        _stream_batch_events(results, progress_queue),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+# [POST] 단일 PDF 업로드 + 요약 스트리밍 - 단계 이벤트와 요약 부분 텍스트(summary_delta)를 생성되는 대로 전송
+@router.post("/summarize/stream")
+async def summarize_stream(file: UploadFile = File(...)):
+    progress_queue: asyncio.Queue = asyncio.Queue()
+    results = await _submit_files([file], progress_queue=progress_queue)
+    return StreamingResponse(
+        _stream_batch_events(results, progress_queue, include_deltas=True),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+# [GET] 배치 처리 상태 조회 - 업로드 시 받은 문서 ID 목록으로 폴링
+@router.get("/summarize/batch/status", response_model=BatchResponse)
+async def get_batch_status(ids: list[int] = Query(...), db: AsyncSession = Depends(get_db)):
+    if len(ids) > MAX_UPLOAD_FILES:
+        raise HTTPException(status_code=400, detail="INVALID_REQUEST")
+
+    rows_by_id = await _fetch_statuses(db, ids)
+
+    results = []
+    for document_id in ids:
+        row = rows_by_id.get(document_id)
+        if not row:
+            results.append(
+                {
+                    "document_id": document_id,
+                    "filename": "",
+                    "status": "FAILED",
+                    "message": "NOT_FOUND",
+                }
+            )
+            continue
+        results.append(
+            {
+                "document_id": row.id,
+                "filename": row.original_filename,
+                "status": row.status,
+                "message": STATUS_MESSAGES.get(row.status) or row.error_message or "",
+            }
+        )
+
+    return {"batch_total": len(ids), "results": results}
+
+# [function] 목록 커서 인코딩 - 마지막 행의 (created_at, id)를 URL-safe 문자열로 변환
+def _encode_cursor(created_at: datetime, document_id: int) -> str:
+    raw = f"{created_at.isoformat()}|{document_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+# [function] 목록 커서 디코딩 - 형식이 잘못되면 ValueError
+def _decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8")
+        created_at, document_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(document_id)
+    except (binascii.Error, UnicodeError, ValueError) as exc:
+        raise ValueError("INVALID_REQUEST") from exc
+
+
+# [GET] 요약 목록 조회 - 목록 컬럼만 조회, (created_at, id) 키셋 커서 페이지네이션
+@router.get("/summaries", response_model=SummaryListResponse)
+async def get_summaries(
+    limit: int = Query(SUMMARY_LIST_DEFAULT_LIMIT, ge=1, le=SUMMARY_LIST_MAX_LIMIT),
+    cursor: str | None = Query(None),
+    status: str | None = Query(None),
+    filename_prefix: str | None = Query(None, max_length=255),
+    db: AsyncSession = Depends(get_db),
+):
+    stmt = select(
+        Summary.id,
+        Summary.summary_title,
+        Summary.original_filename,
+        Summary.status,
+        Summary.created_at,
+    )
+    if status:
+        stmt = stmt.where(Summary.status == status.upper())
+    if filename_prefix:
+        stmt = stmt.where(Summary.original_filename.startswith(filename_prefix, autoescape=True))
+    if cursor:
+        try:
+            cursor_created_at, cursor_id = _decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="INVALID_REQUEST")
+        # [keyset] 이전 페이지 마지막 행보다 뒤(created_at desc, id desc)인 행만 조회
+        stmt = stmt.where(
+            or_(
+                Summary.created_at < cursor_created_at,
+                and_(Summary.created_at == cursor_created_at, Summary.id < cursor_id),
+            )
+        )
+
+    # [page] 다음 페이지 존재 여부 확인을 위해 1행 더 조회
+    rows = (
+        await db.execute(
+            stmt.order_by(Summary.created_at.desc(), Summary.id.desc()).limit(limit + 1)
+        )
+    ).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    return {
+        "items": [
+            {
+                "id": row.id,
+                "title": row.summary_title,
+                "filename": row.original_filename,
+                "status": row.status,
+                "created_at": row.created_at,
+            }
+            for row in rows
+        ],
+        "next_cursor": _encode_cursor(rows[-1].created_at, rows[-1].id) if has_more else None,
+    }
+
+# [function] 내보내기 대상 행을 id 순 키셋 배치로 조회 - 배치마다 세션을 새로 열어 긴 스트림 동안 커넥션을 잡고 있지 않음
+async def _iter_export_rows(status: str | None, filename_prefix: str | None, ids: list[int] | None):
+    last_id = 0
+    while True:
+        stmt = select(
+            Summary.id,
+            Summary.summary_title,
+            Summary.original_filename,
+            Summary.summary_text,
+            Summary.status,
+            Summary.created_at,
+            Summary.updated_at,
+        ).where(Summary.id > last_id)
+        if status:
+            stmt = stmt.where(Summary.status == status.upper())
+        if filename_prefix:
+            stmt = stmt.where(Summary.original_filename.startswith(filename_prefix, autoescape=True))
+        if ids:
+            stmt = stmt.where(Summary.id.in_(ids))
+        async with AsyncSessionLocal() as db:
+            rows = (await db.execute(stmt.order_by(Summary.id).limit(EXPORT_BATCH_SIZE))).all()
+        if not rows:
+            return
+        for row in rows:
+            yield row
+        if len(rows) < EXPORT_BATCH_SIZE:
+            return
+        last_id = rows[-1].id
+
+
+# [function] ZIP 내보내기 스트림 - 요약이 있는 문서마다 summary_{id}.txt 항목 (항목별 출력은 모아서 전송)
+async def _stream_export_zip(rows):
+    archive = download_service.ZipStream()
+    pending: list[bytes] = []
+    pending_size = 0
+    try:
+        async for row in rows:
+            if not row.summary_text:
+                continue
+            chunk = archive.add(
+                download_service.summary_filename(row.id),
+                download_service.format_summary_text(row.summary_title, row.summary_text),
+                row.updated_at or row.created_at,
+            )
+            pending.append(chunk)
+            pending_size += len(chunk)
+            if pending_size >= DOWNLOAD_CHUNK_BYTES:
+                yield b"".join(pending)
+                pending, pending_size = [], 0
+        pending.append(archive.close())
+        yield b"".join(pending)
+    except Exception:
+        logger.exception("Summary export (zip) failed")
+        raise
+
+
+# [function] NDJSON 내보내기 스트림 - 문서당 한 줄, 협상한 방식으로 배치 단위 압축(flush) 후 전송
+async def _stream_export_ndjson(rows, encoding: str | None):
+    encoder = download_service.StreamEncoder(encoding)
+    pending: list[bytes] = []
+    pending_size = 0
+    try:
+        async for row in rows:
+            line = download_service.ndjson_line(
+                {
+                    "id": row.id,
+                    "title": row.summary_title,
+                    "filename": row.original_filename,
+                    "status": row.status,
+                    "summary": row.summary_text,
+                    "created_at": row.created_at,
+                    "updated_at": row.updated_at,
+                }
+            )
+            pending.append(encoder.compress(line))
+            pending_size += len(line)
+            if pending_size >= DOWNLOAD_CHUNK_BYTES:
+                pending.append(encoder.flush())
+                yield b"".join(pending)
+                pending, pending_size = [], 0
+        pending.append(encoder.finish())
+        yield b"".join(pending)
+    except Exception:
+        logger.exception("Summary export (ndjson) failed")
+        raise
+
+
+# [GET] 요약 일괄 내보내기 - ZIP(문서별 TXT) 또는 NDJSON 을 배치 단위로 조회하며 스트리밍 (전체를 메모리에 올리지 않음)
+@router.get("/summaries/export")
+async def export_summaries(
+    request: Request,
+    export_format: str = Query("zip", alias="format"),
+    status: str | None = Query("COMPLETED"),
+    filename_prefix: str | None = Query(None, max_length=255),
+    ids: list[int] | None = Query(None),
+):
+    export_format = export_format.lower()
+    if export_format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail="INVALID_REQUEST")
+
+    rows = _iter_export_rows(status, filename_prefix, ids)
+    stamp = time.strftime("%Y%m%d-%H%M%S", time.gmtime())
+    headers = {
+        "Content-Disposition": f'attachment; filename="summaries-{stamp}.{export_format}"',
+        "Cache-Control": "no-store",
+        "X-Accel-Buffering": "no",
+    }
+    if export_format == "zip":
+        # [encoding] ZIP 항목은 이미 deflate 압축이라 전송 압축은 하지 않음
+        return StreamingResponse(_stream_export_zip(rows), media_type="application/zip", headers=headers)
+
+    encoding = download_service.negotiate_encoding(request.headers.get("accept-encoding"))
+    headers["Vary"] = "Accept-Encoding"
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return StreamingResponse(
+        _stream_export_ndjson(rows, encoding),
+        media_type="application/x-ndjson",
+        headers=headers,
+    )
+
+# [GET] 요약 상세 조회 - 응답에 필요한 컬럼만 조회 (원문 제외)
 @router.get("/summaries/{id}", response_model=SummaryResponse)
-async def get_summary(id: int, db: Session = Depends(get_db)):
-    item = db.query(Summary).filter(Summary.id == id).first()
+async def get_summary(id: int, db: AsyncSession = Depends(get_db)):
+    item = (
+        await db.execute(
+            select(
+                Summary.id,
+                Summary.summary_title,
+                Summary.original_filename,
+                Summary.summary_text,
+                Summary.status,
+                Summary.error_message,
+                Summary.created_at,
+            ).where(Summary.id == id)
+        )
+    ).first()
     if not item:
         raise HTTPException(status_code=404, detail="NOT_FOUND")
 
@@ -152,16 +483,78 @@ async def get_summary(id: int, db: Session = Depends(get_db)):
         "created_at": item.created_at,
     }
 
-# [GET] 요약본 TXT 다운로드
+# [function] 다운로드 공통 헤더 - 캐시 검증자(ETag/Last-Modified), 매번 재검증, 압축 여부에 따라 응답이 달라짐을 표시
+def _download_headers(id: int, updated_at: datetime) -> dict:
+    return {
+        "ETag": download_service.entity_tag(id, updated_at),
+        "Last-Modified": download_service.http_date(updated_at),
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding",
+        "Accept-Ranges": "bytes",
+        "Content-Disposition": f'attachment; filename="{download_service.summary_filename(id)}"',
+    }
+
+
+# [GET] 요약본 TXT 다운로드 - 이번 요청에 보낼 표현(범위/압축 방식)을 먼저 정하고, 그 표현의 ETag 로 조건부 요청(304)을 확인한 뒤 조각 단위로 전송
 @router.get("/summaries/{id}/download")
-async def download_summary(id: int, db: Session = Depends(get_db)):
-    item = db.query(Summary).filter(Summary.id == id).first()
-    if not item:
+async def download_summary(id: int, request: Request, db: AsyncSession = Depends(get_db)):
+    row = (
+        await db.execute(
+            select(Summary.updated_at, Summary.summary_title, Summary.summary_text).where(Summary.id == id)
+        )
+    ).first()
+    if not row:
         raise HTTPException(status_code=404, detail="NOT_FOUND")
-    if not item.summary_text:
+    if not row.summary_text:
         raise HTTPException(status_code=400, detail="NOT_READY")
+    content = download_service.format_summary_text(row.summary_title, row.summary_text).encode("utf-8")
+    media_type = "text/plain; charset=utf-8"
+    headers = _download_headers(id, row.updated_at)
+
+    # [range] 이어받기 - If-Range 가 현재 버전과 다르면 전체 응답 (범위 응답은 압축하지 않음, 416 은 조건부 요청 확인 뒤)
+    byte_range = None
+    unsatisfiable = False
+    range_header = request.headers.get("range")
+    if range_header and download_service.if_range_matches(request.headers.get("if-range"), id, row.updated_at):
+        try:
+            byte_range = download_service.parse_byte_range(range_header, len(content))
+        except ValueError:
+            unsatisfiable = True
+
+    # [encoding] 작은 본문은 압축 이득보다 비용이 커서 그대로 전송, 압축 표현은 방식별 ETag (200/304 모두 같은 값)
+    encoding = None
+    if byte_range is None and not unsatisfiable and len(content) >= DOWNLOAD_COMPRESS_MIN_BYTES:
+        encoding = download_service.negotiate_encoding(request.headers.get("accept-encoding"))
+    if encoding:
+        headers["ETag"] = download_service.entity_tag(id, row.updated_at, encoding)
+
+    if download_service.is_not_modified(
+        request.headers.get("if-none-match"),
+        request.headers.get("if-modified-since"),
+        id,
+        row.updated_at,
+    ):
+        headers.pop("Content-Disposition")
+        return Response(status_code=304, headers=headers)
+
+    if unsatisfiable:
+        return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{len(content)}"})
+    if byte_range:
+        start, end = byte_range
+        headers.update({"Content-Range": f"bytes {start}-{end}/{len(content)}", "Content-Length": str(end - start + 1)})
+        return StreamingResponse(
+            download_service.iter_encoded(content[start:end + 1], None),
+            status_code=206,
+            media_type=media_type,
+            headers=headers,
+        )
 
-    filename = f"summary_{id}.txt"
-    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
-    content = f"제목: {item.summary_title or ''}\n\n요약:\n{item.summary_text}"
-    return PlainTextResponse(content=content, headers=headers)
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    else:
+        headers["Content-Length"] = str(len(content))
+    return StreamingResponse(
+        download_service.iter_encoded(content, encoding),
+        media_type=media_type,
+        headers=headers,
+    )
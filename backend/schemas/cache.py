@@ -0,0 +1,19 @@
+# [Schema] 캐시 상태 응답 데이터 형식 정의 - Pydantic 모델
+from pydantic import BaseModel
+from typing import List
+
+
+# [class] 캐시별 상태 아이템
+class CacheStatsItemResponse(BaseModel):
+    name: str
+    size: int
+    max_entries: int
+    hits: int
+    misses: int
+    evictions: int
+
+
+# [class] 캐시 상태 응답
+class CacheStatsResponse(BaseModel):
+    enabled: bool
+    caches: List[CacheStatsItemResponse]
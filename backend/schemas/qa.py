@@ -0,0 +1,32 @@
+# [Schema] 질의응답 요청/응답 데이터 형식 정의 - Pydantic 모델
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+
+# [class] 질문 요청 (top_k: 답변 근거로 쓸 청크 수, 비우면 QA_TOP_K)
+class AskRequest(BaseModel):
+    question: str = Field(..., min_length=1)
+    top_k: Optional[int] = Field(None, ge=1)
+
+
+# [class] 답변 근거 청크 (score: 하이브리드 점수, bm25_score/vector_score: 검색기별 점수)
+class AskSourceResponse(BaseModel):
+    document_id: int
+    chunk_index: int
+    title: Optional[str] = None
+    filename: str
+    page_start: Optional[int] = None
+    page_end: Optional[int] = None
+    text: str
+    score: float
+    bm25_score: float
+    vector_score: float
+
+
+# [class] 질문 응답 (cached: 캐시된 답변 여부)
+class AskResponse(BaseModel):
+    question: str
+    document_id: Optional[int] = None
+    answer: str
+    sources: List[AskSourceResponse]
+    cached: bool
@@ -0,0 +1,28 @@
+# [Schema] 검색 응답 데이터 형식 정의 - Pydantic 모델
+from pydantic import BaseModel
+from typing import List, Optional
+
+
+# [class] 검색된 청크 아이템
+class SearchChunkResponse(BaseModel):
+    document_id: int
+    chunk_index: int
+    page_start: Optional[int] = None
+    page_end: Optional[int] = None
+    text: str
+    score: float
+
+
+# [class] 검색된 문서 아이템 (문서 내 최고 점수 청크 기준)
+class SearchDocumentResponse(BaseModel):
+    document_id: int
+    title: Optional[str] = None
+    filename: str
+    score: float
+
+
+# [class] 검색 응답
+class SearchResponse(BaseModel):
+    query: str
+    chunks: List[SearchChunkResponse]
+    documents: List[SearchDocumentResponse]
@@ -30,6 +30,12 @@ class SummaryListItemResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+# [class] 요약 목록 응답 - next_cursor 가 있으면 cursor 파라미터로 다음 페이지 조회
+class SummaryListResponse(BaseModel):
+    items: List[SummaryListItemResponse]
+    next_cursor: Optional[str] = None
+
+
 # [class] 요약 상세 응답
 class SummaryResponse(BaseModel):
     id: int
@@ -0,0 +1,66 @@
+# [Script] 기존 문서 MinHash 서명 생성 - 중복 탐지 도입 전에 완료된 문서도 유사 문서 후보가 되도록
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import select  # noqa: E402
+from database import SessionLocal, get_engine  # noqa: E402
+from models.summary import DocumentSignature, DocumentText, create_tables  # noqa: E402
+from services import dedup_service  # noqa: E402
+
+
+# [function] 명령행 인자 파싱
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Compute MinHash signatures for stored documents")
+    parser.add_argument("--batch-size", type=int, default=200, help="한 번에 처리할 문서 수")
+    return parser.parse_args()
+
+
+# [function] 서명이 없는 문서의 원문으로 서명을 배치 단위로 생성 (이미 있는 문서는 건너뜀)
+def backfill(batch_size: int) -> int:
+    created = 0
+    last_id = 0
+    db = SessionLocal()
+    try:
+        while True:
+            rows = db.execute(
+                select(DocumentText.document_id, DocumentText.original_text)
+                .outerjoin(DocumentSignature, DocumentSignature.document_id == DocumentText.document_id)
+                .where(DocumentText.document_id > last_id, DocumentSignature.document_id.is_(None))
+                .order_by(DocumentText.document_id)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                break
+            last_id = rows[-1].document_id
+
+            for row in rows:
+                signature = dedup_service.compute_signature(row.original_text)
+                if signature is None:
+                    continue
+                db.add(
+                    DocumentSignature(
+                        document_id=row.document_id,
+                        minhash=dedup_service.encode_signature(signature),
+                    )
+                )
+                created += 1
+            db.commit()
+    finally:
+        db.close()
+    return created
+
+
+def main() -> int:
+    args = parse_args()
+    create_tables(get_engine())
+    created = backfill(args.batch_size)
+    print(json.dumps({"backfill": "document_signatures", "created": created}, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,128 @@
+# [Script] 청크 저장 벤치마크 - ORM 단건 add(이전 방식) vs 대량 저장(executemany / COPY) 초당 행 수 비교
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+# [env] 모델 임포트 전에 DB URL 지정 (pgvector 사용 여부가 첫 번째 URL 기준으로 결정됨)
+DEFAULT_SQLITE_URL = f"sqlite:///{os.path.join(tempfile.gettempdir(), 'bench_chunk_insert.db')}"
+
+
+# [function] 명령행 인자 파싱
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark DocumentChunk persistence")
+    parser.add_argument(
+        "--database-url",
+        action="append",
+        dest="database_urls",
+        help="대상 DB URL (여러 번 지정 가능, 기본: 임시 SQLite 파일)",
+    )
+    parser.add_argument("--rows", type=int, default=20000, help="저장할 청크 행 수")
+    parser.add_argument("--dim", type=int, default=768, help="임베딩 차원")
+    parser.add_argument("--chunk-chars", type=int, default=1200, help="청크 텍스트 길이")
+    return parser.parse_args()
+
+
+ARGS = parse_args()
+DATABASE_URLS = ARGS.database_urls or [DEFAULT_SQLITE_URL]
+os.environ.setdefault("DATABASE_URL", DATABASE_URLS[0])
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, delete  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from database import Base  # noqa: E402
+from models.summary import DocumentChunk  # noqa: E402
+from services import chunk_service, vector_service  # noqa: E402
+
+# [const] 벤치마크 전용 문서 ID (실제 데이터와 겹치지 않도록 음수 사용)
+BENCH_DOCUMENT_ID = -1
+
+
+# [function] 가짜 청크/임베딩 생성
+def make_payload(rows: int, dim: int, chunk_chars: int) -> tuple[list[dict], list[list[float]]]:
+    rng = random.Random(0)
+    text = "벤치마크 청크 텍스트 " * (chunk_chars // 11 + 1)
+    chunks = [
+        {"text": text[:chunk_chars], "page_start": idx // 3 + 1, "page_end": idx // 3 + 1}
+        for idx in range(rows)
+    ]
+    vectors = [[rng.random() for _ in range(dim)] for _ in range(rows)]
+    return chunks, vectors
+
+
+# [function] 이전 방식 - 청크마다 ORM 객체를 add 후 commit
+def insert_orm(session_factory, chunks: list[dict], vectors: list[list[float]]) -> None:
+    db = session_factory()
+    try:
+        for idx, (chunk, embedding) in enumerate(zip(chunks, vectors)):
+            db.add(
+                DocumentChunk(
+                    document_id=BENCH_DOCUMENT_ID,
+                    chunk_index=idx,
+                    chunk_text=chunk["text"],
+                    page_start=chunk["page_start"],
+                    page_end=chunk["page_end"],
+                    embedding=vector_service.encode_embedding(embedding),
+                )
+            )
+        db.commit()
+    finally:
+        db.close()
+
+
+# [function] 현재 방식 - chunk_service 대량 저장 후 commit
+def insert_bulk(session_factory, chunks: list[dict], vectors: list[list[float]]) -> None:
+    db = session_factory()
+    try:
+        chunk_service.insert_chunks(db, BENCH_DOCUMENT_ID, chunks, vectors)
+        db.commit()
+    finally:
+        db.close()
+
+
+# [function] 벤치마크 행 정리
+def cleanup(session_factory) -> None:
+    db = session_factory()
+    try:
+        db.execute(delete(DocumentChunk).where(DocumentChunk.document_id == BENCH_DOCUMENT_ID))
+        db.commit()
+    finally:
+        db.close()
+
+
+# [function] DB 하나에 대해 두 방식 측정
+def run_for_url(url: str, chunks: list[dict], vectors: list[list[float]]) -> dict:
+    engine = create_engine(url, pool_pre_ping=True)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    result = {"database": engine.dialect.name, "driver": engine.dialect.driver, "rows": len(chunks)}
+    try:
+        for name, func in (("orm", insert_orm), ("bulk", insert_bulk)):
+            cleanup(session_factory)
+            started = time.perf_counter()
+            func(session_factory, chunks, vectors)
+            elapsed = time.perf_counter() - started
+            result[name] = {
+                "seconds": round(elapsed, 4),
+                "rows_per_second": round(len(chunks) / elapsed, 1),
+            }
+        result["speedup"] = round(result["bulk"]["rows_per_second"] / result["orm"]["rows_per_second"], 2)
+    finally:
+        cleanup(session_factory)
+        engine.dispose()
+    return result
+
+
+def main() -> int:
+    chunks, vectors = make_payload(ARGS.rows, ARGS.dim, ARGS.chunk_chars)
+    results = [run_for_url(url, chunks, vectors) for url in DATABASE_URLS]
+    print(json.dumps({"benchmark": "chunk_insert", "results": results}, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
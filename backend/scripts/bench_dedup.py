@@ -0,0 +1,141 @@
+# [Script] 유사 중복 탐지 벤치마크 - 개정본(일부 페이지 변경) 탐지율, 오탐, 서명 속도, 재사용 가능한 청크 비율
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from database import Base, get_engine  # noqa: E402
+from services import dedup_service, pdf_service  # noqa: E402
+
+# [const] 합성 문서 단어 목록 (문서마다 다른 순서로 섞어 페이지 생성)
+WORDS = (
+    "분기 매출 성장 비용 고객 시장 정책 지표 보고서 데이터 분석 결과 방법 서비스 품질 "
+    "revenue growth latency throughput pipeline worker queue batch index vector cache model"
+).split()
+
+
+# [function] 명령행 인자 파싱
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark near-duplicate detection")
+    parser.add_argument("--documents", type=int, default=50, help="원본 문서 수")
+    parser.add_argument("--pages", type=int, default=30, help="문서당 페이지 수")
+    parser.add_argument("--page-words", type=int, default=300, help="페이지당 단어 수")
+    parser.add_argument("--change-ratios", default="0,0.05,0.1,0.2,0.4,0.7", help="개정본에서 바꿀 페이지 비율 목록")
+    return parser.parse_args()
+
+
+# [function] 페이지 1개 생성 (문장 단위로 마침표를 넣어 청커가 문장 경계를 쓰도록)
+def make_page(rng: random.Random, words: int) -> str:
+    sentences = []
+    for _ in range(max(1, words // 12)):
+        sentences.append(" ".join(rng.choice(WORDS) for _ in range(12)) + ".")
+    return " ".join(sentences)
+
+
+# [function] 개정본 생성 - 지정 비율만큼의 페이지를 새 내용으로 교체
+def revise(pages: list[str], ratio: float, rng: random.Random, words: int) -> list[str]:
+    revised = list(pages)
+    for idx in rng.sample(range(len(pages)), round(len(pages) * ratio)):
+        revised[idx] = make_page(rng, words)
+    return revised
+
+
+# [function] 페이지 목록 -> 원문, 청크 텍스트 (파이프라인과 같은 설정)
+def to_document(pages: list[str]) -> tuple[str, list[str]]:
+    page_items = [{"page": idx, "text": text} for idx, text in enumerate(pages, start=1)]
+    chunks = pdf_service.split_pages_into_chunks(page_items)
+    return pdf_service.join_pages(page_items), [chunk["text"] for chunk in chunks]
+
+
+# [function] 정확한 shingle 자카드 유사도 (추정값 오차 확인용)
+def exact_jaccard(left: str, right: str) -> float:
+    left_set = set(dedup_service._shingle_hashes(left).tolist())
+    right_set = set(dedup_service._shingle_hashes(right).tolist())
+    return len(left_set & right_set) / max(1, len(left_set | right_set))
+
+
+def main() -> int:
+    args = parse_args()
+    Base.metadata.create_all(bind=get_engine())
+    rng = random.Random(0)
+    index = dedup_service.MinHashIndex()
+    index.ensure_loaded()
+
+    # [index] 원본 문서 등록 (서명 계산 시간 측정)
+    originals = []
+    signature_seconds = 0.0
+    for document_id in range(1, args.documents + 1):
+        pages = [make_page(rng, args.page_words) for _ in range(args.pages)]
+        text, chunk_texts = to_document(pages)
+        started = time.perf_counter()
+        signature = dedup_service.compute_signature(text)
+        signature_seconds += time.perf_counter() - started
+        index.add_document(document_id, signature)
+        originals.append((pages, text, set(chunk_texts)))
+
+    # [query] 변경 비율별 개정본 조회 - 원본을 찾았는지, 추정 오차, 재사용 가능한 청크 비율
+    results = []
+    for ratio in (float(value) for value in args.change_ratios.split(",") if value.strip()):
+        found = 0
+        errors = []
+        reused = 0
+        total_chunks = 0
+        query_seconds = 0.0
+        for document_id, (pages, text, chunk_set) in enumerate(originals, start=1):
+            revised_text, revised_chunks = to_document(revise(pages, ratio, rng, args.page_words))
+            signature = dedup_service.compute_signature(revised_text)
+            started = time.perf_counter()
+            matches = index.query(signature, dedup_service.DEDUP_THRESHOLD, dedup_service.DEDUP_MAX_CANDIDATES)
+            query_seconds += time.perf_counter() - started
+            total_chunks += len(revised_chunks)
+            if matches and matches[0][0] == document_id:
+                found += 1
+                errors.append(abs(matches[0][1] - exact_jaccard(text, revised_text)))
+                reused += sum(1 for chunk in revised_chunks if chunk in chunk_set)
+        results.append(
+            {
+                "change_ratio": ratio,
+                "detected_ratio": round(found / len(originals), 3),
+                "mean_abs_error": round(sum(errors) / len(errors), 4) if errors else None,
+                "reused_chunk_ratio": round(reused / max(1, total_chunks), 3),
+                "query_ms": round(query_seconds / len(originals) * 1000, 3),
+            }
+        )
+
+    # [false positive] 서로 무관한 새 문서가 기존 문서와 매칭되는 비율
+    false_positives = 0
+    for _ in range(args.documents):
+        text, _ = to_document([make_page(rng, args.page_words) for _ in range(args.pages)])
+        if index.query(dedup_service.compute_signature(text), dedup_service.DEDUP_THRESHOLD, 1):
+            false_positives += 1
+
+    print(
+        json.dumps(
+            {
+                "benchmark": "dedup",
+                "config": {
+                    "threshold": dedup_service.DEDUP_THRESHOLD,
+                    "num_perm": dedup_service.DEDUP_NUM_PERM,
+                    "bands": dedup_service.DEDUP_LSH_BANDS,
+                    "shingle_size": dedup_service.DEDUP_SHINGLE_SIZE,
+                    "documents": args.documents,
+                    "pages": args.pages,
+                },
+                "signature_ms_per_document": round(signature_seconds / args.documents * 1000, 2),
+                "false_positive_ratio": round(false_positives / args.documents, 3),
+                "results": results,
+            },
+            ensure_ascii=False,
+            indent=2,
+        )
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
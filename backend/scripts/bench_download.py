@@ -0,0 +1,142 @@
+# [Script] 다운로드/내보내기 벤치마크 - 전체 응답 vs 304 재검증 지연, 압축 전송량, 일괄 내보내기 처리량/메모리 피크 (JSON 출력)
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_db_dir = tempfile.mkdtemp(prefix="bench_download_")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_db_dir, 'bench.db')}")
+os.environ.setdefault("WARMUP_ENABLED", "false")
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+
+from database import Base, get_engine  # noqa: E402
+from main import app  # noqa: E402
+from models.summary import Summary  # noqa: E402
+from routers import summarize  # noqa: E402
+
+# [const] 합성 요약문 문장 (한국어/영문 혼합)
+SENTENCES = (
+    "이번 분기 매출은 전년 대비 성장했으며 비용 구조가 개선되었다. ",
+    "The pipeline processes uploaded documents in background workers. ",
+    "고객 지표와 시장 데이터를 분석한 결과 서비스 품질이 향상되었다. ",
+    "Latency and throughput were measured against the previous release. ",
+)
+
+
+# [function] 명령행 인자 파싱
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark summary download and bulk export")
+    parser.add_argument("--documents", type=int, default=2000, help="내보내기 대상 문서 수")
+    parser.add_argument("--summary-bytes", type=int, default=8000, help="문서당 요약문 크기(대략, UTF-8 바이트)")
+    parser.add_argument("--requests", type=int, default=200, help="단건 다운로드 측정 요청 수")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    return parser.parse_args()
+
+
+# [function] 합성 요약 문서 저장 (요약 완료 상태)
+def seed(documents: int, summary_bytes: int) -> None:
+    engine = get_engine()
+    Base.metadata.create_all(bind=engine)
+    sentence_bytes = sum(len(sentence.encode("utf-8")) for sentence in SENTENCES) / len(SENTENCES)
+    repeat = max(1, int(summary_bytes / sentence_bytes))
+    rows = [
+        {
+            "original_filename": f"report_{idx}.pdf",
+            "summary_title": f"보고서 {idx}",
+            "summary_text": f"[{idx}] " + "".join(SENTENCES[(idx + n) % len(SENTENCES)] for n in range(repeat)),
+            "status": "COMPLETED",
+        }
+        for idx in range(documents)
+    ]
+    with engine.begin() as conn:
+        conn.execute(insert(Summary), rows)
+
+
+# [function] 요청 반복 지연 p50/p95 (ms)
+def measure(client: TestClient, url: str, headers: dict, requests: int) -> dict:
+    latencies = []
+    status, wire_bytes = 0, 0
+    for _ in range(requests):
+        started = time.perf_counter()
+        with client.stream("GET", url, headers=headers) as response:
+            # [wire] 압축을 풀지 않은 전송 바이트 수
+            wire_bytes = sum(len(chunk) for chunk in response.iter_raw())
+            status = response.status_code
+        latencies.append((time.perf_counter() - started) * 1000)
+    latencies.sort()
+    return {
+        "status": status,
+        "p50_ms": round(statistics.median(latencies), 3),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 3),
+        "wire_bytes": wire_bytes,
+    }
+
+
+# [function] 내보내기 한 번 - 서버 스트림 생성기를 직접 소비하며 전송량/소요 시간/파이썬 메모리 피크 측정
+# (TestClient 는 응답 본문을 모두 모은 뒤 돌려주므로 메모리 측정에는 쓰지 않음)
+def export_once(export_format: str, documents: int, encoding: str | None = None) -> dict:
+    async def consume() -> int:
+        rows = summarize._iter_export_rows("COMPLETED", None, None)
+        if export_format == "zip":
+            stream = summarize._stream_export_zip(rows)
+        else:
+            stream = summarize._stream_export_ndjson(rows, encoding)
+        return sum([len(chunk) async for chunk in stream])
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    total = asyncio.run(consume())
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "bytes": total,
+        "seconds": round(elapsed, 3),
+        "documents_per_second": round(documents / elapsed, 1),
+        "peak_python_mb": round(peak / 1024 / 1024, 2),
+    }
+
+
+def main() -> int:
+    args = parse_args()
+    seed(args.documents, args.summary_bytes)
+    url = "/api/summaries/1/download"
+
+    with TestClient(app) as client:
+        full = client.get(url, headers={"Accept-Encoding": "identity"})
+        etag = full.headers["etag"]
+        results = {
+            "download_identity": measure(client, url, {"Accept-Encoding": "identity"}, args.requests),
+            "download_gzip": measure(client, url, {"Accept-Encoding": "gzip"}, args.requests),
+            "download_304": measure(client, url, {"If-None-Match": etag}, args.requests),
+            "download_range": measure(client, url, {"Range": "bytes=0-1023"}, args.requests),
+        }
+    results.update(
+        export_ndjson=export_once("ndjson", args.documents),
+        export_ndjson_gzip=export_once("ndjson", args.documents, "gzip"),
+        export_zip=export_once("zip", args.documents),
+    )
+
+    report = {
+        "benchmark": "download",
+        "config": vars(args) | {"summary_size": len(full.content)},
+        "results": results,
+    }
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
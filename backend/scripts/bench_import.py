@@ -0,0 +1,172 @@
+# [Script] import 시간 벤치마크 - 새 인터프리터에서 모듈별 import 시간(ms)과 함께 로딩되는 무거운 라이브러리 측정 (JSON 출력)
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+# [const] 백엔드 디렉터리
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# [const] import 만으로 로딩되면 안 되는(처음 쓸 때 로딩해야 하는) 라이브러리와 참고용 공통 라이브러리
+LAZY_MODULES = (
+    "PyPDF2",
+    "pytesseract",
+    "pdf2image",
+    "PIL",
+    "multiprocessing",
+    "pyinstrument",
+    "aiosqlite",
+    "aiomysql",
+    "asyncpg",
+    "hnswlib",
+)
+COMMON_MODULES = ("fastapi", "sqlalchemy", "numpy", "httpx", "prometheus_client", "dotenv")
+
+# [const] 자식 프로세스에서 실행할 코드 - 대상 모듈 import 시간과 로딩된 라이브러리 출력
+CHILD_CODE = """
+import importlib, json, sys, time
+started = time.perf_counter()
+importlib.import_module(sys.argv[1])
+elapsed = time.perf_counter() - started
+watched = json.loads(sys.argv[2])
+print(json.dumps({"import_ms": elapsed * 1000, "loaded": [name for name in watched if name in sys.modules]}))
+"""
+
+
+# [function] 쉼표 구분 목록 파싱
+def _csv(value: str) -> list[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+# [function] 명령행 인자 파싱
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark cold import time of backend modules")
+    parser.add_argument(
+        "--modules",
+        default="settings,database,models.summary,services.pdf_service,services.job_service,main",
+        help="측정할 모듈 목록",
+    )
+    parser.add_argument("--repeat", type=int, default=7, help="모듈별 측정 횟수 (매번 새 인터프리터)")
+    parser.add_argument("--top", type=int, default=8, help="직접 import 중 오래 걸린 항목 수")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON (import 시간 비율 추가)")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    return parser.parse_args()
+
+
+# [function] 새 인터프리터에서 모듈 한 번 import - (import ms, 프로세스 전체 ms, 로딩된 라이브러리)
+def _import_once(module: str, env: dict) -> tuple[float, float, list[str]]:
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-c", CHILD_CODE, module, json.dumps(LAZY_MODULES + COMMON_MODULES)],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    process_ms = (time.perf_counter() - started) * 1000
+    if completed.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{completed.stderr}")
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    return result["import_ms"], process_ms, result["loaded"]
+
+
+# [function] -X importtime 결과에서 대상 모듈이 직접 import 한 모듈의 누적 시간 상위 항목
+def _direct_imports(module: str, env: dict, top: int) -> list[dict]:
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    # [order] 하위 모듈이 상위 모듈보다 먼저 출력되므로, 대상 모듈 줄 직전의 한 단계 아래 항목만 모음
+    pending: list[dict] = []
+    entries: list[dict] = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        if not cumulative.strip().isdigit():
+            continue
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 1:
+            pending.append({"module": name.strip(), "cumulative_ms": round(int(cumulative) / 1000, 1)})
+        elif depth == 0:
+            if name.strip() == module:
+                entries = pending
+            pending = []
+    entries.sort(key=lambda item: -item["cumulative_ms"])
+    return entries[:top]
+
+
+# [function] 모듈 하나 측정 - 첫 실행(디스크 캐시 등)을 포함한 반복 측정의 p50/최솟값
+def measure_module(module: str, repeat: int, top: int, env: dict) -> dict:
+    import_times, process_times = [], []
+    loaded: list[str] = []
+    for _ in range(repeat):
+        import_ms, process_ms, loaded = _import_once(module, env)
+        import_times.append(import_ms)
+        process_times.append(process_ms)
+    return {
+        "module": module,
+        "import_ms": {"p50": round(statistics.median(import_times), 1), "min": round(min(import_times), 1)},
+        "process_ms": {"p50": round(statistics.median(process_times), 1), "min": round(min(process_times), 1)},
+        "lazy_modules_loaded": [name for name in loaded if name in LAZY_MODULES],
+        "common_modules_loaded": [name for name in loaded if name in COMMON_MODULES],
+        "direct_imports": _direct_imports(module, env, top),
+    }
+
+
+# [function] 이전 결과와 비교 - 같은 모듈의 import 시간 p50 비율 (1보다 작으면 빨라짐)
+def attach_baseline(results: list[dict], baseline: dict) -> None:
+    previous = {item["module"]: item for item in baseline.get("results", [])}
+    for result in results:
+        old = previous.get(result["module"])
+        if old and old["import_ms"]["p50"]:
+            result["baseline"] = {"import_ratio": round(result["import_ms"]["p50"] / old["import_ms"]["p50"], 3)}
+
+
+def main() -> int:
+    args = parse_args()
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+
+    # [env] DB URL 이 없으면 import 시 DB 설정을 요구하던 이전 버전과도 비교할 수 있도록 메모리 SQLite 지정
+    env = {**os.environ, "PYTHONPATH": BACKEND_DIR}
+    env.setdefault("DATABASE_URL", "sqlite://")
+
+    results = []
+    for module in _csv(args.modules):
+        result = measure_module(module, args.repeat, args.top, env)
+        print("MODULE", module, f"import_p50={result['import_ms']['p50']}ms", file=sys.stderr)
+        results.append(result)
+
+    if baseline is not None:
+        attach_baseline(results, baseline)
+
+    report = {
+        "benchmark": "import",
+        "environment": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,468 @@
+# [Script] 수집 파이프라인 벤치마크 - 합성 PDF + 로컬 Gemini 스텁 서버로 처리량/지연 백분위/최대 RSS/단계별 소요 시간 측정 (JSON 출력)
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fake_gemini_server  # noqa: E402
+import synthetic_pdf  # noqa: E402
+
+# [const] 기본 작업 디렉터리 (합성 PDF, 업로드 스풀, SQLite 파일)
+DEFAULT_WORK_DIR = os.path.join(tempfile.gettempdir(), "bench_pipeline")
+# [const] 단계 이름 (metrics_service 의 stage 라벨과 동일)
+STAGES = ("pdf_parse", "ocr", "extract", "chunk", "dedup", "embed", "summarize", "save", "document")
+
+
+# [function] 쉼표 구분 목록 파싱
+def _csv(value: str) -> list[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+# [function] 명령행 인자 파싱
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the ingestion pipeline against a fake Gemini server")
+    parser.add_argument("--modes", default="services,api", help="services(서비스 함수 직접 호출), api(/api/summarize/batch)")
+    parser.add_argument("--kinds", default="text,scanned,mixed", help="합성 PDF 종류 (text, scanned, mixed)")
+    parser.add_argument("--pages", default="1,10,100", help="문서당 페이지 수 목록 (1~500)")
+    parser.add_argument("--concurrency", default="1,4", help="동시 처리 수 목록 (api 모드는 워커 수)")
+    parser.add_argument("--documents", type=int, default=4, help="시나리오마다 처리할 문서 수")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="스텁 서버 응답 지연(ms)")
+    parser.add_argument("--jitter-ms", type=float, default=10.0, help="스텁 서버 응답 지연 편차(ms, ±)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="스텁 서버 무작위 오류 비율 (0~1)")
+    parser.add_argument("--error-status", type=int, default=503, help="무작위 오류 상태 코드")
+    parser.add_argument("--database-url", help="api 모드 DB URL (기본: 작업 디렉터리의 새 SQLite 파일)")
+    parser.add_argument("--work-dir", default=DEFAULT_WORK_DIR, help="합성 PDF/업로드/SQLite 작업 디렉터리")
+    parser.add_argument("--poll-interval", type=float, default=0.05, help="api 모드 상태 조회 간격(초)")
+    parser.add_argument("--timeout", type=float, default=600, help="시나리오별 최대 대기 시간(초)")
+    parser.add_argument("--keep-cache", action="store_true", help="콘텐츠 해시 캐시 사용 (기본: 끔)")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON (처리량/p95 비율 추가)")
+    parser.add_argument("--verbose", action="store_true", help="서비스 로그(실패 스택 등) 출력")
+    return parser.parse_args()
+
+
+ARGS = parse_args()
+os.makedirs(ARGS.work_dir, exist_ok=True)
+
+# [env] 서비스 임포트 전에 스텁 서버 주소와 벤치마크용 설정 지정 (이미 지정된 환경변수가 우선)
+SERVER = fake_gemini_server.start_fake_gemini_server(
+    latency=ARGS.latency_ms / 1000,
+    latency_jitter=ARGS.jitter_ms / 1000,
+    error_rate=ARGS.error_rate,
+    error_status=ARGS.error_status,
+    seed=0,
+)
+SQLITE_PATH = os.path.join(ARGS.work_dir, "bench.db")
+if not ARGS.database_url and os.path.exists(SQLITE_PATH):
+    os.remove(SQLITE_PATH)
+os.environ["DATABASE_URL"] = ARGS.database_url or f"sqlite:///{SQLITE_PATH}"
+os.environ["GEMINI_API_BASE_URL"] = SERVER.base_url
+os.environ.setdefault("GEMINI_API_KEY", "fake-key")
+os.environ["CACHE_ENABLED"] = "true" if ARGS.keep_cache else "false"
+# [env] 중복 탐지 기본 해제 - 시나리오마다 같은 합성 문서를 다시 올리므로 켜 두면 이후 시나리오가 임베딩을 재사용함
+os.environ.setdefault("DEDUP_ENABLED", "false")
+os.environ.setdefault("EMBEDDING_DIM", str(fake_gemini_server.EMBEDDING_DIM))
+os.environ.setdefault("MAX_FILE_SIZE_MB", "1024")
+os.environ.setdefault("UPLOAD_DIR", os.path.join(ARGS.work_dir, "uploads"))
+# [env] Gemini 속도 제한은 기본 해제 - 버킷 잔량이 다음 시나리오로 이어져 결과가 실행 순서에 좌우되지 않도록 (지정하면 그 값 사용)
+for quota_name in ("GEMINI_SUMMARY_RPM", "GEMINI_SUMMARY_TPM", "GEMINI_EMBED_RPM", "GEMINI_EMBED_TPM"):
+    os.environ.setdefault(quota_name, "0")
+
+from services import job_service, llm_service, metrics_service, pdf_service, rate_limit_service  # noqa: E402
+
+
+# [function] 백분위수 (선형 보간)
+def _percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    position = (len(ordered) - 1) * q
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+# [function] 초 단위 값 목록 -> ms 단위 요약 통계
+def _summarize_ms(values: list[float]) -> dict:
+    if not values:
+        return {"count": 0}
+    return {
+        "count": len(values),
+        "mean": round(statistics.fmean(values) * 1000, 2),
+        "p50": round(_percentile(values, 0.50) * 1000, 2),
+        "p95": round(_percentile(values, 0.95) * 1000, 2),
+        "p99": round(_percentile(values, 0.99) * 1000, 2),
+        "max": round(max(values) * 1000, 2),
+    }
+
+
+# [function] 최대 RSS 초기화 (Linux 4.0+ 만 지원, 아니면 프로세스 전체 기간 기준)
+def _reset_peak_rss() -> bool:
+    try:
+        with open("/proc/self/clear_refs", "w") as file:
+            file.write("5")
+        return True
+    except OSError:
+        return False
+
+
+# [function] 현재 프로세스 최대 RSS(MB) - OCR 워커 프로세스는 포함하지 않음
+def _peak_rss_mb() -> float:
+    try:
+        with open("/proc/self/status") as file:
+            for line in file:
+                if line.startswith("VmHWM:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # [platform] macOS 는 바이트, Linux 는 KB 단위
+    return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+
+
+# [function] Prometheus 레지스트리에서 메트릭 샘플 합계 (라벨별) - 비활성이면 빈 dict
+def _metric_samples(sample_name: str, label: str | None = None) -> dict:
+    if not metrics_service.METRICS_ENABLED:
+        return {}
+    totals: dict = defaultdict(float)
+    for family in metrics_service.REGISTRY.collect():
+        for sample in family.samples:
+            if sample.name == sample_name:
+                totals[sample.labels.get(label) if label else None] += sample.value
+    return dict(totals)
+
+
+# [function] 단계별 메트릭/Gemini 호출 수 스냅샷
+def _snapshot() -> dict:
+    return {
+        "stage_count": _metric_samples("pipeline_stage_seconds_count", "stage"),
+        "stage_sum": _metric_samples("pipeline_stage_seconds_sum", "stage"),
+        "retries": sum(_metric_samples("gemini_retries_total").values()),
+        "requests": SERVER.request_count,
+        "injected_errors": SERVER.injected_error_count,
+    }
+
+
+# [function] 두 스냅샷 차이 -> 단계별 건수/평균/합계(ms) + Gemini 호출 수
+def _snapshot_delta(before: dict, after: dict) -> tuple[dict, dict]:
+    stages = {}
+    for stage in STAGES:
+        count = after["stage_count"].get(stage, 0) - before["stage_count"].get(stage, 0)
+        if count <= 0:
+            continue
+        total = after["stage_sum"].get(stage, 0) - before["stage_sum"].get(stage, 0)
+        stages[stage] = {
+            "count": int(count),
+            "mean": round(total / count * 1000, 2),
+            "total": round(total * 1000, 2),
+        }
+    gemini = {
+        "requests": after["requests"] - before["requests"],
+        "injected_errors": after["injected_errors"] - before["injected_errors"],
+        "retries": int(after["retries"] - before["retries"]),
+    }
+    return stages, gemini
+
+
+# [function] 실패 예외 -> 에러 코드
+def _error_code(exc: Exception) -> str:
+    return getattr(exc, "code", None) or job_service.normalize_error_code(exc)
+
+
+# [function] 시나리오마다 서킷 브레이커 초기화 (앞 시나리오의 오류가 다음 결과에 섞이지 않도록)
+def _reset_breakers() -> None:
+    for model in (llm_service.GEMINI_MODEL_SUMMARY, llm_service.GEMINI_MODEL_EMBEDDING):
+        rate_limit_service.get_breaker(model).reset()
+
+
+# [function] 합성 PDF 준비 (종류/페이지 수별로 한 번 생성해 재사용, 문서마다 내용이 다름)
+def prepare_documents(kind: str, pages: int, count: int) -> list[str]:
+    directory = os.path.join(ARGS.work_dir, "pdfs", f"{kind}-{pages}")
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for idx in range(count):
+        path = os.path.join(directory, f"doc-{idx}.pdf")
+        if not os.path.exists(path):
+            with open(path, "wb") as file:
+                file.write(synthetic_pdf.build_pdf(pages, kind, seed=pages * 1000 + idx))
+        paths.append(path)
+    return paths
+
+
+# [function] services 모드 - 문서 1개를 서비스 함수로 직접 처리하며 단계별 시간 기록
+async def _run_services_document(path: str, stage_times: dict) -> int:
+    started = time.perf_counter()
+    pages = await pdf_service.extract_pages(path)
+    stage_times["extract"].append(time.perf_counter() - started)
+
+    chunk_started = time.perf_counter()
+    text = pdf_service.join_pages(pages)
+    chunks = pdf_service.split_pages_into_chunks(
+        pages,
+        max_tokens=job_service.CHUNK_MAX_TOKENS,
+        overlap_tokens=job_service.CHUNK_OVERLAP_TOKENS,
+    )
+    chunk_texts = [chunk["text"] for chunk in chunks]
+    stage_times["chunk"].append(time.perf_counter() - chunk_started)
+
+    async def timed(stage: str, awaitable):
+        stage_started = time.perf_counter()
+        result = await awaitable
+        stage_times[stage].append(time.perf_counter() - stage_started)
+        return result
+
+    await asyncio.gather(
+        timed("embed", llm_service.embed_chunks(chunk_texts)),
+        timed("summarize", llm_service.summarize(text)),
+    )
+    return len(pages)
+
+
+# [function] services 모드 시나리오 - concurrency 개 문서를 동시에 처리
+async def run_services_scenario(paths: list[str], concurrency: int) -> dict:
+    stage_times: dict[str, list[float]] = defaultdict(list)
+    latencies: list[float] = []
+    errors: Counter = Counter()
+    page_total = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run_one(path: str) -> None:
+        nonlocal page_total
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                page_total += await _run_services_document(path, stage_times)
+            except Exception as exc:
+                errors[_error_code(exc)] += 1
+                return
+            latencies.append(time.perf_counter() - started)
+
+    await llm_service.init_http_client()
+    try:
+        started = time.perf_counter()
+        await asyncio.wait_for(asyncio.gather(*(run_one(path) for path in paths)), ARGS.timeout)
+        elapsed = time.perf_counter() - started
+    finally:
+        await llm_service.close_http_client()
+
+    return {
+        "seconds": elapsed,
+        "latencies": latencies,
+        "errors": errors,
+        "pages": page_total,
+        "stage_latency": {stage: _summarize_ms(values) for stage, values in stage_times.items()},
+    }
+
+
+# [function] api 모드 시나리오 - 파일마다 /api/summarize/batch 업로드 후 상태 폴링 (워커 수 = concurrency)
+def run_api_scenario(paths: list[str], concurrency: int, pages: int) -> dict:
+    from fastapi.testclient import TestClient
+    from main import app
+
+    job_service.BATCH_CONCURRENCY = concurrency
+    latencies: list[float] = []
+    errors: Counter = Counter()
+    with TestClient(app) as client:
+        submitted: dict[int, float] = {}
+        started = time.perf_counter()
+        for path in paths:
+            with open(path, "rb") as file:
+                submit_started = time.perf_counter()
+                resp = client.post(
+                    "/api/summarize/batch",
+                    files={"files": (os.path.basename(path), file, "application/pdf")},
+                )
+            item = resp.json()["results"][0]
+            if item["status"] == "FAILED":
+                errors[item["message"]] += 1
+            else:
+                submitted[item["document_id"]] = submit_started
+
+        # [poll] 완료를 처음 관측한 시각으로 문서별 지연 계산 (해상도 = poll_interval)
+        deadline = started + ARGS.timeout
+        pending = set(submitted)
+        while pending and time.perf_counter() < deadline:
+            time.sleep(ARGS.poll_interval)
+            resp = client.get("/api/summarize/batch/status", params={"ids": sorted(pending)})
+            observed = time.perf_counter()
+            for item in resp.json()["results"]:
+                if item["status"] == "PENDING":
+                    continue
+                pending.discard(item["document_id"])
+                if item["status"] == "COMPLETED":
+                    latencies.append(observed - submitted[item["document_id"]])
+                else:
+                    errors[item["message"]] += 1
+        elapsed = time.perf_counter() - started
+        if pending:
+            errors["TIMEOUT"] += len(pending)
+
+    return {
+        "seconds": elapsed,
+        "latencies": latencies,
+        "errors": errors,
+        "pages": pages * len(latencies),
+        "stage_latency": {},
+    }
+
+
+# [function] 시나리오 1개 실행 -> 결과 레코드
+def run_scenario(mode: str, kind: str, pages: int, concurrency: int) -> dict:
+    paths = prepare_documents(kind, pages, ARGS.documents)
+    _reset_breakers()
+    rss_scope = "scenario" if _reset_peak_rss() else "process"
+    before = _snapshot()
+    if mode == "services":
+        outcome = asyncio.run(run_services_scenario(paths, concurrency))
+    else:
+        outcome = run_api_scenario(paths, concurrency, pages)
+    stages, gemini = _snapshot_delta(before, _snapshot())
+
+    # [stages] 메트릭 기반 건수/평균 + services 모드는 직접 측정한 백분위 추가
+    for stage, summary in outcome["stage_latency"].items():
+        stages.setdefault(stage, {}).update(summary)
+
+    completed = len(outcome["latencies"])
+    seconds = outcome["seconds"]
+    return {
+        "mode": mode,
+        "kind": kind,
+        "pages": pages,
+        "concurrency": concurrency,
+        "documents": len(paths),
+        "completed": completed,
+        "failed": sum(outcome["errors"].values()),
+        "error_codes": dict(outcome["errors"]),
+        "seconds": round(seconds, 3),
+        "documents_per_second": round(completed / seconds, 3) if seconds else 0.0,
+        "pages_per_second": round(outcome["pages"] / seconds, 2) if seconds else 0.0,
+        "latency_ms": _summarize_ms(outcome["latencies"]),
+        "stages_ms": stages,
+        "peak_rss_mb": _peak_rss_mb(),
+        "peak_rss_scope": rss_scope,
+        "gemini": gemini,
+    }
+
+
+# [function] 이전 결과와 비교 - 같은 시나리오의 처리량/p95 지연 비율 (1보다 크면 처리량 증가/지연 증가)
+def attach_baseline(results: list[dict], baseline: dict) -> None:
+    previous = {
+        (item["mode"], item["kind"], item["pages"], item["concurrency"]): item
+        for item in baseline.get("results", [])
+    }
+    for result in results:
+        old = previous.get((result["mode"], result["kind"], result["pages"], result["concurrency"]))
+        if not old:
+            continue
+        comparison = {}
+        if old.get("documents_per_second"):
+            comparison["throughput_ratio"] = round(result["documents_per_second"] / old["documents_per_second"], 3)
+        old_p95 = old.get("latency_ms", {}).get("p95")
+        new_p95 = result["latency_ms"].get("p95")
+        if old_p95 and new_p95 is not None:
+            comparison["p95_ratio"] = round(new_p95 / old_p95, 3)
+        result["baseline"] = comparison
+
+
+# [function] 실행 환경 정보 (결과를 시간에 따라 비교할 때 함께 기록)
+def environment() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=False,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "git_commit": commit or None,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "ocr_available": bool(shutil.which("tesseract") and shutil.which("pdftoppm")),
+        "metrics_enabled": metrics_service.METRICS_ENABLED,
+        "database": os.environ["DATABASE_URL"].split(":", 1)[0],
+    }
+
+
+def main() -> int:
+    if not ARGS.verbose:
+        logging.getLogger("services").setLevel(logging.CRITICAL)
+    # [baseline] 측정 전에 읽어 경로 오류를 바로 알림
+    baseline = None
+    if ARGS.baseline:
+        with open(ARGS.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+
+    results = []
+    try:
+        for mode in _csv(ARGS.modes):
+            for kind in _csv(ARGS.kinds):
+                for pages in (int(value) for value in _csv(ARGS.pages)):
+                    for concurrency in (int(value) for value in _csv(ARGS.concurrency)):
+                        result = run_scenario(mode, kind, pages, concurrency)
+                        print(
+                            "SCENARIO",
+                            mode,
+                            kind,
+                            f"pages={pages}",
+                            f"concurrency={concurrency}",
+                            f"docs/s={result['documents_per_second']}",
+                            f"p95={result['latency_ms'].get('p95')}ms",
+                            file=sys.stderr,
+                        )
+                        results.append(result)
+    finally:
+        pdf_service.shutdown_ocr_executor()
+        SERVER.shutdown()
+
+    if baseline is not None:
+        attach_baseline(results, baseline)
+
+    report = {
+        "benchmark": "pipeline",
+        "environment": environment(),
+        "config": {
+            "documents": ARGS.documents,
+            "latency_ms": ARGS.latency_ms,
+            "jitter_ms": ARGS.jitter_ms,
+            "error_rate": ARGS.error_rate,
+            "error_status": ARGS.error_status,
+            "cache_enabled": ARGS.keep_cache,
+            "chunk_max_tokens": job_service.CHUNK_MAX_TOKENS,
+            "chunk_overlap_tokens": job_service.CHUNK_OVERLAP_TOKENS,
+            "rate_limits": {
+                "summary_rpm": rate_limit_service.GEMINI_SUMMARY_RPM,
+                "summary_tpm": rate_limit_service.GEMINI_SUMMARY_TPM,
+                "embed_rpm": rate_limit_service.GEMINI_EMBED_RPM,
+                "embed_tpm": rate_limit_service.GEMINI_EMBED_TPM,
+            },
+        },
+        "results": results,
+    }
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if ARGS.output:
+        with open(ARGS.output, "w", encoding="utf-8") as file:
+            file.write(output + "\n")
+    print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,178 @@
+# [Script] 질의응답 벤치마크 - 합성 문서에 심어 둔 사실 청크를 BM25/임베딩/하이브리드가 찾는 비율, 검색 지연, 답변 문맥 크기, 캐시로 줄어든 Gemini 호출 수 (JSON 출력)
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import zlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_db_dir = tempfile.mkdtemp(prefix="bench_qa_")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_db_dir, 'bench.db')}")
+
+import numpy as np  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+
+from database import Base, get_engine  # noqa: E402
+from models.summary import DocumentChunk, Summary  # noqa: E402
+from services import llm_service, qa_service, vector_service  # noqa: E402
+from services.bm25_service import bm25_index, tokenize  # noqa: E402
+
+# [const] 합성 청크 단어 목록과 사실 문장에 쓰는 지명
+WORDS = (
+    "분기 매출 성장 비용 고객 시장 정책 지표 보고서 데이터 분석 결과 방법 서비스 품질 "
+    "revenue growth latency throughput pipeline worker queue batch index vector cache model"
+).split()
+CITIES = ("서울", "부산", "대구", "광주", "대전", "울산", "수원", "춘천")
+
+
+# [function] 명령행 인자 파싱
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark hybrid retrieval for Q&A")
+    parser.add_argument("--documents", type=int, default=200, help="문서 수")
+    parser.add_argument("--chunks", type=int, default=40, help="문서당 청크 수")
+    parser.add_argument("--chunk-words", type=int, default=120, help="청크당 단어 수")
+    parser.add_argument("--questions", type=int, default=100, help="질문 수 (질문마다 사실 청크 1개)")
+    parser.add_argument("--dim", type=int, default=256, help="합성 임베딩 차원")
+    parser.add_argument("--noise", type=float, default=0.6, help="합성 임베딩 잡음 크기 (클수록 임베딩 검색이 부정확)")
+    parser.add_argument("--top-k", type=int, default=5, help="답변에 넣을 청크 수")
+    parser.add_argument("--weights", default=str(qa_service.QA_BM25_WEIGHT), help="비교할 하이브리드 BM25 가중치 목록 (BM25 만/임베딩만은 항상 측정)")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    return parser.parse_args()
+
+
+# [function] 합성 임베딩 - 토큰 해시 빈도 벡터 + 텍스트별 고정 잡음 (의미 임베딩 대신 재현 가능한 근사)
+def fake_embedding(text: str, dim: int, noise: float) -> list[float]:
+    vector = np.zeros(dim, dtype=np.float32)
+    for token in tokenize(text):
+        vector[zlib.crc32(token.encode("utf-8")) % dim] += 1.0
+    vector /= float(np.linalg.norm(vector)) or 1.0
+    rng = np.random.default_rng(zlib.crc32(text.encode("utf-8")))
+    vector += rng.normal(0.0, noise / np.sqrt(dim), dim).astype(np.float32)
+    return vector.tolist()
+
+
+# [function] 합성 문서/청크 저장 - 질문 수만큼 청크 하나에 사실 문장을 심고 (질문, 정답 청크 키) 목록 반환
+def seed(args: argparse.Namespace) -> tuple[list[tuple[str, tuple[int, int]]], int]:
+    engine = get_engine()
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(0)
+    facts = {}
+    for idx in range(args.questions):
+        key = (rng.randint(1, args.documents), rng.randrange(args.chunks))
+        facts.setdefault(key, idx)
+
+    questions = []
+    total_chars = 0
+    with engine.begin() as conn:
+        conn.execute(
+            insert(Summary),
+            [
+                {"id": doc_id, "original_filename": f"report_{doc_id}.pdf", "summary_title": f"보고서 {doc_id}", "status": "COMPLETED"}
+                for doc_id in range(1, args.documents + 1)
+            ],
+        )
+        for doc_id in range(1, args.documents + 1):
+            rows = []
+            for chunk_index in range(args.chunks):
+                text = " ".join(rng.choice(WORDS) for _ in range(args.chunk_words)) + "."
+                fact = facts.get((doc_id, chunk_index))
+                if fact is not None:
+                    city = CITIES[fact % len(CITIES)]
+                    text += f" 프로젝트 코드명 K{fact}는 {city} 지사에서 {2000 + fact % 25}년에 시작되었다."
+                    questions.append((f"K{fact} 프로젝트는 어느 지사에서 시작되었나?", (doc_id, chunk_index)))
+                total_chars += len(text)
+                rows.append(
+                    {
+                        "document_id": doc_id,
+                        "chunk_index": chunk_index,
+                        "chunk_text": text,
+                        "page_start": chunk_index + 1,
+                        "page_end": chunk_index + 1,
+                        "embedding": vector_service.encode_embedding(fake_embedding(text, args.dim, args.noise)),
+                    }
+                )
+            conn.execute(insert(DocumentChunk), rows)
+    return questions, total_chars // args.documents
+
+
+# [function] 검색 방식별 정답 청크 포함 비율(hit@k)과 검색 지연 - weight 1: BM25 만, 0: 임베딩만
+def evaluate(questions, args: argparse.Namespace, weight: float, per_document: bool) -> dict:
+    hits, latencies = 0, []
+    for question, answer_key in questions:
+        query_vector = fake_embedding(question, args.dim, args.noise)
+        document_id = answer_key[0] if per_document else None
+        started = time.perf_counter()
+        chunks = qa_service.retrieve(question, query_vector, args.top_k, document_id, bm25_weight=weight)
+        latencies.append((time.perf_counter() - started) * 1000)
+        hits += any((chunk["document_id"], chunk["chunk_index"]) == answer_key for chunk in chunks)
+    return {
+        "hit_at_k": round(hits / len(questions), 3),
+        "p50_ms": round(statistics.median(latencies), 2),
+        "p95_ms": round(sorted(latencies)[int(len(latencies) * 0.95) - 1], 2),
+    }
+
+
+# [function] 답변 API 경로의 Gemini 호출 수 - 같은 질문 목록을 두 번 물어 캐시 효과 확인 (임베딩/답변 생성은 로컬 대체)
+async def count_calls(questions, args: argparse.Namespace) -> dict:
+    calls = {"embed": 0, "answer": 0}
+    context_chars = []
+
+    async def embed_text(text):
+        calls["embed"] += 1
+        return fake_embedding(text, args.dim, args.noise)
+
+    async def answer_question(question, contexts):
+        calls["answer"] += 1
+        context_chars.append(sum(len(context) for context in contexts))
+        return "답변"
+
+    llm_service.embed_text, llm_service.answer_question = embed_text, answer_question
+    rounds = []
+    for _ in range(2):
+        before = dict(calls)
+        for question, (document_id, _chunk_index) in questions:
+            await qa_service.answer(question, document_id=document_id, top_k=args.top_k)
+        rounds.append({name: calls[name] - before[name] for name in calls})
+    return {
+        "first_round_calls": rounds[0],
+        "repeat_round_calls": rounds[1],
+        "context_chars_p50": int(statistics.median(context_chars)) if context_chars else 0,
+        "summary_max_chars": llm_service.SUMMARY_MAX_CHARS,
+    }
+
+
+def main() -> int:
+    args = parse_args()
+    questions, document_chars = seed(args)
+
+    started = time.perf_counter()
+    bm25_index.ensure_loaded()
+    bm25_load_seconds = time.perf_counter() - started
+    vector_service.chunk_index.ensure_loaded()
+
+    # [modes] BM25 만(가중치 1), 임베딩만(가중치 0), 하이브리드 가중치별
+    modes = {"bm25": 1.0, "vector": 0.0}
+    modes.update({f"hybrid_{weight}": float(weight) for weight in args.weights.split(",") if weight.strip()})
+    results = {
+        "bm25_load_seconds": round(bm25_load_seconds, 3),
+        "document_chars_avg": document_chars,
+        "all_documents": {name: evaluate(questions, args, weight, per_document=False) for name, weight in modes.items()},
+        "per_document": {name: evaluate(questions, args, weight, per_document=True) for name, weight in modes.items()},
+        "gemini_calls": asyncio.run(count_calls(questions, args)),
+    }
+    report = {"benchmark": "qa", "config": vars(args), "questions": len(questions), "results": results}
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
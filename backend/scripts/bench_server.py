@@ -0,0 +1,236 @@
+# [Script] 서버 벤치마크 - serve.py 를 워커 수/예열 여부별로 띄워 기동 시간, 첫 요청 지연, 동시 요청 처리량, 워커 간 검색 일관성 측정 (JSON 출력)
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import fake_gemini_server  # noqa: E402
+import synthetic_pdf  # noqa: E402
+
+# [const] 백엔드 디렉터리, 기본 작업 디렉터리
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_WORK_DIR = os.path.join(tempfile.gettempdir(), "bench_server")
+
+
+# [function] 쉼표 구분 목록 파싱
+def _csv(value: str) -> list[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+# [function] 명령행 인자 파싱
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark serve.py startup, first-request latency and throughput")
+    parser.add_argument("--workers", default="1,2,4", help="워커 프로세스 수 목록")
+    parser.add_argument("--warmup", default="on,off", help="예열 여부 목록 (on, off)")
+    parser.add_argument("--documents", type=int, default=4, help="검색 대상으로 미리 올릴 합성 PDF 수")
+    parser.add_argument("--requests", type=int, default=50, help="지연 측정 요청 수 (첫 요청 제외)")
+    parser.add_argument("--concurrency", type=int, default=16, help="처리량 측정 동시 요청 수")
+    parser.add_argument("--duration", type=float, default=5.0, help="처리량 측정 시간(초)")
+    parser.add_argument("--work-dir", default=DEFAULT_WORK_DIR, help="SQLite/공유 상태/업로드 작업 디렉터리")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    return parser.parse_args()
+
+
+# [function] 비어 있는 TCP 포트
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+# [function] 밀리초 단위 요약 통계
+def _summarize_ms(values: list[float]) -> dict:
+    ordered = sorted(values)
+    return {
+        "count": len(ordered),
+        "p50": round(statistics.median(ordered) * 1000, 2),
+        "p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 2),
+    }
+
+
+# [function] 서버 프로세스 기동 - 응답할 때까지 대기, 기동 시간(초) 반환
+def start_server(workers: int, warmup: bool, work_dir: str, gemini_url: str) -> tuple[subprocess.Popen, str, float]:
+    shutil.rmtree(work_dir, ignore_errors=True)
+    os.makedirs(work_dir)
+    port = _free_port()
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{os.path.join(work_dir, 'bench.db')}",
+        "SHARED_STATE_PATH": os.path.join(work_dir, "shared_state.db"),
+        "UPLOAD_DIR": os.path.join(work_dir, "uploads"),
+        "GEMINI_API_BASE_URL": gemini_url,
+        "GEMINI_API_KEY": os.environ.get("GEMINI_API_KEY", "fake-key"),
+        "EMBEDDING_DIM": str(fake_gemini_server.EMBEDDING_DIM),
+        "WARMUP_ENABLED": "true" if warmup else "false",
+        "WARMUP_INDEXES": "true" if warmup else "false",
+    }
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "serve.py", "--workers", str(workers), "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    while True:
+        if process.poll() is not None:
+            raise RuntimeError(f"serve.py exited with code {process.returncode}")
+        try:
+            httpx.get(f"{base_url}/metrics", timeout=1)
+            break
+        except httpx.TransportError:
+            time.sleep(0.05)
+    return process, base_url, time.perf_counter() - started
+
+
+# [function] 서버 종료
+def stop_server(process: subprocess.Popen) -> None:
+    process.terminate()
+    try:
+        process.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+# [function] 합성 PDF 업로드 후 모두 완료될 때까지 대기
+def seed_documents(base_url: str, count: int) -> int:
+    files = [
+        ("files", (f"seed-{idx}.pdf", synthetic_pdf.build_pdf(3, "text", seed=idx), "application/pdf"))
+        for idx in range(count)
+    ]
+    response = httpx.post(f"{base_url}/api/summarize/batch", files=files, timeout=60)
+    ids = [item["document_id"] for item in response.json()["results"]]
+    deadline = time.monotonic() + 120
+    while time.monotonic() < deadline:
+        status = httpx.get(f"{base_url}/api/summarize/batch/status", params={"ids": ids}, timeout=10).json()
+        if all(item["status"] != "PENDING" for item in status["results"]):
+            return sum(1 for item in status["results"] if item["status"] == "COMPLETED")
+        time.sleep(0.1)
+    return 0
+
+
+# [function] 첫 요청과 이후 요청 지연 측정 - 엔드포인트별
+def measure_latency(base_url: str, requests: int) -> dict:
+    endpoints = {
+        "list": ("/api/summaries", {"limit": 20}),
+        "search": ("/api/search", {"q": "pipeline latency", "top_k": 5}),
+    }
+    results = {}
+    with httpx.Client(base_url=base_url, timeout=30) as client:
+        for name, (path, params) in endpoints.items():
+            timings = []
+            for _ in range(requests + 1):
+                started = time.perf_counter()
+                client.get(path, params=params).raise_for_status()
+                timings.append(time.perf_counter() - started)
+            steady = _summarize_ms(timings[1:])
+            results[name] = {
+                "first_ms": round(timings[0] * 1000, 2),
+                "steady_ms": steady,
+                "first_to_p50": round(timings[0] * 1000 / steady["p50"], 2) if steady["p50"] else None,
+            }
+    return results
+
+
+# [function] 동시 요청 처리량 - 목록 조회를 duration 동안 반복, 검색 결과에 시드 문서가 모두 보이는지 확인
+async def measure_throughput(base_url: str, concurrency: int, duration: float, seeded: int) -> dict:
+    completed = 0
+    errors = 0
+    incomplete_search = 0
+    deadline = time.perf_counter() + duration
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=30, limits=httpx.Limits(max_connections=concurrency)) as client:
+        async def loop() -> None:
+            nonlocal completed, errors
+            while time.perf_counter() < deadline:
+                response = await client.get("/api/summaries", params={"limit": 20})
+                if response.status_code == 200:
+                    completed += 1
+                else:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(loop() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+        # [consistency] 새 커넥션으로 여러 번 검색해 어느 워커가 받아도 다른 워커가 저장한 문서가 보이는지 확인
+        for _ in range(20):
+            async with httpx.AsyncClient(base_url=base_url, timeout=30) as fresh:
+                body = (await fresh.get("/api/search", params={"q": "pipeline", "top_k": 50})).json()
+            if len(body["documents"]) < seeded:
+                incomplete_search += 1
+
+    return {
+        "requests_per_second": round(completed / elapsed, 1),
+        "errors": errors,
+        "search_missing_documents": incomplete_search,
+    }
+
+
+def main() -> int:
+    args = parse_args()
+    server = fake_gemini_server.start_fake_gemini_server()
+    results = []
+    try:
+        for workers in (int(value) for value in _csv(args.workers)):
+            for warmup in (value == "on" for value in _csv(args.warmup)):
+                process, base_url, startup = start_server(workers, warmup, args.work_dir, server.base_url)
+                try:
+                    # [order] 첫 요청 지연을 먼저 잰 뒤 문서를 올리고 처리량/일관성 측정
+                    latency = measure_latency(base_url, args.requests)
+                    seeded = seed_documents(base_url, args.documents)
+                    throughput = asyncio.run(
+                        measure_throughput(base_url, args.concurrency, args.duration, seeded)
+                    )
+                finally:
+                    stop_server(process)
+                results.append(
+                    {
+                        "workers": workers,
+                        "warmup": warmup,
+                        "startup_seconds": round(startup, 2),
+                        "latency": latency,
+                        "seeded_documents": seeded,
+                        **throughput,
+                    }
+                )
+    finally:
+        server.shutdown()
+
+    # [scaling] 같은 예열 설정의 1워커 대비 처리량 비율
+    for record in results:
+        single = next(
+            (item for item in results if item["workers"] == 1 and item["warmup"] == record["warmup"]),
+            None,
+        )
+        if single and single["requests_per_second"]:
+            record["throughput_vs_1_worker"] = round(record["requests_per_second"] / single["requests_per_second"], 2)
+
+    report = {
+        "benchmark": "server",
+        "environment": {"cpu_count": os.cpu_count(), "python": sys.version.split()[0]},
+        "results": results,
+    }
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
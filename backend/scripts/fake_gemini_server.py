@@ -0,0 +1,206 @@
+# [Script] 로컬 Gemini 스텁 서버 - 외부 API 없이 llm_service를 점검하기 위한 HTTP 서버
+import argparse
+import json
+import random
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# [const] 스텁 임베딩 차원
+EMBEDDING_DIM = 8
+# [const] 스텁 요약 응답 / 스트리밍 시 조각 크기(문자)
+FAKE_SUMMARY = {"title": "스텁 제목", "summary": "스텁 요약 본문"}
+STREAM_PIECE_CHARS = 4
+
+
+# [function] 텍스트로부터 결정적인 가짜 임베딩 생성
+def fake_embedding(text: str) -> list[float]:
+    seed = sum(ord(ch) for ch in text) or 1
+    return [((seed * (idx + 1)) % 97) / 97 for idx in range(EMBEDDING_DIM)]
+
+
+# [class] Gemini REST 엔드포인트 흉내 - embedContent / batchEmbedContents / generateContent / streamGenerateContent
+class FakeGeminiHandler(BaseHTTPRequestHandler):
+    # [config] keep-alive 재사용 확인을 위해 HTTP/1.1 사용
+    protocol_version = "HTTP/1.1"
+    # [config] 헤더/본문을 나눠 쓰므로 Nagle 을 끄지 않으면 keep-alive 요청마다 지연 ACK(~40ms)만큼 늦어짐
+    disable_nagle_algorithm = True
+
+    # [function] 새 TCP 연결마다 연결 수 집계
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connection_count += 1
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        with self.server.lock:
+            self.server.request_count += 1
+
+        if not self.headers.get("x-goog-api-key"):
+            self._send_json(403, {"error": {"message": "API key missing"}})
+            return
+
+        # [error mode] 예약된 오류 응답이 있으면 순서대로 반환 (429/503 등 재시도/서킷 점검용)
+        scripted = self.server.pop_scripted_error()
+        if scripted is not None:
+            status, retry_after = scripted
+            headers = {"Retry-After": str(retry_after)} if retry_after is not None else {}
+            self._send_json(status, {"error": {"code": status, "message": "scripted error"}}, headers)
+            return
+
+        # [latency/error mode] 설정된 지연 후 error_rate 확률로 오류 응답 (벤치마크용)
+        self.server.simulate_latency()
+        injected = self.server.pick_random_error()
+        if injected is not None:
+            self._send_json(injected, {"error": {"code": injected, "message": "injected error"}})
+            return
+
+        path = self.path.split("?", 1)[0]
+        if path.endswith(":embedContent"):
+            text = payload["content"]["parts"][0]["text"]
+            self._send_json(200, {"embedding": {"values": fake_embedding(text)}})
+        elif path.endswith(":batchEmbedContents"):
+            embeddings = [
+                {"values": fake_embedding(item["content"]["parts"][0]["text"])}
+                for item in payload.get("requests", [])
+            ]
+            self._send_json(200, {"embeddings": embeddings})
+        elif path.endswith(":generateContent"):
+            answer = json.dumps(FAKE_SUMMARY, ensure_ascii=False)
+            self._send_json(
+                200,
+                {"candidates": [{"content": {"parts": [{"text": answer}]}}]},
+            )
+        elif path.endswith(":streamGenerateContent"):
+            answer = json.dumps(FAKE_SUMMARY, ensure_ascii=False)
+            pieces = [
+                answer[start:start + STREAM_PIECE_CHARS]
+                for start in range(0, len(answer), STREAM_PIECE_CHARS)
+            ]
+            self._send_sse(
+                [{"candidates": [{"content": {"parts": [{"text": piece}]}}]} for piece in pieces]
+                + [{"candidates": [{"finishReason": "STOP"}]}]
+            )
+        else:
+            self._send_json(404, {"error": {"message": f"unknown path {path}"}})
+
+    def _send_json(self, status: int, body: dict, headers: dict | None = None):
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    # [function] SSE 이벤트를 chunked 전송 (alt=sse 스트리밍 응답 흉내)
+    def _send_sse(self, events: list[dict]):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for event in events:
+            data = f"data: {json.dumps(event, ensure_ascii=False)}\r\n\r\n".encode("utf-8")
+            self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+            self.wfile.flush()
+        self.wfile.write(b"0\r\n\r\n")
+
+    # [function] 요청 로그 출력 억제
+    def log_message(self, format, *args):
+        return
+
+
+# [class] 요청/연결 수를 기록하는 스텁 서버 - 응답 지연(latency ± jitter)과 무작위 오류율(error_rate) 설정 가능
+class FakeGeminiServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        latency_jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        seed: int | None = None,
+    ):
+        super().__init__((host, port), FakeGeminiHandler)
+        self.lock = threading.Lock()
+        self.connection_count = 0
+        self.request_count = 0
+        self.injected_error_count = 0
+        self.scripted_errors: deque[tuple[int, float | None]] = deque()
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self._random = random.Random(seed)
+
+    # [function] 설정된 응답 지연만큼 대기 (핸들러 스레드에서 호출)
+    def simulate_latency(self) -> None:
+        if self.latency <= 0 and self.latency_jitter <= 0:
+            return
+        with self.lock:
+            jitter = self._random.uniform(-self.latency_jitter, self.latency_jitter)
+        time.sleep(max(0.0, self.latency + jitter))
+
+    # [function] error_rate 확률로 주입할 오류 상태 코드 반환 (없으면 None)
+    def pick_random_error(self) -> int | None:
+        if self.error_rate <= 0:
+            return None
+        with self.lock:
+            if self._random.random() >= self.error_rate:
+                return None
+            self.injected_error_count += 1
+            return self.error_status
+
+    # [function] 다음 count 개 요청에 지정 상태 코드로 응답하도록 예약 (retry_after 가 있으면 Retry-After 헤더 포함)
+    def fail_next(self, status: int, count: int = 1, retry_after: float | None = None) -> None:
+        with self.lock:
+            self.scripted_errors.extend([(status, retry_after)] * count)
+
+    # [function] 예약된 오류 응답 하나 꺼내기
+    def pop_scripted_error(self) -> tuple[int, float | None] | None:
+        with self.lock:
+            return self.scripted_errors.popleft() if self.scripted_errors else None
+
+    # [function] 예약된 오류 응답 모두 취소
+    def clear_scripted_errors(self) -> None:
+        with self.lock:
+            self.scripted_errors.clear()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1beta"
+
+
+# [function] 백그라운드 스레드에서 스텁 서버 시작 (지연/오류율 옵션은 FakeGeminiServer 참고)
+def start_fake_gemini_server(host: str = "127.0.0.1", port: int = 0, **options) -> FakeGeminiServer:
+    server = FakeGeminiServer(host, port, **options)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local fake Gemini REST server")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="응답 지연(ms)")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="응답 지연 편차(ms, ±)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="무작위 오류 응답 비율 (0~1)")
+    parser.add_argument("--error-status", type=int, default=503, help="무작위 오류 응답 상태 코드")
+    args = parser.parse_args()
+    fake_server = FakeGeminiServer(
+        port=args.port,
+        latency=args.latency_ms / 1000,
+        latency_jitter=args.jitter_ms / 1000,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+    )
+    print("FAKE_GEMINI_URL", fake_server.base_url)
+    fake_server.serve_forever()
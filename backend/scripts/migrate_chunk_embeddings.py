@@ -0,0 +1,177 @@
+# [Script] 기존 DB 마이그레이션 - document_chunks.embedding_json(JSON 문자열)을 embedding(float32 바이너리/pgvector) 컬럼으로 변환
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import LargeBinary, bindparam, column, inspect, select, table, text, update  # noqa: E402
+from database import SessionLocal, get_engine  # noqa: E402
+from models.summary import EMBEDDING_DIM, USE_PGVECTOR, DocumentChunk, create_tables  # noqa: E402
+from services import vector_service  # noqa: E402
+
+# [const] 이전 스키마의 document_chunks 테이블 (embedding_json 컬럼 포함)
+LEGACY_CHUNKS = table("document_chunks", column("id"), column("embedding_json"), column("embedding"))
+
+
+# [function] 명령행 인자 파싱
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Convert document_chunks.embedding_json into the embedding column")
+    parser.add_argument("--batch-size", type=int, default=1000, help="한 번에 변환할 청크 수")
+    parser.add_argument(
+        "--delete-invalid",
+        action="store_true",
+        help="embedding_json 을 읽을 수 없는 청크를 삭제하고 계속 진행 (해당 문서는 다시 요약해야 검색됨)",
+    )
+    parser.add_argument(
+        "--embedding-model",
+        default=None,
+        help="embedding_model 이 비어 있는 기존 청크에 기록할 모델 이름 (지정하지 않으면 비워 두어 유사 문서 임베딩 재사용에서 제외)",
+    )
+    return parser.parse_args()
+
+
+# [function] document_chunks 컬럼 이름 목록
+def chunk_columns() -> set[str]:
+    return {item["name"] for item in inspect(get_engine()).get_columns(DocumentChunk.__tablename__)}
+
+
+# [function] 새 컬럼 추가 - embedding 은 값을 채운 뒤 NOT NULL 로 바꾸므로 일단 NULL 허용, 쪽 번호/임베딩 모델 컬럼은 원래 NULL 허용
+def add_missing_columns(columns: set[str]) -> list[str]:
+    engine = get_engine()
+    if USE_PGVECTOR:
+        embedding_type = f"vector({EMBEDDING_DIM})"
+    else:
+        embedding_type = LargeBinary().compile(dialect=engine.dialect)
+    model_type = DocumentChunk.__table__.c.embedding_model.type.compile(dialect=engine.dialect)
+    new_columns = (
+        ("embedding", embedding_type),
+        ("page_start", "INTEGER"),
+        ("page_end", "INTEGER"),
+        ("embedding_model", model_type),
+    )
+    added = []
+    with engine.begin() as connection:
+        for name, column_type in new_columns:
+            if name not in columns:
+                connection.execute(text(f"ALTER TABLE document_chunks ADD COLUMN {name} {column_type}"))
+                added.append(name)
+    return added
+
+
+# [function] embedding 이 비어 있는 청크를 배치 단위로 변환 - (변환 수, 읽을 수 없는 청크 ID 목록)
+def backfill(batch_size: int) -> tuple[int, list[int]]:
+    converted = 0
+    invalid = []
+    last_id = 0
+    stmt = (
+        update(DocumentChunk.__table__)
+        .where(DocumentChunk.__table__.c.id == bindparam("chunk_id"))
+        .values(embedding=bindparam("vector"))
+    )
+    db = SessionLocal()
+    try:
+        while True:
+            rows = db.execute(
+                select(LEGACY_CHUNKS.c.id, LEGACY_CHUNKS.c.embedding_json)
+                .where(LEGACY_CHUNKS.c.id > last_id, LEGACY_CHUNKS.c.embedding.is_(None))
+                .order_by(LEGACY_CHUNKS.c.id)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+
+            params = []
+            for row in rows:
+                try:
+                    values = json.loads(row.embedding_json or "")
+                except ValueError:
+                    values = None
+                if not isinstance(values, list) or not values:
+                    invalid.append(row.id)
+                    continue
+                params.append({"chunk_id": row.id, "vector": vector_service.encode_embedding(values)})
+            if params:
+                db.execute(stmt, params)
+                db.commit()
+            converted += len(params)
+    finally:
+        db.close()
+    return converted, invalid
+
+
+# [function] 청크 삭제
+def delete_chunks(chunk_ids: list[int]) -> None:
+    with get_engine().begin() as connection:
+        for start in range(0, len(chunk_ids), 500):
+            connection.execute(
+                DocumentChunk.__table__.delete().where(DocumentChunk.__table__.c.id.in_(chunk_ids[start:start + 500]))
+            )
+
+
+# [function] embedding NOT NULL 지정 후 embedding_json 삭제 (SQLite 는 컬럼 제약을 바꿀 수 없어 NULL 허용으로 둠)
+def finalize_columns() -> dict:
+    engine = get_engine()
+    backend = engine.dialect.name
+    result = {"embedding_not_null": False, "dropped_column": False}
+    with engine.begin() as connection:
+        if backend == "postgresql":
+            connection.execute(text("ALTER TABLE document_chunks ALTER COLUMN embedding SET NOT NULL"))
+            result["embedding_not_null"] = True
+        elif backend in ("mysql", "mariadb"):
+            embedding_type = LargeBinary().compile(dialect=engine.dialect)
+            connection.execute(text(f"ALTER TABLE document_chunks MODIFY embedding {embedding_type} NOT NULL"))
+            result["embedding_not_null"] = True
+        connection.execute(text("ALTER TABLE document_chunks DROP COLUMN embedding_json"))
+        result["dropped_column"] = True
+    return result
+
+
+# [function] 임베딩 모델이 비어 있는 청크에 모델 이름 기록 - 변경 행 수
+def fill_embedding_model(model: str) -> int:
+    table = DocumentChunk.__table__
+    with get_engine().begin() as connection:
+        result = connection.execute(
+            update(table).where(table.c.embedding_model.is_(None)).values(embedding_model=model)
+        )
+    return result.rowcount
+
+
+# [function] 모델에 정의됐지만 DB 에 없는 document_chunks 인덱스 생성 (pgvector HNSW 인덱스 포함)
+def create_missing_indexes() -> list[str]:
+    existing = {index["name"] for index in inspect(get_engine()).get_indexes(DocumentChunk.__tablename__)}
+    created = []
+    for index in DocumentChunk.__table__.indexes:
+        if index.name not in existing:
+            index.create(bind=get_engine())
+            created.append(index.name)
+    return created
+
+
+def main() -> int:
+    args = parse_args()
+    create_tables(get_engine())
+
+    columns = chunk_columns()
+    result = {"added_columns": add_missing_columns(columns), "converted": 0, "invalid_chunk_ids": []}
+    if "embedding_json" in columns:
+        result["converted"], result["invalid_chunk_ids"] = backfill(args.batch_size)
+        # [invalid] 변환하지 못한 청크가 남아 있으면 원본 컬럼을 지우지 않음 (--delete-invalid 면 삭제 후 진행)
+        if result["invalid_chunk_ids"] and args.delete_invalid:
+            delete_chunks(result["invalid_chunk_ids"])
+        elif result["invalid_chunk_ids"]:
+            print(json.dumps({"migration": "chunk_embeddings", **result}, ensure_ascii=False, indent=2))
+            return 1
+        result.update(finalize_columns())
+
+    if args.embedding_model:
+        result["embedding_model_filled"] = fill_embedding_model(args.embedding_model)
+    result["created_indexes"] = create_missing_indexes()
+    print(json.dumps({"migration": "chunk_embeddings", **result}, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
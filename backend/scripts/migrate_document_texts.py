@@ -0,0 +1,136 @@
+# [Script] 기존 DB 마이그레이션 - documents.original_text 를 document_texts(압축)로 이동 + 누락 인덱스 생성
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import MetaData, Table, column, inspect, select, table, text  # noqa: E402
+from database import SessionLocal, get_engine  # noqa: E402
+from models.summary import DocumentText, Summary, create_tables  # noqa: E402
+
+# [const] 이전 스키마의 documents 테이블 (original_text 컬럼 포함)
+LEGACY_DOCUMENTS = table("documents", column("id"), column("original_text"))
+
+
+# [function] 명령행 인자 파싱
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Move documents.original_text into document_texts")
+    parser.add_argument("--batch-size", type=int, default=500, help="한 번에 옮길 문서 수")
+    parser.add_argument(
+        "--keep-column",
+        action="store_true",
+        help="복사 후 documents.original_text 컬럼을 삭제하지 않음 (새 문서는 값을 넣지 않으므로 NULL 허용으로 바꿈)",
+    )
+    return parser.parse_args()
+
+
+# [function] 원문을 배치 단위로 document_texts 에 복사 (이미 옮긴 문서는 건너뜀)
+def copy_texts(batch_size: int) -> int:
+    copied = 0
+    last_id = 0
+    db = SessionLocal()
+    try:
+        while True:
+            rows = db.execute(
+                select(LEGACY_DOCUMENTS.c.id, LEGACY_DOCUMENTS.c.original_text)
+                .where(LEGACY_DOCUMENTS.c.id > last_id)
+                .order_by(LEGACY_DOCUMENTS.c.id)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+
+            ids = [row.id for row in rows]
+            existing = set(
+                db.execute(
+                    select(DocumentText.document_id).where(DocumentText.document_id.in_(ids))
+                ).scalars()
+            )
+            for row in rows:
+                if row.id in existing or not row.original_text:
+                    continue
+                db.add(DocumentText(document_id=row.id, original_text=row.original_text))
+                copied += 1
+            db.commit()
+    finally:
+        db.close()
+    return copied
+
+
+# [function] SQLite 는 컬럼 제약을 바꿀 수 없으므로 documents 테이블을 original_text NULL 허용으로 다시 만듦 (데이터/인덱스 유지)
+def _rebuild_sqlite_documents() -> None:
+    engine = get_engine()
+    legacy = Table(Summary.__tablename__, MetaData(), autoload_with=engine)
+    indexes = inspect(engine).get_indexes(Summary.__tablename__)
+    rebuilt = legacy.to_metadata(MetaData(), name="documents__rebuild")
+    rebuilt.indexes.clear()
+    rebuilt.c.original_text.nullable = True
+    names = ", ".join(f'"{item.name}"' for item in legacy.columns)
+    with engine.begin() as connection:
+        rebuilt.create(connection)
+        connection.exec_driver_sql(f"INSERT INTO documents__rebuild ({names}) SELECT {names} FROM documents")
+        connection.exec_driver_sql("DROP TABLE documents")
+        connection.exec_driver_sql("ALTER TABLE documents__rebuild RENAME TO documents")
+        for index in indexes:
+            unique = "UNIQUE " if index["unique"] else ""
+            index_columns = ", ".join(f'"{name}"' for name in index["column_names"])
+            connection.exec_driver_sql(f'CREATE {unique}INDEX "{index["name"]}" ON documents ({index_columns})')
+
+
+# [function] 남겨 둔 original_text 를 NULL 허용으로 변경 (모델이 더 이상 값을 넣지 않아 NOT NULL 이면 새 문서 저장 실패)
+def make_original_text_nullable() -> bool:
+    engine = get_engine()
+    column_info = next(
+        item for item in inspect(engine).get_columns(Summary.__tablename__) if item["name"] == "original_text"
+    )
+    if column_info["nullable"]:
+        return False
+    backend = engine.dialect.name
+    if backend == "sqlite":
+        _rebuild_sqlite_documents()
+        return True
+    with engine.begin() as connection:
+        if backend in ("mysql", "mariadb"):
+            column_type = column_info["type"].compile(dialect=engine.dialect)
+            connection.execute(text(f"ALTER TABLE documents MODIFY original_text {column_type} NULL"))
+        else:
+            connection.execute(text("ALTER TABLE documents ALTER COLUMN original_text DROP NOT NULL"))
+    return True
+
+
+# [function] 모델에 정의됐지만 DB 에 없는 documents 인덱스 생성
+def create_missing_indexes() -> list[str]:
+    existing = {index["name"] for index in inspect(get_engine()).get_indexes(Summary.__tablename__)}
+    created = []
+    for index in Summary.__table__.indexes:
+        if index.name not in existing:
+            index.create(bind=get_engine())
+            created.append(index.name)
+    return created
+
+
+def main() -> int:
+    args = parse_args()
+    create_tables(get_engine())
+
+    columns = {item["name"] for item in inspect(get_engine()).get_columns(Summary.__tablename__)}
+    result = {"copied": 0, "dropped_column": False}
+    if "original_text" in columns:
+        result["copied"] = copy_texts(args.batch_size)
+        if not args.keep_column:
+            with get_engine().begin() as connection:
+                connection.execute(text("ALTER TABLE documents DROP COLUMN original_text"))
+            result["dropped_column"] = True
+        else:
+            result["made_nullable"] = make_original_text_nullable()
+
+    result["created_indexes"] = create_missing_indexes()
+    print(json.dumps({"migration": "document_texts", **result}, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,7 +1,12 @@
+import io
+import json
+import time
+import zipfile
+
 from fastapi.testclient import TestClient
 
 from main import app
-from routers import summarize as summarize_router
+from services import job_service
 
 
 def run_smoke_test() -> int:
@@ -17,27 +22,46 @@ def run_smoke_test() -> int:
         print("BATCH_FAIL_BODY", bad_resp.json())
 
         # 3) 성공 경로: 외부 API 의존성을 없애기 위해 서비스 모킹
-        original_extract = summarize_router.pdf_service.extract_text
-        original_split = summarize_router.pdf_service.split_text_into_chunks
-        original_embed = summarize_router.llm_service.embed_chunks
-        original_summarize = summarize_router.llm_service.summarize
-
-        async def fake_extract(_file, max_file_size_bytes=None):
-            return "테스트 원문 텍스트입니다."
-
-        def fake_split(_text, chunk_size=1200, overlap=200):
-            return ["테스트 원문", "텍스트입니다"]
+        original_extract = job_service.pdf_service.extract_pages
+        original_split = job_service.pdf_service.split_pages_into_chunks
+        original_embed = job_service.llm_service.embed_chunks
+        original_embed_text = job_service.llm_service.embed_text
+        original_summarize = job_service.llm_service.summarize
+        original_answer_question = job_service.llm_service.answer_question
+
+        async def fake_extract(_path):
+            return [{"page": 1, "text": "테스트 원문 텍스트입니다.", "source": "text"}]
+
+        def fake_split(_pages, max_tokens=512, overlap_tokens=64):
+            return [
+                {"text": "테스트 원문", "page_start": 1, "page_end": 1},
+                {"text": "텍스트입니다", "page_start": 1, "page_end": 1},
+            ]
 
         async def fake_embed(_chunks):
             return [[0.1, 0.2], [0.3, 0.4]]
 
-        async def fake_summarize(_text):
+        async def fake_embed_text(_text):
+            return [0.3, 0.4]
+
+        async def fake_summarize(_text, chunks=None, on_delta=None):
+            if on_delta is not None:
+                for piece in ("테스트 ", "요약 ", "본문"):
+                    on_delta("summary", piece)
             return {"title": "테스트 제목", "summary": "테스트 요약 본문"}
 
-        summarize_router.pdf_service.extract_text = fake_extract
-        summarize_router.pdf_service.split_text_into_chunks = fake_split
-        summarize_router.llm_service.embed_chunks = fake_embed
-        summarize_router.llm_service.summarize = fake_summarize
+        answer_calls = []
+
+        async def fake_answer_question(question, contexts):
+            answer_calls.append(question)
+            return f"발췌문 {len(contexts)}개 기반 답변 [1]"
+
+        job_service.llm_service.answer_question = fake_answer_question
+        job_service.pdf_service.extract_pages = fake_extract
+        job_service.pdf_service.split_pages_into_chunks = fake_split
+        job_service.llm_service.embed_chunks = fake_embed
+        job_service.llm_service.embed_text = fake_embed_text
+        job_service.llm_service.summarize = fake_summarize
 
         try:
             good_files = {"files": ("good.pdf", b"%PDF-1.4\n%mock\n", "application/pdf")}
@@ -49,7 +73,18 @@ def run_smoke_test() -> int:
             if not results:
                 return 1
 
+            # 4) 백그라운드 처리 완료까지 배치 상태 폴링
             doc_id = results[0]["document_id"]
+            status_body = {}
+            for _ in range(50):
+                status_resp = client.get("/api/summarize/batch/status", params={"ids": [doc_id]})
+                status_body = status_resp.json()
+                if status_body["results"][0]["status"] != "PENDING":
+                    break
+                time.sleep(0.1)
+            print("BATCH_STATUS_STATUS", status_resp.status_code)
+            print("BATCH_STATUS_BODY", status_body)
+
             detail_resp = client.get(f"/api/summaries/{doc_id}")
             print("DETAIL_STATUS", detail_resp.status_code)
             print("DETAIL_BODY", detail_resp.json())
@@ -58,11 +93,93 @@ def run_smoke_test() -> int:
             print("DOWNLOAD_STATUS", download_resp.status_code)
             print("DOWNLOAD_HEAD", download_resp.headers.get("content-disposition"))
             print("DOWNLOAD_TEXT", download_resp.text[:80])
+            # [cache] 같은 ETag 로 다시 요청하면 본문 없이 304, Range 요청은 해당 바이트만 206
+            etag = download_resp.headers.get("etag")
+            print("DOWNLOAD_ETAG", etag, download_resp.headers.get("last-modified"))
+            cached_resp = client.get(f"/api/summaries/{doc_id}/download", headers={"If-None-Match": etag})
+            print("DOWNLOAD_304", cached_resp.status_code, len(cached_resp.content))
+            range_resp = client.get(f"/api/summaries/{doc_id}/download", headers={"Range": "bytes=0-5"})
+            print("DOWNLOAD_RANGE", range_resp.status_code, range_resp.headers.get("content-range"), range_resp.content == download_resp.content[:6])
+
+            # [export] 일괄 내보내기 - NDJSON 한 줄당 문서 하나, ZIP 은 문서별 TXT 항목
+            ndjson_resp = client.get("/api/summaries/export", params={"format": "ndjson", "ids": [doc_id]})
+            print("EXPORT_NDJSON", ndjson_resp.status_code, [json.loads(line)["id"] for line in ndjson_resp.text.splitlines()])
+            zip_resp = client.get("/api/summaries/export", params={"format": "zip"})
+            with zipfile.ZipFile(io.BytesIO(zip_resp.content)) as archive:
+                print("EXPORT_ZIP", zip_resp.status_code, archive.namelist()[:3], archive.testzip())
+
+            page_resp = client.get("/api/summaries", params={"limit": 1, "filename_prefix": "good"})
+            print("LIST_PAGE_STATUS", page_resp.status_code)
+            print("LIST_PAGE_BODY", page_resp.json())
+            next_cursor = page_resp.json().get("next_cursor")
+            if next_cursor:
+                next_resp = client.get("/api/summaries", params={"limit": 1, "cursor": next_cursor})
+                print("LIST_NEXT_STATUS", next_resp.status_code)
+
+            # 5) 스트리밍 배치: 문서별 단계 이벤트와 최종 결과 확인
+            stream_files = {"files": ("stream.pdf", b"%PDF-1.4\n%mock\n", "application/pdf")}
+            with client.stream("POST", "/api/summarize/batch/stream", files=stream_files) as stream_resp:
+                events = [json.loads(line) for line in stream_resp.iter_lines() if line]
+            print("STREAM_STATUS", stream_resp.status_code)
+            print(
+                "STREAM_EVENTS",
+                [f"{event['event']}:{event['stage']}:{event['status']}" if event["event"] == "stage" else event["event"] for event in events],
+            )
+            print("STREAM_DONE", events[-1] if events else None)
+            # [dedup] 같은 원문을 다시 올렸으므로 이전 문서의 청크 임베딩을 재사용
+            dedup_event = next(
+                (event for event in events if event["event"] == "stage" and event["stage"] == "dedup" and event["status"] == "done"),
+                None,
+            )
+            print("STREAM_DEDUP", dedup_event and {key: dedup_event[key] for key in ("duplicate_of", "similarity", "reused_chunks")})
+
+            # 6) 단일 파일 요약 스트리밍: summary_delta 이벤트로 부분 요약 전달
+            single_file = {"file": ("single.pdf", b"%PDF-1.4\n%mock\n", "application/pdf")}
+            with client.stream("POST", "/api/summarize/stream", files=single_file) as single_resp:
+                single_events = [json.loads(line) for line in single_resp.iter_lines() if line]
+            print("SUMMARY_STREAM_STATUS", single_resp.status_code)
+            print(
+                "SUMMARY_STREAM_TEXT",
+                "".join(event["text"] for event in single_events if event["event"] == "summary_delta"),
+            )
+
+            search_resp = client.get("/api/search", params={"q": "텍스트", "top_k": 1})
+            print("SEARCH_STATUS", search_resp.status_code)
+            print("SEARCH_BODY", search_resp.json())
+
+            # 7) 질의응답: 하이브리드 검색으로 고른 청크만 답변 생성에 전달, 같은 질문은 캐시된 답변
+            ask_body = {"question": "텍스트 내용은?", "top_k": 2}
+            ask_resp = client.post(f"/api/summaries/{doc_id}/ask", json=ask_body)
+            print("ASK_STATUS", ask_resp.status_code)
+            print("ASK_BODY", {key: ask_resp.json().get(key) for key in ("answer", "cached")})
+            print("ASK_SOURCES", [(item["document_id"], item["chunk_index"], round(item["score"], 3)) for item in ask_resp.json().get("sources", [])])
+            ask_again = client.post(f"/api/summaries/{doc_id}/ask", json=ask_body)
+            print("ASK_CACHED", ask_again.json().get("cached"), "ANSWER_CALLS", len(answer_calls))
+            ask_all_resp = client.post("/api/ask", json={"question": "테스트 원문"})
+            print("ASK_ALL_STATUS", ask_all_resp.status_code, sorted({item["document_id"] for item in ask_all_resp.json().get("sources", [])}))
+            ask_missing = client.post("/api/summaries/999999/ask", json=ask_body)
+            print("ASK_NOT_FOUND", ask_missing.status_code, ask_missing.json())
+
+            # 8) Prometheus 메트릭: 처리한 문서의 단계별 소요 시간이 집계됨
+            metrics_resp = client.get("/metrics")
+            print("METRICS_STATUS", metrics_resp.status_code)
+            print(
+                "METRICS_STAGES",
+                sorted(
+                    {
+                        line.split('stage="')[1].split('"')[0]
+                        for line in metrics_resp.text.splitlines()
+                        if line.startswith("pipeline_stage_seconds_count")
+                    }
+                ),
+            )
         finally:
-            summarize_router.pdf_service.extract_text = original_extract
-            summarize_router.pdf_service.split_text_into_chunks = original_split
-            summarize_router.llm_service.embed_chunks = original_embed
-            summarize_router.llm_service.summarize = original_summarize
+            job_service.pdf_service.extract_pages = original_extract
+            job_service.pdf_service.split_pages_into_chunks = original_split
+            job_service.llm_service.embed_chunks = original_embed
+            job_service.llm_service.embed_text = original_embed_text
+            job_service.llm_service.summarize = original_summarize
+            job_service.llm_service.answer_question = original_answer_question
 
     return 0
 
@@ -0,0 +1,56 @@
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from fake_gemini_server import start_fake_gemini_server
+
+# [env] llm_service 임포트 전에 스텁 서버 주소를 지정
+server = start_fake_gemini_server()
+os.environ["GEMINI_API_BASE_URL"] = server.base_url
+os.environ.setdefault("GEMINI_API_KEY", "fake-key")
+
+from services import llm_service  # noqa: E402
+
+
+async def run_checks() -> int:
+    await llm_service.init_http_client()
+    try:
+        # 1) 배치 임베딩 - 청크 순서 유지 확인
+        chunks = [f"청크 {idx}" for idx in range(250)]
+        vectors = await llm_service.embed_chunks(chunks)
+        print("EMBED_COUNT", len(vectors))
+        print("EMBED_ORDER_OK", vectors[7] == (await llm_service.embed_text(chunks[7])))
+
+        # 2) 요약 호출
+        result = await llm_service.summarize("스텁 서버 요약 테스트 원문")
+        print("SUMMARY_RESULT", result)
+
+        # 3) 스트리밍 요약 - 부분 텍스트를 이어 붙인 값이 최종 결과와 같아야 한다
+        llm_service.cache_service.summary_cache.clear()
+        deltas = []
+        streamed = await llm_service.summarize(
+            "스텁 서버 요약 테스트 원문",
+            on_delta=lambda field, text: deltas.append((field, text)),
+        )
+        streamed_summary = "".join(text for field, text in deltas if field == "summary")
+        print("STREAM_DELTAS", len(deltas))
+        print("STREAM_MATCH", streamed == result and streamed_summary == result["summary"])
+        if streamed != result or streamed_summary != result["summary"]:
+            return 1
+
+        # 4) 커넥션 재사용 - 요청 수보다 연결 수가 훨씬 적어야 한다
+        await asyncio.gather(*(llm_service.embed_text(f"재사용 {idx}") for idx in range(30)))
+        print("REQUESTS", server.request_count)
+        print("CONNECTIONS", server.connection_count)
+        if server.connection_count >= server.request_count:
+            return 1
+    finally:
+        await llm_service.close_http_client()
+        server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(asyncio.run(run_checks()))
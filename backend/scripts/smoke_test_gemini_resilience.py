@@ -0,0 +1,108 @@
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from fake_gemini_server import start_fake_gemini_server
+
+# [env] llm_service 임포트 전에 스텁 서버 주소와 빠른 재시도/서킷 설정을 지정
+server = start_fake_gemini_server()
+os.environ["GEMINI_API_BASE_URL"] = server.base_url
+os.environ.setdefault("GEMINI_API_KEY", "fake-key")
+os.environ["GEMINI_RETRY_MAX_ATTEMPTS"] = "4"
+os.environ["GEMINI_RETRY_BASE_DELAY"] = "0.01"
+os.environ["GEMINI_RETRY_MAX_DELAY"] = "2"
+os.environ["GEMINI_CIRCUIT_FAILURE_THRESHOLD"] = "3"
+os.environ["GEMINI_CIRCUIT_RESET_SECONDS"] = "0.5"
+
+from services import llm_service, rate_limit_service  # noqa: E402
+from services.llm_service import GeminiServiceError  # noqa: E402
+
+
+async def run_checks() -> int:
+    await llm_service.init_http_client()
+    failures = 0
+    try:
+        breaker = rate_limit_service.get_breaker(llm_service.GEMINI_MODEL_EMBEDDING)
+
+        # 1) 429 + Retry-After 후 재시도 성공 (대기 시간이 Retry-After 이상)
+        server.fail_next(429, count=2, retry_after=0.2)
+        before = server.request_count
+        started = time.perf_counter()
+        await llm_service.embed_text("재시도 테스트")
+        elapsed = time.perf_counter() - started
+        retry_ok = server.request_count - before == 3 and elapsed >= 0.4
+        print("RETRY_429_OK", retry_ok, f"attempts={server.request_count - before}", f"elapsed={elapsed:.2f}s")
+        failures += not retry_ok
+
+        # 2) 400 은 재시도하지 않음
+        server.fail_next(400)
+        before = server.request_count
+        try:
+            await llm_service.embed_text("잘못된 요청")
+        except GeminiServiceError:
+            pass
+        no_retry_ok = server.request_count - before == 1
+        print("NO_RETRY_400_OK", no_retry_ok)
+        failures += not no_retry_ok
+
+        # 3) 서킷 브레이커 - 연속 실패 후 서버 호출 없이 즉시 실패, 차단 시간 후 복구
+        server.fail_next(503, count=10)
+        try:
+            await llm_service.embed_text("장애 테스트")
+        except GeminiServiceError as exc:
+            print("OUTAGE_ERROR", exc.detail[:40])
+        before = server.request_count
+        try:
+            await llm_service.embed_text("즉시 실패")
+            fast_fail = False
+        except GeminiServiceError as exc:
+            fast_fail = exc.detail.startswith("CIRCUIT_OPEN") and server.request_count == before
+        print("CIRCUIT_OPEN_OK", fast_fail, breaker.stats())
+        failures += not fast_fail
+
+        server.clear_scripted_errors()
+        await asyncio.sleep(0.6)
+
+        # 시험 호출이 취소돼도(클라이언트 연결 끊김 등) 시험 호출 자리가 반환되어 다음 호출이 다시 시험
+        server.latency = 1.0
+        probe = asyncio.create_task(llm_service.embed_text("취소되는 시험 호출"))
+        await asyncio.sleep(0.2)
+        probe.cancel()
+        await asyncio.gather(probe, return_exceptions=True)
+        server.latency = 0.0
+        probe_released = not breaker.is_blocked()
+        print("CIRCUIT_PROBE_CANCEL_OK", probe_released, breaker.stats())
+        failures += not probe_released
+
+        await llm_service.embed_text("복구 테스트")
+        recovered = breaker.stats()["state"] == "closed"
+        print("CIRCUIT_RECOVERED_OK", recovered)
+        failures += not recovered
+
+        # 4) 스트리밍 요약 - 첫 조각 전 503 은 재시도
+        server.fail_next(503)
+        deltas = []
+        result = await llm_service.summarize("스트리밍 재시도", on_delta=lambda f, t: deltas.append(t))
+        print("STREAM_RETRY_OK", bool(deltas) and bool(result["summary"]))
+        failures += not (deltas and result["summary"])
+
+        # 5) 토큰 버킷 - 분당 600회(초당 10회) 한도에서 버킷을 비운 뒤 5회는 약 0.5초 대기
+        bucket = rate_limit_service.TokenBucket(600)
+        bucket.reserve(600)
+        wait = bucket.reserve(5)
+        bucket_ok = 0.4 <= wait <= 0.6
+        print("TOKEN_BUCKET_OK", bucket_ok, f"wait={wait:.2f}s")
+        failures += not bucket_ok
+
+        print("RATE_LIMIT_STATS", rate_limit_service.get_stats())
+    finally:
+        await llm_service.close_http_client()
+        server.shutdown()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(asyncio.run(run_checks()))
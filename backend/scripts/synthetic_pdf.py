@@ -0,0 +1,145 @@
+# [Script] 벤치마크용 합성 PDF 생성 - 텍스트 레이어 페이지 / 스캔(이미지) 페이지 / 혼합
+import argparse
+import io
+import random
+import zlib
+
+from PIL import Image, ImageDraw, ImageFont
+
+# [const] 페이지 크기(pt, US Letter)와 스캔 이미지 해상도(dpi)
+PAGE_WIDTH = 612
+PAGE_HEIGHT = 792
+SCAN_DPI = 100
+# [const] 페이지당 줄 수 / 줄당 단어 수 (텍스트 레이어 기준 약 3,200자)
+LINES_PER_PAGE = 45
+WORDS_PER_LINE = 10
+# [const] 본문 단어 목록 (OCR 인식이 쉬운 영문)
+WORDS = (
+    "model data system report result analysis method value process design table figure "
+    "network memory latency throughput request server client cache index query vector "
+    "summary document section chapter page budget revenue growth market customer policy "
+    "review quality metric baseline release update service pipeline worker queue batch"
+).split()
+# [const] 스캔 이미지 변형 수 - 글자 래스터화가 느려 문서마다 이 수만큼만 그리고 페이지에 돌려 씀
+SCAN_VARIANTS = 4
+# [const] 지원 문서 종류
+KINDS = ("text", "scanned", "mixed")
+
+
+# [function] 페이지 본문 줄 생성 (seed 별로 다른 내용)
+def _page_lines(rng: random.Random, page_number: int) -> list[str]:
+    lines = [f"Page {page_number} synthetic benchmark document"]
+    for _ in range(LINES_PER_PAGE - 1):
+        lines.append(" ".join(rng.choice(WORDS) for _ in range(WORDS_PER_LINE)))
+    return lines
+
+
+# [function] PDF 문자열 리터럴 이스케이프
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+# [function] 텍스트 레이어 페이지 콘텐츠 스트림
+def _text_content(lines: list[str]) -> bytes:
+    commands = ["BT", "/F1 10 Tf", "14 TL", f"40 {PAGE_HEIGHT - 50} Td"]
+    for line in lines:
+        commands.append(f"({_escape(line)}) Tj T*")
+    commands.append("ET")
+    return "\n".join(commands).encode("latin-1")
+
+
+# [function] 스캔 페이지 이미지(JPEG) - 같은 본문을 그림으로만 넣어 텍스트 레이어가 없음
+def _scanned_image(lines: list[str]) -> tuple[bytes, int, int]:
+    width = PAGE_WIDTH * SCAN_DPI // 72
+    height = PAGE_HEIGHT * SCAN_DPI // 72
+    image = Image.new("L", (width, height), 255)
+    draw = ImageDraw.Draw(image)
+    font = ImageFont.load_default()
+    line_height = (height - 80) // len(lines)
+    for idx, line in enumerate(lines):
+        draw.text((50, 40 + idx * line_height), line, fill=0, font=font)
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=60)
+    image.close()
+    return buffer.getvalue(), width, height
+
+
+# [function] 페이지 종류 결정 - mixed 는 3페이지마다 1페이지를 스캔 페이지로
+def page_is_scanned(kind: str, page_number: int) -> bool:
+    if kind == "scanned":
+        return True
+    if kind == "mixed":
+        return page_number % 3 == 0
+    return False
+
+
+# [function] 합성 PDF 바이트 생성
+def build_pdf(pages: int, kind: str = "text", seed: int = 0) -> bytes:
+    if kind not in KINDS:
+        raise ValueError(f"unknown kind: {kind}")
+    rng = random.Random(seed)
+
+    # [objects] 1: Catalog, 2: Pages, 3: Font, 이후 페이지마다 Page/Contents(/Image)
+    objects: list[bytes] = [b"", b"", b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+    scanned_images: list[tuple[bytes, int, int]] = []
+    for page_number in range(1, pages + 1):
+        lines = _page_lines(rng, page_number)
+        if page_is_scanned(kind, page_number):
+            if len(scanned_images) < SCAN_VARIANTS:
+                scanned_images.append(_scanned_image(lines))
+            jpeg, width, height = scanned_images[page_number % len(scanned_images)]
+            objects.append(
+                f"<< /Type /XObject /Subtype /Image /Width {width} /Height {height} "
+                f"/ColorSpace /DeviceGray /BitsPerComponent 8 /Filter /DCTDecode /Length {len(jpeg)} >>\nstream\n".encode()
+                + jpeg
+                + b"\nendstream"
+            )
+            image_id = len(objects)
+            content = f"q {PAGE_WIDTH} 0 0 {PAGE_HEIGHT} 0 0 cm /Im0 Do Q".encode()
+            resources = f"<< /XObject << /Im0 {image_id} 0 R >> >>"
+        else:
+            content = zlib.compress(_text_content(lines))
+            resources = "<< /Font << /F1 3 0 R >> >>"
+
+        filter_entry = "" if page_is_scanned(kind, page_number) else " /Filter /FlateDecode"
+        objects.append(
+            f"<< /Length {len(content)}{filter_entry} >>\nstream\n".encode() + content + b"\nendstream"
+        )
+        content_id = len(objects)
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+            f"/Resources {resources} /Contents {content_id} 0 R >>".encode()
+        )
+        page_ids.append(len(objects))
+
+    objects[0] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids)
+    objects[1] = f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>".encode()
+
+    # [write] 본문 + xref 테이블 + trailer
+    output = io.BytesIO()
+    output.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for object_id, body in enumerate(objects, start=1):
+        offsets.append(output.tell())
+        output.write(f"{object_id} 0 obj\n".encode() + body + b"\nendobj\n")
+    xref_offset = output.tell()
+    output.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode())
+    for offset in offsets:
+        output.write(f"{offset:010d} 00000 n \n".encode())
+    output.write(
+        f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n".encode()
+    )
+    return output.getvalue()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write a synthetic PDF for benchmarks")
+    parser.add_argument("output", help="저장할 PDF 경로")
+    parser.add_argument("--pages", type=int, default=10)
+    parser.add_argument("--kind", choices=KINDS, default="text")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    with open(args.output, "wb") as file:
+        file.write(build_pdf(args.pages, args.kind, args.seed))
@@ -0,0 +1,111 @@
+# [Server] 운영용 진입점 - uvicorn 워커 프로세스 여러 개로 실행 (워커끼리 캐시/속도 제한/작업 점유는 SQLite 공유 상태 파일로 공유)
+import argparse
+import inspect
+import logging
+import os
+import socket
+
+import uvicorn
+from uvicorn.supervisors import Multiprocess
+from settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+# [settings] 워커 프로세스 수(기본: CPU 코어 수), 바인드 주소/포트
+settings = get_settings()
+WEB_CONCURRENCY = settings.web_concurrency
+HOST = settings.host
+PORT = settings.port
+
+
+# [function] 명령행 인자 파싱
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run the API with multiple worker processes")
+    parser.add_argument("--workers", type=int, default=WEB_CONCURRENCY, help="워커 프로세스 수")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--log-level", default="info")
+    return parser.parse_args()
+
+
+# [function] 멀티 워커 메트릭 디렉터리 비우기 - 이전 실행의 워커별 메트릭 파일 삭제 (남아 있으면 지난 값이 합산됨)
+def reset_metrics_dir(path: str) -> None:
+    os.makedirs(path, exist_ok=True)
+    for name in os.listdir(path):
+        if name.endswith(".db"):
+            os.remove(os.path.join(path, name))
+
+
+# [function] 워커 기동 전 준비 - 공유 상태/메트릭 디렉터리/OCR 프로세스 수 기본값 지정, 테이블과 공유 상태 파일을 한 번만 생성
+def prepare(workers: int) -> None:
+    # [env] 워커가 2개 이상이면 공유 상태를 SQLite 파일로, 메트릭은 공유 상태 파일 옆 디렉터리에 워커별로 기록 (직접 지정한 값이 우선)
+    if workers > 1:
+        os.environ.setdefault("SHARED_STATE_BACKEND", "sqlite")
+        shared_state_dir = os.path.dirname(os.path.abspath(settings.shared_state_path))
+        os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", os.path.join(shared_state_dir, "prometheus_multiproc"))
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        reset_metrics_dir(os.environ["PROMETHEUS_MULTIPROC_DIR"])
+    # [env] OCR 프로세스 풀은 워커마다 생기므로 코어를 워커 수로 나눠 배정
+    os.environ.setdefault("OCR_WORKERS", str(max(1, (os.cpu_count() or 1) // workers)))
+    # [env] 테이블은 아래에서 한 번만 만들므로 앱 시작 시 생성은 끔 - 워커 1개면 main 이 이 프로세스의 설정 캐시를
+    # 그대로 쓰므로 캐시를 비우기 전에 지정해야 함
+    os.environ["AUTO_CREATE_TABLES"] = "false"
+    # [settings] 위에서 바꾼 환경변수를 이 프로세스의 설정에도 반영 (워커는 새로 읽음)
+    get_settings.cache_clear()
+
+    from database import get_engine
+    from models import summary as summary_models
+    from services import shared_state_service
+
+    if workers > 1 and not shared_state_service.USE_SHARED_STATE:
+        logger.warning("SHARED_STATE_BACKEND=%s: caches and rate limits are per worker", shared_state_service.SHARED_STATE_BACKEND)
+
+    # [schema] 워커가 동시에 create_all 하지 않도록 여기서 한 번만 실행
+    engine = get_engine()
+    summary_models.create_tables(engine)
+    engine.dispose()
+    shared_state_service.initialize()
+
+
+# [class] uvicorn 설정 - 워커에 넘기는 리슨 소켓을 proto=IPPROTO_TCP 로 다시 감쌈
+# uvicorn 은 proto 0 으로 소켓을 만들고 워커는 그 값으로 소켓을 복원하는데, asyncio 는 proto 가 TCP 일 때만
+# TCP_NODELAY 를 켜므로 그대로 두면 keep-alive 응답마다 지연 ACK(~40ms)만큼 늦어짐 (단일 프로세스 모드는 해당 없음)
+class TCPConfig(uvicorn.Config):
+    def bind_socket(self) -> socket.socket:
+        sock = super().bind_socket()
+        if sock.family not in (socket.AF_INET, socket.AF_INET6) or sock.proto == socket.IPPROTO_TCP:
+            return sock
+        tcp_sock = socket.socket(sock.family, sock.type, socket.IPPROTO_TCP, fileno=sock.detach())
+        tcp_sock.set_inheritable(True)
+        return tcp_sock
+
+
+# [function] 서버 실행 - 워커가 1개면 현재 프로세스에서, 여러 개면 uvicorn 멀티프로세스 감독자로 실행
+def run(host: str, port: int, workers: int, log_level: str) -> None:
+    if workers == 1:
+        uvicorn.run("main:app", host=host, port=port, log_level=log_level)
+        return
+
+    config = TCPConfig("main:app", host=host, port=port, workers=workers, log_level=log_level)
+    sock = config.bind_socket()
+    # [compat] 이전 uvicorn 의 Multiprocess 는 target 인자가 필요
+    if "target" in inspect.signature(Multiprocess).parameters:
+        supervisor = Multiprocess(config, target=uvicorn.Server(config=config).run, sockets=[sock])
+    else:
+        supervisor = Multiprocess(config, sockets=[sock])
+    try:
+        supervisor.run()
+    except KeyboardInterrupt:
+        pass
+
+
+def main() -> int:
+    args = parse_args()
+    logging.basicConfig(level=args.log_level.upper())
+    prepare(args.workers)
+    run(args.host, args.port, args.workers, args.log_level)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,207 @@
+# [Service] 청크 텍스트 BM25 역색인 - 질문 단어가 들어 있는 청크만 훑어 점수 계산 (임베딩 검색과 함께 하이브리드 검색에 사용)
+import logging
+import math
+import re
+import threading
+from array import array
+from bisect import bisect_left
+from collections import Counter
+import numpy as np
+from sqlalchemy import select
+from database import SessionLocal
+from models.summary import DocumentChunk
+from services import shared_state_service
+from settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+# [settings] BM25 파라미터(k1: 단어 빈도 포화, b: 청크 길이 보정), DB 적재 배치 크기
+settings = get_settings()
+BM25_K1 = settings.bm25_k1
+BM25_B = settings.bm25_b
+BM25_LOAD_BATCH = settings.bm25_load_batch
+
+# [const] 토큰 패턴 - 영문/숫자 단어, 그 외 문자(한글 등) 연속 구간
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+|[^\W_a-z0-9]+")
+
+
+# [function] 검색용 토큰 분리 - 영문/숫자는 단어 단위, 한글 등은 조사/어미가 붙어도 맞도록 2글자(바이그램) 단위
+def tokenize(text: str) -> list[str]:
+    tokens = []
+    for run in TOKEN_PATTERN.findall(text.lower()):
+        if run.isascii() or len(run) == 1:
+            tokens.append(run)
+        else:
+            tokens.extend(run[idx:idx + 2] for idx in range(len(run) - 1))
+    return tokens
+
+
+# [class] BM25 인메모리 역색인 - 단어별 (청크 위치, 빈도) 목록, 청크 위치는 문서별로 연속 구간
+class BM25Index:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._clear()
+
+    # [function] 인덱스 상태 초기화
+    def _clear(self) -> None:
+        self._loaded = False
+        # [sync] 마지막으로 반영한 공유 문서 알림 번호 (다른 워커 프로세스가 저장한 문서 반영용)
+        self._event_cursor = 0
+        # [postings] 단어 -> (청크 위치 배열, 빈도 배열)
+        self._postings: dict[str, tuple[array, array]] = {}
+        self._lengths = array("i")
+        self._doc_ids = array("q")
+        self._chunk_indexes = array("i")
+        self._ranges: dict[int, tuple[int, int]] = {}
+        self._total_length = 0
+
+    # [function] 문서 하나의 청크 텍스트 추가 (잠금 보유 상태에서 호출)
+    def _add_locked(self, document_id: int, chunk_indexes: list[int], texts: list[str]) -> None:
+        if document_id in self._ranges or not texts:
+            return
+        start = len(self._lengths)
+        for chunk_index, text in zip(chunk_indexes, texts):
+            position = len(self._lengths)
+            counts = Counter(tokenize(text or ""))
+            for term, frequency in counts.items():
+                posting = self._postings.get(term)
+                if posting is None:
+                    posting = self._postings[term] = (array("i"), array("i"))
+                posting[0].append(position)
+                posting[1].append(frequency)
+            length = sum(counts.values())
+            self._lengths.append(length)
+            self._doc_ids.append(document_id)
+            self._chunk_indexes.append(chunk_index)
+            self._total_length += length
+        self._ranges[document_id] = (start, len(self._lengths))
+
+    # [function] DB 에 저장된 청크 텍스트를 배치 단위로 적재 (document_ids 가 있으면 해당 문서만)
+    def _load_locked(self, document_ids: list[int] | None = None) -> None:
+        db = SessionLocal()
+        try:
+            stmt = (
+                select(
+                    DocumentChunk.document_id,
+                    DocumentChunk.chunk_index,
+                    DocumentChunk.chunk_text,
+                )
+                .order_by(DocumentChunk.document_id, DocumentChunk.chunk_index)
+                .execution_options(yield_per=BM25_LOAD_BATCH)
+            )
+            if document_ids is not None:
+                stmt = stmt.where(DocumentChunk.document_id.in_(document_ids))
+            current_document = None
+            chunk_indexes: list[int] = []
+            texts: list[str] = []
+            for document_id, chunk_index, chunk_text in db.execute(stmt):
+                if document_id != current_document and texts:
+                    self._add_locked(current_document, chunk_indexes, texts)
+                    chunk_indexes, texts = [], []
+                current_document = document_id
+                chunk_indexes.append(chunk_index)
+                texts.append(chunk_text)
+            if texts:
+                self._add_locked(current_document, chunk_indexes, texts)
+        finally:
+            db.close()
+        self._loaded = True
+
+    # [function] 최초 검색 전에 인덱스 적재, 이후에는 다른 워커가 저장한 문서만 이어서 적재
+    def ensure_loaded(self) -> None:
+        with self._lock:
+            if not self._loaded:
+                self._event_cursor = shared_state_service.latest_document_event()
+                self._load_locked()
+                return
+            document_ids, self._event_cursor = shared_state_service.documents_since(self._event_cursor)
+            if document_ids is None:
+                cursor = self._event_cursor
+                self._clear()
+                self._event_cursor = cursor
+                self._load_locked()
+            elif document_ids:
+                self._load_locked(document_ids)
+
+    # [function] 새로 저장된 문서의 청크 텍스트 추가 (아직 적재 전이면 적재 시 DB 에서 읽음)
+    def add_document(self, document_id: int, chunk_indexes: list[int], texts: list[str]) -> None:
+        with self._lock:
+            if not self._loaded:
+                return
+            self._add_locked(document_id, chunk_indexes, texts)
+
+    # [function] 인덱스 비우기 (다음 검색 시 DB 에서 다시 적재)
+    def reset(self) -> None:
+        with self._lock:
+            self._clear()
+
+    # [function] 색인된 청크 수 (문서가 추가될 때만 바뀌므로 전체 문서 대상 답변 캐시 키의 버전으로 사용)
+    def size(self) -> int:
+        self.ensure_loaded()
+        with self._lock:
+            return len(self._lengths)
+
+    # [function] 질문 단어가 있는 청크의 BM25 점수 계산 (잠금 보유 상태에서 호출) - (청크 위치, 점수) 배열
+    def _score_locked(self, query: str, document_id: int | None) -> tuple[np.ndarray, np.ndarray]:
+        size = len(self._lengths)
+        if size == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        start, end = (0, size) if document_id is None else self._ranges.get(document_id, (0, 0))
+        if start == end:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        average_length = self._total_length / size or 1.0
+        lengths = np.array(self._lengths[start:end], dtype=np.float32)
+        length_norm = BM25_K1 * (1.0 - BM25_B + BM25_B * lengths / average_length)
+        scores = np.zeros(end - start, dtype=np.float32)
+        for term, query_frequency in Counter(tokenize(query)).items():
+            posting = self._postings.get(term)
+            if posting is None:
+                continue
+            # [range] 문서 하나만 보면 그 문서의 청크 위치 구간만 복사 (위치는 오름차순)
+            lo, hi = 0, len(posting[0])
+            if document_id is not None:
+                lo, hi = bisect_left(posting[0], start), bisect_left(posting[0], end)
+                if lo == hi:
+                    continue
+            positions = np.array(posting[0][lo:hi], dtype=np.int64)
+            frequencies = np.array(posting[1][lo:hi], dtype=np.float32)
+            document_frequency = len(posting[0])
+            idf = math.log(1.0 + (size - document_frequency + 0.5) / (document_frequency + 0.5))
+            local = positions - start
+            scores[local] += query_frequency * idf * frequencies * (BM25_K1 + 1.0) / (frequencies + length_norm[local])
+        matched = np.nonzero(scores)[0]
+        return matched + start, scores[matched]
+
+    # [function] BM25 top-k 검색 - (document_id, chunk_index, score) 목록, document_id 가 있으면 그 문서 안에서만
+    # extra_keys 로 준 (document_id, chunk_index) 는 top-k 밖이어도 점수를 함께 반환 (점수 0 이면 제외)
+    def search(
+        self,
+        query: str,
+        top_k: int,
+        document_id: int | None = None,
+        extra_keys: set[tuple[int, int]] | None = None,
+    ) -> list[tuple[int, int, float]]:
+        self.ensure_loaded()
+        with self._lock:
+            positions, scores = self._score_locked(query, document_id)
+            if len(positions) == 0 or top_k <= 0:
+                return []
+            k = min(top_k, len(positions))
+            order = np.argpartition(-scores, k - 1)[:k]
+            order = order[np.argsort(-scores[order])]
+            selected = set(order.tolist())
+            if extra_keys:
+                for idx, position in enumerate(positions.tolist()):
+                    key = (self._doc_ids[position], self._chunk_indexes[position])
+                    if key in extra_keys:
+                        selected.add(idx)
+                order = sorted(selected, key=lambda idx: -scores[idx])
+            return [
+                (int(self._doc_ids[positions[idx]]), int(self._chunk_indexes[positions[idx]]), float(scores[idx]))
+                for idx in order
+            ]
+
+
+# [instance] 앱 전체에서 공유하는 BM25 인덱스
+bm25_index = BM25Index()
@@ -0,0 +1,323 @@
+# [Service] 콘텐츠 해시 기반 캐시 - 텍스트 추출/임베딩/요약 결과 재사용
+import asyncio
+import hashlib
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+from services import shared_state_service
+from settings import get_settings
+
+# [settings] 캐시 설정 (CACHE_TTL_SECONDS=0 이면 만료 없음, LRU 방식으로만 제거)
+settings = get_settings()
+CACHE_ENABLED = settings.cache_enabled
+CACHE_MAX_ENTRIES = settings.cache_max_entries
+CACHE_TTL_SECONDS = settings.cache_ttl_seconds
+EMBED_CACHE_MAX_ENTRIES = settings.embed_cache_max_entries
+ANSWER_CACHE_MAX_ENTRIES = settings.answer_cache_max_entries
+# [settings] 공유 캐시 용량 초과 항목 정리 주기 (프로세스별 저장 횟수)
+SHARED_CACHE_EVICT_EVERY = settings.shared_cache_evict_every
+# [const] 공유 캐시 사용 시각 갱신 최소 간격(초) - 적중마다 쓰기 잠금을 잡지 않도록
+SHARED_CACHE_TOUCH_INTERVAL = 1.0
+# [const] 공유 캐시 여러 키 조회 시 한 번에 묶는 키 수 (SQLite 바인딩 변수 수 제한보다 작게)
+SHARED_CACHE_QUERY_BATCH = 500
+
+
+# [function] 바이트(메모리 맵 등 버퍼 포함)/문자열의 SHA-256 해시 반환
+def sha256_hex(data: bytes | memoryview | str) -> str:
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+# [class] 스레드 안전 LRU 캐시 - 최대 항목 수/TTL 기반 제거, 적중/실패 카운터 제공
+class LRUCache:
+    def __init__(self, name: str, max_entries: int, ttl_seconds: int = 0):
+        self.name = name
+        self.max_entries = max(0, max_entries)
+        self.ttl_seconds = max(0, ttl_seconds)
+        self._items: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # [function] 키 조회 - 없거나 만료되면 None
+    def get(self, key: str) -> Any | None:
+        if not CACHE_ENABLED or self.max_entries == 0:
+            return None
+
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+
+            stored_at, value = item
+            if self.ttl_seconds and time.monotonic() - stored_at > self.ttl_seconds:
+                del self._items[key]
+                self.evictions += 1
+                self.misses += 1
+                return None
+
+            self._items.move_to_end(key)
+            self.hits += 1
+            return value
+
+    # [function] 키 저장 - 용량 초과 시 가장 오래 사용하지 않은 항목 제거
+    def set(self, key: str, value: Any) -> None:
+        if not CACHE_ENABLED or self.max_entries == 0:
+            return
+
+        with self._lock:
+            self._items[key] = (time.monotonic(), value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+                self.evictions += 1
+
+    # [function] 여러 키 조회 - 키 순서대로 값 목록 (없거나 만료되면 None)
+    def get_many(self, keys: list[str]) -> list[Any | None]:
+        return [self.get(key) for key in keys]
+
+    # [function] 여러 키 저장
+    def set_many(self, items: list[tuple[str, Any]]) -> None:
+        for key, value in items:
+            self.set(key, value)
+
+    # [function] 캐시 비우기 및 카운터 초기화
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    # [function] 현재 상태 반환
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "name": self.name,
+                "size": len(self._items),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+# [class] 프로세스 간 공유 LRU 캐시 - SHARED_STATE_PATH SQLite 파일에 pickle 로 저장 (LRUCache 와 같은 인터페이스, 카운터는 프로세스별)
+class SharedLRUCache:
+    def __init__(self, name: str, max_entries: int, ttl_seconds: int = 0):
+        self.name = name
+        self.max_entries = max(0, max_entries)
+        self.ttl_seconds = max(0, ttl_seconds)
+        self._lock = threading.Lock()
+        self._sets = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # [function] 카운터 증가
+    def _count(self, field: str, amount: int = 1) -> None:
+        with self._lock:
+            setattr(self, field, getattr(self, field) + amount)
+
+    # [function] 키 조회 - 없거나 만료되면 None (사용 시각은 SHARED_CACHE_TOUCH_INTERVAL 마다 갱신)
+    def get(self, key: str) -> Any | None:
+        if not CACHE_ENABLED or self.max_entries == 0:
+            return None
+
+        row = shared_state_service.execute(
+            "SELECT stored_at, used_at, value FROM cache_entries WHERE cache = ? AND key = ?",
+            (self.name, key),
+        ).fetchone()
+        if row is None:
+            self._count("misses")
+            return None
+
+        stored_at, used_at, value = row
+        now = time.time()
+        if self.ttl_seconds and now - stored_at > self.ttl_seconds:
+            shared_state_service.execute(
+                "DELETE FROM cache_entries WHERE cache = ? AND key = ?",
+                (self.name, key),
+            )
+            self._count("evictions")
+            self._count("misses")
+            return None
+
+        if now - used_at > SHARED_CACHE_TOUCH_INTERVAL:
+            shared_state_service.execute(
+                "UPDATE cache_entries SET used_at = ? WHERE cache = ? AND key = ?",
+                (now, self.name, key),
+            )
+        self._count("hits")
+        return pickle.loads(value)
+
+    # [function] 키 저장 - 저장 SHARED_CACHE_EVICT_EVERY 회마다 가장 오래 사용하지 않은 항목부터 용량 초과분 제거
+    def set(self, key: str, value: Any) -> None:
+        if not CACHE_ENABLED or self.max_entries == 0:
+            return
+
+        now = time.time()
+        shared_state_service.execute(
+            "INSERT OR REPLACE INTO cache_entries (cache, key, stored_at, used_at, value) VALUES (?, ?, ?, ?, ?)",
+            (self.name, key, now, now, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)),
+        )
+        with self._lock:
+            self._sets += 1
+            evict = self._sets % SHARED_CACHE_EVICT_EVERY == 0
+        if evict:
+            self._evict()
+
+    # [function] 여러 키 조회 - 키 순서대로 값 목록, 조회는 SHARED_CACHE_QUERY_BATCH 개씩 묶고 만료 삭제/사용 시각 갱신은 트랜잭션 1회
+    def get_many(self, keys: list[str]) -> list[Any | None]:
+        if not CACHE_ENABLED or self.max_entries == 0 or not keys:
+            return [None] * len(keys)
+
+        rows = {}
+        conn = shared_state_service.connection()
+        unique_keys = list(dict.fromkeys(keys))
+        for start in range(0, len(unique_keys), SHARED_CACHE_QUERY_BATCH):
+            batch = unique_keys[start:start + SHARED_CACHE_QUERY_BATCH]
+            placeholders = ", ".join("?" * len(batch))
+            for key, stored_at, used_at, value in conn.execute(
+                f"SELECT key, stored_at, used_at, value FROM cache_entries WHERE cache = ? AND key IN ({placeholders})",
+                (self.name, *batch),
+            ):
+                rows[key] = (stored_at, used_at, value)
+
+        now = time.time()
+        values, expired, touched = {}, [], []
+        for key, (stored_at, used_at, value) in rows.items():
+            if self.ttl_seconds and now - stored_at > self.ttl_seconds:
+                expired.append((self.name, key))
+                continue
+            if now - used_at > SHARED_CACHE_TOUCH_INTERVAL:
+                touched.append((now, self.name, key))
+            values[key] = pickle.loads(value)
+        if expired or touched:
+            with shared_state_service.transaction() as conn:
+                conn.executemany("DELETE FROM cache_entries WHERE cache = ? AND key = ?", expired)
+                conn.executemany("UPDATE cache_entries SET used_at = ? WHERE cache = ? AND key = ?", touched)
+
+        results = [values.get(key) for key in keys]
+        hits = sum(value is not None for value in results)
+        self._count("hits", hits)
+        self._count("misses", len(keys) - hits)
+        self._count("evictions", len(expired))
+        return results
+
+    # [function] 여러 키 저장 - 트랜잭션 1회, 용량 초과분 정리는 set 과 같은 주기
+    def set_many(self, items: list[tuple[str, Any]]) -> None:
+        if not CACHE_ENABLED or self.max_entries == 0 or not items:
+            return
+
+        now = time.time()
+        rows = [
+            (self.name, key, now, now, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+            for key, value in items
+        ]
+        with shared_state_service.transaction() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO cache_entries (cache, key, stored_at, used_at, value) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+        with self._lock:
+            evict = self._sets // SHARED_CACHE_EVICT_EVERY != (self._sets + len(rows)) // SHARED_CACHE_EVICT_EVERY
+            self._sets += len(rows)
+        if evict:
+            self._evict()
+
+    # [function] 가장 오래 사용하지 않은 항목부터 용량 초과분 제거
+    def _evict(self) -> None:
+        removed = shared_state_service.execute(
+            "DELETE FROM cache_entries WHERE cache = ? AND key IN ("
+            " SELECT key FROM cache_entries WHERE cache = ? ORDER BY used_at DESC LIMIT -1 OFFSET ?)",
+            (self.name, self.name, self.max_entries),
+        ).rowcount
+        self._count("evictions", removed)
+
+    # [function] 캐시 비우기 및 카운터 초기화 (다른 프로세스의 항목도 함께 삭제)
+    def clear(self) -> None:
+        shared_state_service.execute("DELETE FROM cache_entries WHERE cache = ?", (self.name,))
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    # [function] 현재 상태 반환 (크기는 모든 프로세스 합계)
+    def stats(self) -> dict:
+        size = shared_state_service.execute(
+            "SELECT COUNT(*) FROM cache_entries WHERE cache = ?",
+            (self.name,),
+        ).fetchone()[0]
+        with self._lock:
+            return {
+                "name": self.name,
+                "size": size,
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+# [function] 캐시 생성 - SHARED_STATE_BACKEND=sqlite 면 프로세스 간 공유 캐시
+def _create_cache(name: str, max_entries: int, ttl_seconds: int):
+    if shared_state_service.USE_SHARED_STATE:
+        return SharedLRUCache(name, max_entries, ttl_seconds)
+    return LRUCache(name, max_entries, ttl_seconds)
+
+
+# [instance] 용도별 캐시
+extraction_cache = _create_cache("extraction", CACHE_MAX_ENTRIES, CACHE_TTL_SECONDS)
+document_embedding_cache = _create_cache("document_embedding", CACHE_MAX_ENTRIES, CACHE_TTL_SECONDS)
+chunk_embedding_cache = _create_cache("chunk_embedding", EMBED_CACHE_MAX_ENTRIES, CACHE_TTL_SECONDS)
+summary_cache = _create_cache("summary", CACHE_MAX_ENTRIES, CACHE_TTL_SECONDS)
+answer_cache = _create_cache("answer", ANSWER_CACHE_MAX_ENTRIES, CACHE_TTL_SECONDS)
+
+ALL_CACHES = [
+    extraction_cache,
+    document_embedding_cache,
+    chunk_embedding_cache,
+    summary_cache,
+    answer_cache,
+]
+
+
+# [function] 비동기 코드용 조회 - 공유 캐시는 SQLite 잠금 대기가 이벤트 루프를 막지 않도록 스레드에서 실행
+async def get_async(cache, key: str) -> Any | None:
+    if isinstance(cache, SharedLRUCache):
+        return await asyncio.to_thread(cache.get, key)
+    return cache.get(key)
+
+
+# [function] 비동기 코드용 저장
+async def set_async(cache, key: str, value: Any) -> None:
+    if isinstance(cache, SharedLRUCache):
+        await asyncio.to_thread(cache.set, key, value)
+    else:
+        cache.set(key, value)
+
+
+# [function] 비동기 코드용 여러 키 조회
+async def get_many_async(cache, keys: list[str]) -> list[Any | None]:
+    if isinstance(cache, SharedLRUCache):
+        return await asyncio.to_thread(cache.get_many, keys)
+    return cache.get_many(keys)
+
+
+# [function] 비동기 코드용 여러 키 저장
+async def set_many_async(cache, items: list[tuple[str, Any]]) -> None:
+    if isinstance(cache, SharedLRUCache):
+        await asyncio.to_thread(cache.set_many, items)
+    else:
+        cache.set_many(items)
+
+
+# [function] 전체 캐시 상태 조회
+def get_cache_stats() -> list[dict]:
+    return [cache.stats() for cache in ALL_CACHES]
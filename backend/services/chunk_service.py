@@ -0,0 +1,120 @@
+# [Service] 청크/임베딩 대량 저장 - ORM 단건 add 대신 executemany / PostgreSQL COPY 사용
+import csv
+import io
+from datetime import datetime
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from models.summary import DocumentChunk
+from services import vector_service
+from settings import get_settings
+
+# [settings] 한 번에 실행할 INSERT 행 수, PostgreSQL 에서 COPY 사용 여부
+settings = get_settings()
+CHUNK_INSERT_BATCH_SIZE = settings.chunk_insert_batch_size
+CHUNK_INSERT_USE_COPY = settings.chunk_insert_use_copy
+# [settings] 청크와 함께 저장할 임베딩 모델 이름
+GEMINI_MODEL_EMBEDDING = settings.gemini_model_embedding
+
+# [const] COPY 대상 컬럼 순서
+COPY_COLUMNS = (
+    "document_id",
+    "chunk_index",
+    "chunk_text",
+    "page_start",
+    "page_end",
+    "embedding",
+    "embedding_model",
+    "created_at",
+)
+
+
+# [function] 청크/임베딩을 INSERT 용 행 목록으로 변환
+def build_chunk_rows(
+    document_id: int,
+    chunks: list[dict],
+    vectors: list[list[float]],
+) -> list[dict]:
+    created_at = datetime.utcnow()
+    return [
+        {
+            "document_id": document_id,
+            "chunk_index": idx,
+            "chunk_text": chunk["text"],
+            "page_start": chunk.get("page_start"),
+            "page_end": chunk.get("page_end"),
+            "embedding": vector_service.encode_embedding(embedding),
+            "embedding_model": GEMINI_MODEL_EMBEDDING,
+            "created_at": created_at,
+        }
+        for idx, (chunk, embedding) in enumerate(zip(chunks, vectors))
+    ]
+
+
+# [function] COPY CSV 한 칸 값으로 변환 (None 은 빈 칸 = NULL)
+def _copy_value(value):
+    if value is None:
+        return None
+    if isinstance(value, (bytes, bytearray)):
+        return "\\x" + bytes(value).hex()
+    if isinstance(value, list):
+        return "[" + ",".join(repr(float(item)) for item in value) + "]"
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+# [function] PostgreSQL COPY FROM STDIN 으로 저장 - psycopg(3) / psycopg2 드라이버 지원
+def _copy_chunk_rows(db: Session, rows: list[dict]) -> bool:
+    dbapi_connection = db.connection().connection.dbapi_connection
+    column_list = ", ".join(COPY_COLUMNS)
+    table = DocumentChunk.__tablename__
+
+    with dbapi_connection.cursor() as cursor:
+        if hasattr(cursor, "copy"):
+            with cursor.copy(f"COPY {table} ({column_list}) FROM STDIN") as copy:
+                for row in rows:
+                    # [pgvector] 벡터는 '[...]' 텍스트로, 나머지는 드라이버 기본 변환 사용
+                    copy.write_row(
+                        [
+                            _copy_value(value) if isinstance(value, list) else value
+                            for value in (row[column] for column in COPY_COLUMNS)
+                        ]
+                    )
+            return True
+
+        if hasattr(cursor, "copy_expert"):
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            for row in rows:
+                writer.writerow([_copy_value(row[column]) for column in COPY_COLUMNS])
+            buffer.seek(0)
+            cursor.copy_expert(
+                f"COPY {table} ({column_list}) FROM STDIN WITH (FORMAT csv)",
+                buffer,
+            )
+            return True
+
+    return False
+
+
+# [function] 청크 행 대량 저장 - PostgreSQL 은 COPY, 그 외에는 배치 executemany (호출 측 트랜잭션 사용)
+def insert_chunk_rows(db: Session, rows: list[dict]) -> None:
+    if not rows:
+        return
+
+    if CHUNK_INSERT_USE_COPY and db.get_bind().dialect.name == "postgresql":
+        if _copy_chunk_rows(db, rows):
+            return
+
+    for start in range(0, len(rows), CHUNK_INSERT_BATCH_SIZE):
+        db.execute(insert(DocumentChunk), rows[start:start + CHUNK_INSERT_BATCH_SIZE])
+
+
+# [function] 문서의 청크/임베딩 대량 저장
+def insert_chunks(
+    db: Session,
+    document_id: int,
+    chunks: list[dict],
+    vectors: list[list[float]],
+) -> None:
+    insert_chunk_rows(db, build_chunk_rows(document_id, chunks, vectors))
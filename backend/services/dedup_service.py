@@ -0,0 +1,237 @@
+# [Service] 유사 중복 문서 탐지 - 원문 MinHash 서명 + LSH 인덱스, 이전 문서의 청크 임베딩 재사용
+import hashlib
+import logging
+import threading
+import numpy as np
+from sqlalchemy import select
+from database import SessionLocal
+from models.summary import DocumentChunk, DocumentSignature
+from services import shared_state_service, vector_service
+from settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+# [settings] 중복 탐지 설정 - 임계값은 추정 자카드 유사도(0~1), 서명 길이 = 밴드 수 x 밴드당 행 수
+settings = get_settings()
+DEDUP_ENABLED = settings.dedup_enabled
+DEDUP_THRESHOLD = settings.dedup_threshold
+DEDUP_NUM_PERM = settings.dedup_num_perm
+DEDUP_LSH_BANDS = settings.dedup_lsh_bands
+DEDUP_SHINGLE_SIZE = settings.dedup_shingle_size
+DEDUP_MAX_CANDIDATES = settings.dedup_max_candidates
+DEDUP_LOAD_BATCH = settings.dedup_load_batch
+# [settings] 재사용할 청크 임베딩의 모델 (다른 모델/차원의 벡터가 섞이지 않도록 같은 모델만 사용)
+GEMINI_MODEL_EMBEDDING = settings.gemini_model_embedding
+
+# [const] MinHash 해시 함수 계수 - 서명이 DB 에 저장되므로 시드를 고정해 재시작 후에도 같은 값 생성
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_HASH_SEED = 1
+# [const] 한 번에 처리할 shingle 수 (계수 x shingle 행렬 메모리 상한)
+_SHINGLE_BLOCK = 4096
+
+if DEDUP_NUM_PERM % DEDUP_LSH_BANDS != 0:
+    raise ValueError("DEDUP_NUM_PERM must be divisible by DEDUP_LSH_BANDS")
+DEDUP_LSH_ROWS = DEDUP_NUM_PERM // DEDUP_LSH_BANDS
+
+_rng = np.random.RandomState(_HASH_SEED)
+_PERM_A = _rng.randint(1, 1 << 61, size=DEDUP_NUM_PERM, dtype=np.uint64)[:, None]
+_PERM_B = _rng.randint(0, 1 << 61, size=DEDUP_NUM_PERM, dtype=np.uint64)[:, None]
+
+
+# [function] 단어 n-gram shingle 의 32비트 해시 (중복 제거)
+def _shingle_hashes(text: str) -> np.ndarray:
+    words = text.lower().split()
+    if not words:
+        return np.empty(0, dtype=np.uint64)
+    size = min(DEDUP_SHINGLE_SIZE, len(words))
+    hashes = {
+        int.from_bytes(
+            hashlib.blake2b(" ".join(words[idx:idx + size]).encode("utf-8"), digest_size=4).digest(),
+            "little",
+        )
+        for idx in range(len(words) - size + 1)
+    }
+    return np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+
+
+# [function] 원문 MinHash 서명 계산 (빈 텍스트면 None)
+def compute_signature(text: str) -> np.ndarray | None:
+    hashes = _shingle_hashes(text)
+    if len(hashes) == 0:
+        return None
+    signature = np.full(DEDUP_NUM_PERM, _MAX_HASH, dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        for start in range(0, len(hashes), _SHINGLE_BLOCK):
+            block = hashes[start:start + _SHINGLE_BLOCK][None, :]
+            permuted = np.bitwise_and((_PERM_A * block + _PERM_B) % _MERSENNE_PRIME, _MAX_HASH)
+            np.minimum(signature, permuted.min(axis=1), out=signature)
+    return signature.astype(np.uint32)
+
+
+# [function] 서명을 DB 저장 형식(uint32 바이너리)으로 변환
+def encode_signature(signature: np.ndarray) -> bytes:
+    return np.asarray(signature, dtype=np.uint32).tobytes()
+
+
+# [function] DB 저장 형식을 서명으로 복원
+def decode_signature(raw) -> np.ndarray:
+    return np.frombuffer(bytes(raw), dtype=np.uint32)
+
+
+# [function] 두 서명의 추정 자카드 유사도
+def estimate_similarity(left: np.ndarray, right: np.ndarray) -> float:
+    return float(np.count_nonzero(left == right)) / len(left)
+
+
+# [class] MinHash LSH 인메모리 인덱스 - 밴드별 버킷으로 후보를 찾고 서명 비교로 유사도 추정
+class MinHashIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._clear()
+
+    # [function] 인덱스 상태 초기화
+    def _clear(self) -> None:
+        self._loaded = False
+        # [sync] 마지막으로 반영한 공유 문서 알림 번호 (다른 워커 프로세스가 저장한 문서 반영용)
+        self._event_cursor = 0
+        self._signatures: dict[int, np.ndarray] = {}
+        self._buckets: list[dict[bytes, list[int]]] = [{} for _ in range(DEDUP_LSH_BANDS)]
+
+    # [function] 서명을 밴드별 버킷 키로 분할
+    def _band_keys(self, signature: np.ndarray) -> list[bytes]:
+        return [
+            signature[band * DEDUP_LSH_ROWS:(band + 1) * DEDUP_LSH_ROWS].tobytes()
+            for band in range(DEDUP_LSH_BANDS)
+        ]
+
+    # [function] 문서 서명 추가 (잠금 보유 상태에서 호출)
+    def _add_locked(self, document_id: int, signature: np.ndarray) -> None:
+        if document_id in self._signatures:
+            return
+        if len(signature) != DEDUP_NUM_PERM:
+            logger.warning("Skip signature with length=%s for document_id=%s", len(signature), document_id)
+            return
+        self._signatures[document_id] = signature
+        for buckets, key in zip(self._buckets, self._band_keys(signature)):
+            buckets.setdefault(key, []).append(document_id)
+
+    # [function] DB 에 저장된 서명을 배치 단위로 적재 (document_ids 가 있으면 해당 문서만)
+    def _load_locked(self, document_ids: list[int] | None = None) -> None:
+        db = SessionLocal()
+        try:
+            stmt = select(DocumentSignature.document_id, DocumentSignature.minhash).execution_options(
+                yield_per=DEDUP_LOAD_BATCH
+            )
+            if document_ids is not None:
+                stmt = stmt.where(DocumentSignature.document_id.in_(document_ids))
+            for document_id, raw in db.execute(stmt):
+                self._add_locked(document_id, decode_signature(raw))
+        finally:
+            db.close()
+        self._loaded = True
+
+    # [function] 최초 조회 전에 인덱스 적재, 이후에는 다른 워커가 저장한 문서만 이어서 적재
+    def ensure_loaded(self) -> None:
+        with self._lock:
+            if not self._loaded:
+                self._event_cursor = shared_state_service.latest_document_event()
+                self._load_locked()
+                return
+            document_ids, self._event_cursor = shared_state_service.documents_since(self._event_cursor)
+            if document_ids is None:
+                cursor = self._event_cursor
+                self._clear()
+                self._event_cursor = cursor
+                self._load_locked()
+            elif document_ids:
+                self._load_locked(document_ids)
+
+    # [function] 새로 저장된 문서의 서명 추가 (아직 적재 전이면 적재 시 DB 에서 읽음)
+    def add_document(self, document_id: int, signature: np.ndarray | None) -> None:
+        with self._lock:
+            if not self._loaded or signature is None:
+                return
+            self._add_locked(document_id, signature)
+
+    # [function] 인덱스 비우기 (다음 조회 시 DB 에서 다시 적재)
+    def reset(self) -> None:
+        with self._lock:
+            self._clear()
+
+    # [function] 유사 문서 조회 - 임계값 이상인 (document_id, similarity) 목록 (유사도 내림차순)
+    def query(self, signature: np.ndarray, threshold: float, limit: int) -> list[tuple[int, float]]:
+        self.ensure_loaded()
+        with self._lock:
+            candidates: set[int] = set()
+            for buckets, key in zip(self._buckets, self._band_keys(signature)):
+                candidates.update(buckets.get(key, ()))
+            matches = [
+                (document_id, estimate_similarity(signature, self._signatures[document_id]))
+                for document_id in candidates
+            ]
+        matches = [match for match in matches if match[1] >= threshold]
+        matches.sort(key=lambda match: (-match[1], -match[0]))
+        return matches[:limit]
+
+
+# [instance] 앱 전체에서 공유하는 서명 인덱스
+signature_index = MinHashIndex()
+
+
+# [function] 청크 텍스트 매칭 키
+def _chunk_key(text: str) -> bytes:
+    return hashlib.sha256(text.encode("utf-8")).digest()
+
+
+# [function] 유사 문서들의 청크 임베딩을 텍스트 해시 기준으로 조회 (현재 임베딩 모델로 만든 청크만, 앞선 문서 우선)
+def _load_chunk_embeddings(document_ids: list[int]) -> dict[bytes, list[float]]:
+    db = SessionLocal()
+    try:
+        embeddings: dict[bytes, list[float]] = {}
+        for document_id in document_ids:
+            rows = db.execute(
+                select(DocumentChunk.chunk_text, DocumentChunk.embedding).where(
+                    DocumentChunk.document_id == document_id,
+                    DocumentChunk.embedding_model == GEMINI_MODEL_EMBEDDING,
+                )
+            )
+            for chunk_text, raw in rows:
+                embeddings.setdefault(_chunk_key(chunk_text), vector_service.decode_embedding(raw).tolist())
+        return embeddings
+    finally:
+        db.close()
+
+
+# [function] 유사 중복 문서 탐지 및 재사용 가능한 청크 임베딩 조회 (블로킹)
+def find_reusable_embeddings(text: str, chunk_texts: list[str]) -> dict:
+    result = {"signature": None, "duplicate_of": None, "similarity": None, "vectors": {}}
+    if not DEDUP_ENABLED:
+        return result
+    signature = compute_signature(text)
+    result["signature"] = signature
+    if signature is None:
+        return result
+
+    matches = signature_index.query(signature, DEDUP_THRESHOLD, DEDUP_MAX_CANDIDATES)
+    if not matches:
+        return result
+    result["duplicate_of"], result["similarity"] = matches[0][0], round(matches[0][1], 4)
+
+    # [reuse] 텍스트가 같은 청크만 이전 임베딩 사용 (바뀐 페이지의 청크는 다시 임베딩)
+    embeddings = _load_chunk_embeddings([document_id for document_id, _ in matches])
+    for idx, chunk_text in enumerate(chunk_texts):
+        vector = embeddings.get(_chunk_key(chunk_text))
+        if vector is not None:
+            result["vectors"][idx] = vector
+
+    # [validate] 재사용 벡터의 차원이 모두 같아야 함 - 섞여 있으면 재사용하지 않고 모두 새로 임베딩
+    dims = {len(vector) for vector in result["vectors"].values()}
+    if len(dims) > 1:
+        logger.warning(
+            "Skip embedding reuse from document_ids=%s: mixed dims %s",
+            [document_id for document_id, _ in matches],
+            sorted(dims),
+        )
+        result["vectors"] = {}
+    return result
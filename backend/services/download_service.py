@@ -0,0 +1,244 @@
+# [Service] 요약 다운로드/내보내기 - 조건부 요청(ETag/Last-Modified), 바이트 범위, gzip/brotli 스트리밍 압축, ZIP/NDJSON 일괄 내보내기
+import json
+import zipfile
+import zlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Iterator
+from settings import get_settings
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# [settings] 압축 기준 크기/레벨, 스트리밍 조각 크기
+settings = get_settings()
+DOWNLOAD_COMPRESS_MIN_BYTES = settings.download_compress_min_bytes
+DOWNLOAD_GZIP_LEVEL = settings.download_gzip_level
+DOWNLOAD_BROTLI_QUALITY = settings.download_brotli_quality
+DOWNLOAD_CHUNK_BYTES = settings.download_chunk_bytes
+
+# [const] 지원 압축 방식 (서버 선호 순서, brotli 는 패키지가 있을 때만)
+SUPPORTED_ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+# [const] ZIP 항목 시각 하한 (ZIP 형식은 1980년 이전 시각을 표현하지 못함)
+_ZIP_MIN_DATE = (1980, 1, 1, 0, 0, 0)
+
+
+# [function] 요약 TXT 파일 이름
+def summary_filename(document_id: int) -> str:
+    return f"summary_{document_id}.txt"
+
+
+# [function] 요약 TXT 본문 (단건 다운로드/ZIP 항목 공통)
+def format_summary_text(title: str | None, summary: str) -> str:
+    return f"제목: {title or ''}\n\n요약:\n{summary}"
+
+
+# [function] DB 시각(UTC, timezone 없음)을 UTC 시각으로
+def _as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+# [function] 요약 ETag - 문서 ID + 수정 시각 (압축 응답은 표현이 다르므로 방식 이름을 붙임)
+def entity_tag(document_id: int, updated_at: datetime, encoding: str | None = None) -> str:
+    stamp = int(_as_utc(updated_at).timestamp() * 1_000_000)
+    suffix = f"-{encoding}" if encoding else ""
+    return f'"summary-{document_id}-{stamp:x}{suffix}"'
+
+
+# [function] Last-Modified 헤더 값 (HTTP 날짜, 초 단위)
+def http_date(value: datetime) -> str:
+    return format_datetime(_as_utc(value).replace(microsecond=0), usegmt=True)
+
+
+# [function] 조건부 요청 판단 - If-None-Match 가 있으면 ETag(압축 방식 무관)로, 없으면 If-Modified-Since 로 비교
+def is_not_modified(
+    if_none_match: str | None,
+    if_modified_since: str | None,
+    document_id: int,
+    updated_at: datetime,
+) -> bool:
+    if if_none_match:
+        current = {entity_tag(document_id, updated_at, encoding) for encoding in (None, "gzip", "br")}
+        for candidate in if_none_match.split(","):
+            candidate = candidate.strip()
+            if candidate == "*":
+                return True
+            if candidate.startswith("W/"):
+                candidate = candidate[2:]
+            if candidate in current:
+                return True
+        return False
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            return False
+        return _as_utc(updated_at).replace(microsecond=0) <= since
+    return False
+
+
+# [function] If-Range 일치 여부 - ETag 는 압축하지 않은 표현의 강한 비교, 날짜는 Last-Modified 와 정확히 같을 때
+def if_range_matches(if_range: str | None, document_id: int, updated_at: datetime) -> bool:
+    if not if_range:
+        return True
+    if_range = if_range.strip()
+    if if_range.startswith('"'):
+        return if_range == entity_tag(document_id, updated_at)
+    return if_range == http_date(updated_at)
+
+
+# [function] Range 헤더 해석 - 단일 바이트 범위 (시작, 끝) 반환, 형식이 다르거나 범위가 여러 개면 None (전체 응답)
+# 만족할 수 없는 범위면 ValueError
+def parse_byte_range(range_header: str | None, size: int) -> tuple[int, int] | None:
+    if not range_header:
+        return None
+    unit, _, spec = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    start_text, dash, end_text = (part.strip() for part in spec.partition("-"))
+    if not dash or not (start_text or end_text):
+        return None
+    if (start_text and not start_text.isdigit()) or (end_text and not end_text.isdigit()):
+        return None
+    if start_text:
+        start = int(start_text)
+        end = int(end_text) if end_text else None
+        if end is not None and end < start:
+            return None
+    else:
+        # [suffix] bytes=-N 은 마지막 N 바이트
+        length = int(end_text)
+        if length == 0:
+            raise ValueError("range not satisfiable")
+        start, end = max(0, size - length), size - 1
+    if start >= size:
+        raise ValueError("range not satisfiable")
+    return start, size - 1 if end is None else min(end, size - 1)
+
+
+# [function] Accept-Encoding 협상 - 품질값(q)이 가장 높은 지원 방식, 같으면 서버 선호 순서 (압축하지 않으면 None)
+def negotiate_encoding(accept_encoding: str | None) -> str | None:
+    if not accept_encoding:
+        return None
+    weights: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        weights[coding] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in SUPPORTED_ENCODINGS:
+        quality = weights.get(encoding, weights.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+# [class] 스트리밍 압축기 - 조각 단위로 압축해 바로 내보냄 (flush 하면 지금까지의 입력을 클라이언트가 풀 수 있음)
+class StreamEncoder:
+    def __init__(self, encoding: str | None):
+        self.encoding = encoding
+        if encoding == "gzip":
+            self._compressor = zlib.compressobj(DOWNLOAD_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        elif encoding == "br":
+            self._compressor = brotli.Compressor(quality=DOWNLOAD_BROTLI_QUALITY)
+        elif encoding is None:
+            self._compressor = None
+        else:
+            raise ValueError(f"Unsupported encoding: {encoding}")
+
+    # [function] 입력 조각 압축 (압축기 내부 버퍼에 남은 부분은 다음 호출/flush 때 출력)
+    def compress(self, data: bytes) -> bytes:
+        if self._compressor is None:
+            return data
+        if self.encoding == "gzip":
+            return self._compressor.compress(data)
+        return self._compressor.process(data)
+
+    # [function] 지금까지의 입력을 모두 출력 (스트림은 계속)
+    def flush(self) -> bytes:
+        if self._compressor is None:
+            return b""
+        if self.encoding == "gzip":
+            return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+        return self._compressor.flush()
+
+    # [function] 스트림 종료
+    def finish(self) -> bytes:
+        if self._compressor is None:
+            return b""
+        if self.encoding == "gzip":
+            return self._compressor.flush(zlib.Z_FINISH)
+        return self._compressor.finish()
+
+
+# [function] 바이트 본문을 DOWNLOAD_CHUNK_BYTES 조각으로 나눠 압축하며 내보냄
+def iter_encoded(data: bytes, encoding: str | None) -> Iterator[bytes]:
+    encoder = StreamEncoder(encoding)
+    for start in range(0, len(data), DOWNLOAD_CHUNK_BYTES):
+        chunk = encoder.compress(data[start:start + DOWNLOAD_CHUNK_BYTES])
+        if chunk:
+            yield chunk
+    tail = encoder.finish()
+    if tail:
+        yield tail
+
+
+# [function] 내보내기 NDJSON 한 줄
+def ndjson_line(record: dict) -> bytes:
+    return (json.dumps(record, ensure_ascii=False, default=str) + "\n").encode("utf-8")
+
+
+# [class] ZIP 출력 버퍼 - seek 할 수 없는 스트림으로 취급되어 zipfile 이 항목마다 데이터 디스크립터를 붙여 순차 기록
+class _ZipSink:
+    def __init__(self):
+        self._chunks: list[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        return None
+
+    # [function] 쌓인 출력 꺼내기
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+# [class] 스트리밍 ZIP 작성기 - 항목을 추가할 때마다 만들어진 바이트만 반환 (전체 ZIP 을 메모리에 두지 않음)
+class ZipStream:
+    def __init__(self):
+        self._sink = _ZipSink()
+        self._zip = zipfile.ZipFile(self._sink, mode="w", compression=zipfile.ZIP_DEFLATED)
+
+    # [function] 텍스트 항목 추가 후 출력 바이트 반환
+    def add(self, name: str, text: str, modified: datetime) -> bytes:
+        info = zipfile.ZipInfo(name, date_time=max(_ZIP_MIN_DATE, _as_utc(modified).timetuple()[:6]))
+        info.compress_type = zipfile.ZIP_DEFLATED
+        self._zip.writestr(info, text.encode("utf-8"))
+        return self._sink.drain()
+
+    # [function] 중앙 디렉터리 기록 후 남은 바이트 반환
+    def close(self) -> bytes:
+        self._zip.close()
+        return self._sink.drain()
+
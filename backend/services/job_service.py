@@ -0,0 +1,588 @@
+# [Service] 백그라운드 요약 작업 큐 - 업로드 접수 후 워커 풀에서 파이프라인 실행
+import asyncio
+import logging
+import os
+import time
+from uuid import uuid4
+import numpy as np
+from sqlalchemy import update
+from database import SessionLocal
+from models.summary import DocumentSignature, DocumentText, Summary
+from services import (
+    bm25_service,
+    chunk_service,
+    dedup_service,
+    pdf_service,
+    llm_service,
+    metrics_service,
+    shared_state_service,
+    vector_service,
+)
+from services.llm_service import GeminiServiceError
+from settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+# [const] 외부 노출 허용 에러 코드
+ALLOWED_ERROR_CODES = {
+    "INVALID_FILE",
+    "PDF_PARSE_FAILED",
+    "GEMINI_FAILED",
+    "DB_ERROR",
+}
+
+# [settings] 워커/업로드 저장/청킹 설정
+settings = get_settings()
+BATCH_CONCURRENCY = settings.batch_concurrency
+UPLOAD_DIR = settings.upload_dir
+# [settings] 청크 크기/겹침은 모델 토큰 수 기준 (pdf_service.estimate_tokens)
+CHUNK_MAX_TOKENS = settings.chunk_max_tokens
+CHUNK_OVERLAP_TOKENS = settings.chunk_overlap_tokens
+
+# [state] 작업 큐와 워커 태스크 (큐의 영속성은 PENDING 레코드 + 업로드 파일이 담당)
+_queue: asyncio.Queue | None = None
+_workers: list[asyncio.Task] = []
+# [state] 문서별 진행 이벤트 구독 큐 (스트리밍 엔드포인트용, 같은 프로세스 안에서만 전달)
+_subscribers: dict[int, list[asyncio.Queue]] = {}
+
+
+# [function] 예외를 표준 에러 코드로 정규화
+def normalize_error_code(exc: Exception) -> str:
+    code = str(exc).strip()
+    if code in ALLOWED_ERROR_CODES:
+        return code
+    return "DB_ERROR"
+
+
+# [function] 문서 진행 이벤트 구독 - 큐 등록 전에 호출해야 모든 이벤트를 받음
+def subscribe(document_id: int, queue: asyncio.Queue) -> None:
+    _subscribers.setdefault(document_id, []).append(queue)
+
+
+# [function] 문서 진행 이벤트 구독 해제
+def unsubscribe(document_id: int, queue: asyncio.Queue) -> None:
+    queues = _subscribers.get(document_id)
+    if not queues:
+        return
+    if queue in queues:
+        queues.remove(queue)
+    if not queues:
+        del _subscribers[document_id]
+
+
+# [function] 문서 진행 이벤트 발행 (구독자가 없으면 무시)
+def _publish(document_id: int | None, event: dict) -> None:
+    for queue in _subscribers.get(document_id, ()):
+        queue.put_nowait({"document_id": document_id, **event})
+
+
+# [function] 시작 시각부터 경과 시간(ms)
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 1)
+
+
+# [function] 단계 실행 - 시작/완료 이벤트와 단계 소요 시간 발행
+async def _run_stage(document_id: int | None, stage: str, awaitable, **fields):
+    started = time.perf_counter()
+    _publish(document_id, {"event": "stage", "stage": stage, "status": "started", **fields})
+    result = await awaitable
+    metrics_service.observe_stage(stage, time.perf_counter() - started)
+    _publish(
+        document_id,
+        {
+            "event": "stage",
+            "stage": stage,
+            "status": "done",
+            "elapsed_ms": _elapsed_ms(started),
+            **fields,
+        },
+    )
+    return result
+
+
+# [function] 문서 ID별 업로드 파일 경로
+def upload_path(document_id: int) -> str:
+    return os.path.join(UPLOAD_DIR, f"{document_id}.pdf")
+
+
+# [function] 파일 삭제 (없으면 무시)
+def _remove_file(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+# [function] PENDING 문서 레코드 생성 후 업로드 파일을 문서 ID 경로로 이동
+def _create_pending_document(filename: str, temp_path: str) -> int:
+    db = SessionLocal()
+    document_id = None
+    try:
+        document = Summary(
+            original_filename=filename,
+            status="PENDING",
+            error_message=None,
+        )
+        db.add(document)
+        db.flush()
+        document_id = document.id
+
+        os.replace(temp_path, upload_path(document_id))
+        db.commit()
+        return document_id
+    except Exception:
+        db.rollback()
+        if document_id is not None:
+            _remove_file(upload_path(document_id))
+        raise
+    finally:
+        db.close()
+
+
+# [function] 처리 대기 중인 문서 ID 목록 조회 (재시작 시 작업 복구용)
+def _load_pending_ids() -> list[int]:
+    db = SessionLocal()
+    try:
+        rows = (
+            db.query(Summary.id)
+            .filter(Summary.status == "PENDING")
+            .order_by(Summary.id.asc())
+            .all()
+        )
+        return [row.id for row in rows]
+    finally:
+        db.close()
+
+
+# [function] 처리 대상 문서의 파일명 조회 - PENDING 이 아니면 None
+def _get_pending_filename(document_id: int) -> str | None:
+    db = SessionLocal()
+    try:
+        item = (
+            db.query(Summary.original_filename)
+            .filter(Summary.id == document_id, Summary.status == "PENDING")
+            .first()
+        )
+        return item.original_filename if item else None
+    finally:
+        db.close()
+
+
+# [function] 문서 현재 상태 조회 - (상태, 에러 코드, 파일명), 문서가 없으면 None
+def _get_document_status(document_id: int) -> tuple[str, str | None, str] | None:
+    db = SessionLocal()
+    try:
+        item = (
+            db.query(Summary.status, Summary.error_message, Summary.original_filename)
+            .filter(Summary.id == document_id)
+            .first()
+        )
+        return (item.status, item.error_message, item.original_filename) if item else None
+    finally:
+        db.close()
+
+
+# [function] 처리하지 않고 돌아갈 때의 최종 이벤트 - 구독자가 기다리지 않도록 DB 의 현재 상태(읽지 못하면 UNKNOWN)를 알림
+# PENDING 이면 다른 워커 프로세스가 처리 중이므로 구독자는 DB 상태를 다시 확인하며 계속 기다림
+async def _publish_skipped(document_id: int, started: float) -> None:
+    if document_id not in _subscribers:
+        return
+    try:
+        current = await asyncio.to_thread(_get_document_status, document_id)
+    except Exception:
+        logger.exception("Failed to read status of document_id=%s", document_id)
+        current = ("UNKNOWN", None, "")
+    status, error_code, filename = current or ("FAILED", "NOT_FOUND", "")
+    _publish(
+        document_id,
+        {
+            "event": "finished",
+            "filename": filename,
+            "status": status,
+            "error_code": error_code,
+            "elapsed_ms": _elapsed_ms(started),
+            "skipped": True,
+        },
+    )
+
+
+# [function] 성공 결과 저장 - 문서 갱신 + 원문/청크/임베딩 저장을 한 트랜잭션으로 처리
+def _complete_document(
+    document_id: int,
+    text: str,
+    chunks: list[dict],
+    vectors: list[list[float]],
+    summary_result: dict,
+    signature: np.ndarray | None = None,
+) -> None:
+    db = SessionLocal()
+    try:
+        # [update] 문서 행을 읽지 않고 필요한 컬럼만 갱신
+        result = db.execute(
+            update(Summary)
+            .where(Summary.id == document_id)
+            .values(
+                summary_title=summary_result["title"],
+                summary_text=summary_result["summary"],
+                status="COMPLETED",
+                error_message=None,
+            )
+        )
+        if result.rowcount == 0:
+            raise ValueError("DB_ERROR")
+
+        # [save] 원문은 document_texts 테이블에 압축 저장
+        db.add(DocumentText(document_id=document_id, original_text=text))
+
+        # [save] 유사 중복 탐지용 MinHash 서명
+        if signature is not None:
+            db.add(
+                DocumentSignature(
+                    document_id=document_id,
+                    minhash=dedup_service.encode_signature(signature),
+                )
+            )
+
+        # [save] 청크/임베딩 대량 저장 (executemany 또는 PostgreSQL COPY)
+        chunk_service.insert_chunks(db, document_id, chunks, vectors)
+
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+# [function] 실패 결과 저장
+def _fail_document(document_id: int, error_code: str) -> None:
+    db = SessionLocal()
+    try:
+        db.execute(
+            update(Summary)
+            .where(Summary.id == document_id, Summary.status == "PENDING")
+            .values(status="FAILED", error_message=error_code)
+        )
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+# [function] 업로드 파일 접수 - 디스크 저장 + PENDING 레코드 생성 + 큐 등록 (progress_queue 가 있으면 진행 이벤트 구독)
+async def submit_upload(
+    file,
+    max_file_size_bytes: int | None = None,
+    progress_queue: asyncio.Queue | None = None,
+) -> int:
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
+    temp_path = os.path.join(UPLOAD_DIR, f".upload-{uuid4().hex}.pdf")
+    try:
+        await pdf_service.save_upload(file, temp_path, max_file_size_bytes=max_file_size_bytes)
+        document_id = await asyncio.to_thread(
+            _create_pending_document,
+            file.filename or "",
+            temp_path,
+        )
+    finally:
+        _remove_file(temp_path)
+
+    if progress_queue is not None:
+        subscribe(document_id, progress_queue)
+    enqueue(document_id)
+    return document_id
+
+
+# [function] 임베딩 - 유사 중복 문서에서 같은 텍스트의 청크 임베딩을 재사용하고 나머지만 API 호출
+async def _embed_with_reuse(
+    document_id: int | None,
+    text: str,
+    chunk_texts: list[str],
+) -> tuple[list[list[float]], np.ndarray | None]:
+    started = time.perf_counter()
+    _publish(document_id, {"event": "stage", "stage": "dedup", "status": "started"})
+    reuse = await asyncio.to_thread(dedup_service.find_reusable_embeddings, text, chunk_texts)
+    reused = reuse["vectors"]
+    metrics_service.observe_stage("dedup", time.perf_counter() - started)
+    if reuse["duplicate_of"] is not None:
+        metrics_service.NEAR_DUPLICATES_TOTAL.inc()
+        metrics_service.REUSED_EMBEDDINGS_TOTAL.inc(len(reused))
+    _publish(
+        document_id,
+        {
+            "event": "stage",
+            "stage": "dedup",
+            "status": "done",
+            "elapsed_ms": _elapsed_ms(started),
+            "duplicate_of": reuse["duplicate_of"],
+            "similarity": reuse["similarity"],
+            "reused_chunks": len(reused),
+        },
+    )
+
+    missing = [idx for idx in range(len(chunk_texts)) if idx not in reused]
+    fresh = []
+    if missing:
+        fresh = await _run_stage(
+            document_id,
+            "embed",
+            llm_service.embed_chunks([chunk_texts[idx] for idx in missing]),
+            chunks=len(missing),
+        )
+        # [fallback] 새 벡터와 재사용 벡터의 차원이 다르면 전체를 새로 임베딩
+        if reused and fresh and len(fresh[0]) != len(next(iter(reused.values()))):
+            vectors = await _run_stage(
+                document_id,
+                "embed",
+                llm_service.embed_chunks(chunk_texts),
+                chunks=len(chunk_texts),
+            )
+            return vectors, reuse["signature"]
+
+    vectors = [None] * len(chunk_texts)
+    for idx, vector in reused.items():
+        vectors[idx] = vector
+    for idx, vector in zip(missing, fresh):
+        vectors[idx] = vector
+    return vectors, reuse["signature"]
+
+
+# [function] 파이프라인 실행 - 페이지별 텍스트 추출 -> 청킹(페이지 범위 포함) -> 중복 탐지/임베딩 -> 요약 (단계별 진행 이벤트 발행)
+async def run_pipeline(
+    path: str,
+    document_id: int | None = None,
+) -> tuple[str, list[dict], list[list[float]], dict, np.ndarray | None]:
+    started = time.perf_counter()
+    _publish(document_id, {"event": "stage", "stage": "extract", "status": "started"})
+    pages = await pdf_service.extract_pages(path)
+    ocr_page_count = sum(1 for page in pages if page["source"] == "ocr")
+    metrics_service.observe_stage("extract", time.perf_counter() - started)
+    metrics_service.PAGES_TOTAL.labels("text").inc(len(pages) - ocr_page_count)
+    metrics_service.PAGES_TOTAL.labels("ocr").inc(ocr_page_count)
+    _publish(
+        document_id,
+        {
+            "event": "stage",
+            "stage": "extract",
+            "status": "done",
+            "elapsed_ms": _elapsed_ms(started),
+            "pages": len(pages),
+            "ocr_pages": ocr_page_count,
+        },
+    )
+
+    started = time.perf_counter()
+    text = pdf_service.join_pages(pages)
+    chunks = pdf_service.split_pages_into_chunks(
+        pages,
+        max_tokens=CHUNK_MAX_TOKENS,
+        overlap_tokens=CHUNK_OVERLAP_TOKENS,
+    )
+    chunk_texts = [chunk["text"] for chunk in chunks]
+    metrics_service.observe_stage("chunk", time.perf_counter() - started)
+    metrics_service.CHUNKS_TOTAL.inc(len(chunks))
+    _publish(
+        document_id,
+        {
+            "event": "stage",
+            "stage": "chunk",
+            "status": "done",
+            "elapsed_ms": _elapsed_ms(started),
+            "chunks": len(chunks),
+        },
+    )
+
+    # [stream] 진행 상황 구독자가 있으면 요약 부분 텍스트를 생성되는 대로 전달
+    on_delta = None
+    if document_id in _subscribers:
+        def on_delta(field: str, delta: str) -> None:
+            _publish(document_id, {"event": "summary_delta", "field": field, "text": delta})
+
+    # [concurrency] 임베딩과 요약은 서로 독립적이므로 동시에 실행 (요약은 바뀐 내용을 반영하도록 항상 새로 생성)
+    (vectors, signature), summary_result = await asyncio.gather(
+        _embed_with_reuse(document_id, text, chunk_texts),
+        _run_stage(
+            document_id,
+            "summarize",
+            llm_service.summarize(text, on_delta=on_delta),
+            chunks=len(chunk_texts),
+        ),
+    )
+    return text, chunks, vectors, summary_result, signature
+
+
+# [function] 단일 문서 처리 - 결과를 COMPLETED/FAILED 로 기록하고 업로드 파일 정리
+async def process_document(document_id: int) -> None:
+    started = time.perf_counter()
+    # [claim] 여러 워커 프로세스가 같은 PENDING 문서를 복구해도 한 프로세스만 처리 (처리하지 않고 돌아가도 최종 이벤트 발행)
+    claim_name = f"document:{document_id}"
+    try:
+        claimed = await asyncio.to_thread(shared_state_service.claim, claim_name)
+    except Exception:
+        await _publish_skipped(document_id, started)
+        raise
+    if not claimed:
+        await _publish_skipped(document_id, started)
+        return
+    try:
+        try:
+            filename = await asyncio.to_thread(_get_pending_filename, document_id)
+        except Exception:
+            await _publish_skipped(document_id, started)
+            raise
+        if filename is None:
+            await _publish_skipped(document_id, started)
+            return
+
+        _publish(document_id, {"event": "started", "filename": filename})
+        metrics_service.JOBS_IN_PROGRESS.inc()
+        try:
+            await _process_pending_document(document_id, filename, started)
+        finally:
+            metrics_service.JOBS_IN_PROGRESS.dec()
+            metrics_service.observe_stage("document", time.perf_counter() - started)
+    finally:
+        await asyncio.to_thread(shared_state_service.release, claim_name)
+
+
+# [function] PENDING 문서 파이프라인 실행 및 결과 기록 (process_document 에서 호출)
+async def _process_pending_document(document_id: int, filename: str, started: float) -> None:
+    path = upload_path(document_id)
+    try:
+        if not os.path.exists(path):
+            raise ValueError("INVALID_FILE")
+        text, chunks, vectors, summary_result, signature = await run_pipeline(path, document_id)
+        await _run_stage(
+            document_id,
+            "save",
+            asyncio.to_thread(
+                _complete_document,
+                document_id,
+                text,
+                chunks,
+                vectors,
+                summary_result,
+                signature,
+            ),
+            chunks=len(chunks),
+        )
+        # [index] 검색 인덱스(임베딩/BM25)와 중복 탐지 인덱스에 새 문서 반영
+        # 이미 COMPLETED 로 저장됐으므로 메모리 인덱스 반영 실패는 기록만 함 (다음 재시작 때 DB 에서 다시 적재)
+        try:
+            vector_service.chunk_index.add_document(document_id, list(range(len(vectors))), vectors)
+            stored_texts = [chunk["text"] for chunk in chunks[:len(vectors)]]
+            bm25_service.bm25_index.add_document(document_id, list(range(len(stored_texts))), stored_texts)
+            dedup_service.signature_index.add_document(document_id, signature)
+        except Exception:
+            logger.exception("Failed to index document_id=%s in memory", document_id)
+        # [index] 다른 워커 프로세스의 인덱스는 다음 조회 때 공유 알림으로 반영 (알림 실패가 저장 결과를 바꾸지 않도록)
+        try:
+            await asyncio.to_thread(shared_state_service.publish_document, document_id)
+        except Exception:
+            logger.exception("Failed to publish document_id=%s to other workers", document_id)
+        metrics_service.DOCUMENTS_TOTAL.labels("COMPLETED", "").inc()
+        _publish(
+            document_id,
+            {
+                "event": "finished",
+                "filename": filename,
+                "status": "COMPLETED",
+                "error_code": None,
+                "elapsed_ms": _elapsed_ms(started),
+            },
+        )
+    except Exception as exc:
+        error_code = normalize_error_code(exc)
+        metrics_service.DOCUMENTS_TOTAL.labels("FAILED", error_code).inc()
+        if isinstance(exc, GeminiServiceError):
+            logger.warning(
+                "Gemini failed for document_id=%s filename=%s detail=%s",
+                document_id,
+                filename,
+                exc.detail,
+            )
+        else:
+            logger.exception(
+                "Pipeline failed for document_id=%s filename=%s",
+                document_id,
+                filename,
+            )
+        # [fail] 상태 기록에 실패하면 파일을 남겨 재시작 시 다시 처리 (구독자에게는 실패를 알림)
+        try:
+            await asyncio.to_thread(_fail_document, document_id, error_code)
+        finally:
+            _publish(
+                document_id,
+                {
+                    "event": "finished",
+                    "filename": filename,
+                    "status": "FAILED",
+                    "error_code": error_code,
+                    "elapsed_ms": _elapsed_ms(started),
+                },
+            )
+
+    _remove_file(path)
+
+
+# [function] 워커 루프 - 큐에서 문서 ID를 꺼내 순서대로 처리
+async def _worker_loop() -> None:
+    while True:
+        document_id = await _queue.get()
+        try:
+            await process_document(document_id)
+        except Exception:
+            logger.exception("Job failed for document_id=%s", document_id)
+        finally:
+            _queue.task_done()
+
+
+# [function] 작업 큐 등록
+def enqueue(document_id: int) -> None:
+    if _queue is None:
+        # [fallback] 워커가 없으면 PENDING 상태로 남겨 다음 시작 시 복구
+        logger.warning("Job queue is not running; document_id=%s stays PENDING", document_id)
+        return
+    _queue.put_nowait(document_id)
+
+
+# [function] 워커 풀 실행 여부
+def is_running() -> bool:
+    return _queue is not None
+
+
+# [function] 실행 중인 워커 수
+def worker_count() -> int:
+    return len(_workers)
+
+
+# [function] 대기 중인 작업 수
+def queue_size() -> int:
+    return _queue.qsize() if _queue is not None else 0
+
+
+# [function] 서버 시작 시 워커 풀 기동 + PENDING 작업 복구
+async def start_workers() -> None:
+    global _queue
+    if _queue is not None:
+        return
+
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
+    _queue = asyncio.Queue()
+    for _ in range(BATCH_CONCURRENCY):
+        _workers.append(asyncio.create_task(_worker_loop()))
+
+    for document_id in await asyncio.to_thread(_load_pending_ids):
+        _queue.put_nowait(document_id)
+
+
+# [function] 서버 종료 시 워커 풀 정리 (처리 중이던 작업은 PENDING 으로 남아 재시작 시 재개)
+async def stop_workers() -> None:
+    global _queue
+    for worker in _workers:
+        worker.cancel()
+    await asyncio.gather(*_workers, return_exceptions=True)
+    _workers.clear()
+    _queue = None
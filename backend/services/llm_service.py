@@ -1,51 +1,285 @@
 # [Service] Gemini API 호출 및 요약/임베딩 로직
 import asyncio
 import json
-import os
-from urllib.error import HTTPError, URLError
-from urllib import parse, request
-from prompts.summarize_prompt import SUMMARIZE_PROMPT
+import random
+import re
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable
+import httpx
+from prompts.qa_prompt import ANSWER_PROMPT
+from prompts.summarize_prompt import (
+    SUMMARIZE_MAP_PROMPT,
+    SUMMARIZE_PROMPT,
+    SUMMARIZE_REDUCE_PROMPT,
+)
+from services import cache_service, metrics_service, pdf_service, rate_limit_service
+from settings import get_settings
 
-# [env] Gemini 설정
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-GEMINI_MODEL_SUMMARY = os.getenv("GEMINI_MODEL_SUMMARY", "gemini-2.0-flash")
-GEMINI_MODEL_EMBEDDING = os.getenv("GEMINI_MODEL_EMBEDDING", "text-embedding-004")
-SUMMARY_MAX_CHARS = int(os.getenv("SUMMARY_MAX_CHARS", "40000"))
+# [settings] Gemini 설정
+settings = get_settings()
+GEMINI_API_KEY = settings.gemini_api_key
+GEMINI_MODEL_SUMMARY = settings.gemini_model_summary
+GEMINI_MODEL_EMBEDDING = settings.gemini_model_embedding
+SUMMARY_MAX_CHARS = settings.summary_max_chars
+# [settings] 요약 방식 - auto: 원문이 SUMMARY_MAX_CHARS 를 넘으면 map-reduce, truncate: 앞부분만 요약, map_reduce: 항상 map-reduce
+SUMMARY_MODE = settings.summary_mode
+SUMMARY_MAP_GROUP_CHARS = settings.summary_map_group_chars
+SUMMARY_MAP_CONCURRENCY = settings.summary_map_concurrency
+# [settings] Gemini HTTP 클라이언트 설정 (커넥션 풀/타임아웃)
+GEMINI_API_BASE_URL = settings.gemini_api_base_url
+GEMINI_HTTP_MAX_CONNECTIONS = settings.gemini_http_max_connections
+GEMINI_HTTP_MAX_KEEPALIVE = settings.gemini_http_max_keepalive
+GEMINI_HTTP_KEEPALIVE_EXPIRY = settings.gemini_http_keepalive_expiry
+GEMINI_HTTP_TIMEOUT = settings.gemini_http_timeout
+GEMINI_HTTP_CONNECT_TIMEOUT = settings.gemini_http_connect_timeout
+GEMINI_HTTP2 = settings.gemini_http2
+# [settings] 임베딩 배치 설정 (batchEmbedContents 요청당 최대 100건)
+EMBED_BATCH_SIZE = settings.embed_batch_size
+EMBED_CONCURRENCY = settings.embed_concurrency
+# [settings] 재시도 설정 - 429/5xx/타임아웃/연결 오류만 지수 백오프(full jitter)로 재시도, Retry-After 우선
+GEMINI_RETRY_MAX_ATTEMPTS = settings.gemini_retry_max_attempts
+GEMINI_RETRY_BASE_DELAY = settings.gemini_retry_base_delay
+GEMINI_RETRY_MAX_DELAY = settings.gemini_retry_max_delay
+# [settings] TPM 예약용 토큰 추정 (문자 수 / GEMINI_CHARS_PER_TOKEN, 응답의 실제 사용량으로 정산)
+GEMINI_CHARS_PER_TOKEN = settings.gemini_chars_per_token
+
+# [const] 재시도 대상 HTTP 상태 코드
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
 
 
 # [class] Gemini 서비스 예외
 class GeminiServiceError(Exception):
-    def __init__(self, code: str, detail: str):
+    def __init__(self, code: str, detail: str, status_code: int | None = None):
         super().__init__(code)
         self.code = code
         self.detail = detail
+        self.status_code = status_code
 
 
-# [function] Gemini REST API 요청
-def _post_gemini(path: str, payload: dict) -> dict:
-    if not GEMINI_API_KEY:
-        raise GeminiServiceError("GEMINI_FAILED", "GEMINI_API_KEY is missing")
+# [class] 재시도 가능한 Gemini 호출 실패 (429/5xx/타임아웃/연결 오류)
+class _RetryableGeminiError(Exception):
+    def __init__(
+        self,
+        detail: str,
+        status_code: int | None = None,
+        retry_after: float | None = None,
+        can_retry: bool = True,
+        reason: str | None = None,
+    ):
+        super().__init__(detail)
+        self.detail = detail
+        self.status_code = status_code
+        self.retry_after = retry_after
+        self.can_retry = can_retry
+        # [metric] 메트릭 레이블용 실패 사유 (HTTP 코드 또는 timeout / connection_error)
+        self.reason = reason or (str(status_code) if status_code else "error")
+
+
+# [state] 앱 전체에서 공유하는 keep-alive HTTP 클라이언트
+_http_client: httpx.AsyncClient | None = None
+
+
+# [function] 공유 HTTP 클라이언트 생성 - h2 패키지가 있으면 HTTP/2 사용
+def _build_http_client() -> httpx.AsyncClient:
+    http2 = GEMINI_HTTP2
+    if http2:
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            http2 = False
 
-    url = f"https://generativelanguage.googleapis.com/v1beta/{path}?{parse.urlencode({'key': GEMINI_API_KEY})}"
-    data = json.dumps(payload).encode("utf-8")
-    req = request.Request(
-        url=url,
-        data=data,
+    return httpx.AsyncClient(
+        base_url=GEMINI_API_BASE_URL.rstrip("/") + "/",
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=GEMINI_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=GEMINI_HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=GEMINI_HTTP_KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(GEMINI_HTTP_TIMEOUT, connect=GEMINI_HTTP_CONNECT_TIMEOUT),
         headers={"Content-Type": "application/json"},
-        method="POST",
     )
 
+
+# [function] 서버 시작 시 HTTP 클라이언트 초기화
+async def init_http_client() -> None:
+    global _http_client
+    if _http_client is None:
+        _http_client = _build_http_client()
+
+
+# [function] 서버 종료 시 HTTP 클라이언트 정리
+async def close_http_client() -> None:
+    global _http_client
+    if _http_client is not None:
+        client = _http_client
+        _http_client = None
+        await client.aclose()
+
+
+# [function] 공유 HTTP 클라이언트 반환 (앱 밖 스크립트에서는 최초 호출 시 생성)
+def _get_http_client() -> httpx.AsyncClient:
+    global _http_client
+    if _http_client is None:
+        _http_client = _build_http_client()
+    return _http_client
+
+
+# [function] Retry-After 헤더 해석 (초 또는 HTTP 날짜) - 없거나 잘못되면 None
+def _parse_retry_after(value: str | None) -> float | None:
+    if not value:
+        return None
     try:
-        with request.urlopen(req, timeout=60) as resp:
-            body = resp.read().decode("utf-8")
-            return json.loads(body)
-    except HTTPError as exc:
-        body = exc.read().decode("utf-8", errors="ignore")
-        raise GeminiServiceError("GEMINI_FAILED", f"HTTP {exc.code}: {body}") from exc
-    except URLError as exc:
-        raise GeminiServiceError("GEMINI_FAILED", f"URL_ERROR: {exc.reason}") from exc
-    except Exception as exc:
-        raise GeminiServiceError("GEMINI_FAILED", f"UNEXPECTED: {exc}") from exc
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+# [function] 재시도 대기 시간 - Retry-After 가 있으면 그 값 + 약간의 지터, 없으면 지수 백오프 full jitter
+def _retry_delay(attempt: int, retry_after: float | None) -> float | None:
+    if retry_after is not None:
+        if retry_after > GEMINI_RETRY_MAX_DELAY:
+            return None
+        return retry_after + random.uniform(0, GEMINI_RETRY_BASE_DELAY)
+    return random.uniform(0, min(GEMINI_RETRY_MAX_DELAY, GEMINI_RETRY_BASE_DELAY * (2 ** attempt)))
+
+
+# [function] 요청 본문의 텍스트 길이로 요청 수/토큰 수 추정 (배치 임베딩은 항목 수만큼 요청으로 계산)
+def _estimate_usage(payload: dict) -> tuple[int, int]:
+    def text_length(node) -> int:
+        if isinstance(node, dict):
+            return sum(
+                len(value) if key == "text" and isinstance(value, str) else text_length(value)
+                for key, value in node.items()
+            )
+        if isinstance(node, list):
+            return sum(text_length(item) for item in node)
+        return 0
+
+    requests = len(payload.get("requests") or []) or 1
+    return requests, int(text_length(payload) / GEMINI_CHARS_PER_TOKEN) + 1
+
+
+# [function] 응답의 실제 토큰 사용량 (usageMetadata 가 없으면 None)
+def _usage_tokens(response: dict | None) -> int | None:
+    if not isinstance(response, dict):
+        return None
+    usage = response.get("usageMetadata") or {}
+    total = usage.get("totalTokenCount")
+    return int(total) if isinstance(total, (int, float)) else None
+
+
+# [function] HTTP 응답 상태 검사 - 재시도 대상이면 _RetryableGeminiError, 그 외 4xx 는 GeminiServiceError
+def _raise_for_status(status_code: int, body: str, headers: httpx.Headers) -> None:
+    if status_code in RETRYABLE_STATUS_CODES:
+        raise _RetryableGeminiError(
+            f"HTTP {status_code}: {body}",
+            status_code=status_code,
+            retry_after=_parse_retry_after(headers.get("Retry-After")),
+        )
+    if status_code >= 400:
+        raise GeminiServiceError("GEMINI_FAILED", f"HTTP {status_code}: {body}", status_code=status_code)
+
+
+# [function] 속도 제한/재시도/서킷 브레이커를 거쳐 호출 1회분(attempt) 실행
+# attempt 는 (결과, 실제 토큰 사용량) 반환, 재시도 가능한 실패는 _RetryableGeminiError 로 알림
+async def _call_gemini(path: str, payload: dict, attempt) -> object:
+    if not GEMINI_API_KEY:
+        raise GeminiServiceError("GEMINI_FAILED", "GEMINI_API_KEY is missing")
+
+    model_path, _, method = path.partition(":")
+    model = model_path.removeprefix("models/")
+    limiter = rate_limit_service.get_limiter(model, embedding=model == GEMINI_MODEL_EMBEDDING)
+    breaker = rate_limit_service.get_breaker(model)
+    requests, estimated_tokens = _estimate_usage(payload)
+
+    last_error: _RetryableGeminiError | None = None
+    for attempt_index in range(GEMINI_RETRY_MAX_ATTEMPTS):
+        # [circuit] 차단 중이면 속도 제한 대기 없이 바로 실패, 시험 호출 자리는 대기가 끝난 뒤에 차지
+        if breaker.is_blocked():
+            metrics_service.GEMINI_REQUESTS_TOTAL.labels(model, method, "circuit_open").inc()
+            raise GeminiServiceError("GEMINI_FAILED", f"CIRCUIT_OPEN: {model}")
+        await limiter.acquire(requests, estimated_tokens)
+        if not breaker.allow():
+            metrics_service.GEMINI_REQUESTS_TOTAL.labels(model, method, "circuit_open").inc()
+            raise GeminiServiceError("GEMINI_FAILED", f"CIRCUIT_OPEN: {model}")
+
+        started = time.perf_counter()
+        metrics_service.GEMINI_IN_FLIGHT.labels(model).inc()
+        # [circuit] 허용된 호출은 성공/실패/반환 중 하나로 끝냄 - 결과 없이 끝나면(취소 등) 시험 호출 자리만 반환 (그대로 두면 영구 차단)
+        status = "cancelled"
+        try:
+            result, actual_tokens = await attempt()
+            status = "200"
+        except _RetryableGeminiError as exc:
+            status = exc.reason
+            last_error = exc
+        except GeminiServiceError as exc:
+            # [4xx] 요청 자체의 문제 - 서버는 정상 응답했으므로 실패로 집계하지 않음
+            status = str(exc.status_code) if exc.status_code else "invalid_response"
+            breaker.record_success()
+            raise
+        except Exception:
+            # [unknown] 예상하지 못한 오류도 실패로 집계
+            status = "error"
+            breaker.record_failure()
+            raise
+        finally:
+            if status == "cancelled":
+                breaker.release_probe()
+            metrics_service.GEMINI_IN_FLIGHT.labels(model).dec()
+            metrics_service.record_gemini_request(model, method, status, time.perf_counter() - started)
+
+        if status == "200":
+            breaker.record_success()
+            await limiter.settle(estimated_tokens, actual_tokens)
+            return result
+
+        breaker.record_failure()
+        delay = _retry_delay(attempt_index, last_error.retry_after)
+        if last_error.status_code == 429:
+            # [adaptive] 할당량 초과면 같은 모델의 다른 호출도 대기 시간 동안 멈춤
+            await limiter.pause(last_error.retry_after if last_error.retry_after is not None else (delay or 0))
+        if not last_error.can_retry or delay is None or attempt_index + 1 >= GEMINI_RETRY_MAX_ATTEMPTS:
+            break
+        metrics_service.GEMINI_RETRIES_TOTAL.labels(model, last_error.reason).inc()
+        await asyncio.sleep(delay)
+
+    raise GeminiServiceError(
+        "GEMINI_FAILED",
+        f"RETRY_EXHAUSTED after {attempt_index + 1} attempts: {last_error.detail}",
+    )
+
+
+# [function] Gemini REST API 요청
+async def _post_gemini(path: str, payload: dict) -> dict:
+    client = _get_http_client()
+
+    async def attempt() -> tuple[dict, int | None]:
+        try:
+            resp = await client.post(
+                path,
+                json=payload,
+                headers={"x-goog-api-key": GEMINI_API_KEY},
+            )
+        except httpx.TimeoutException as exc:
+            raise _RetryableGeminiError(f"TIMEOUT: {exc}", reason="timeout") from exc
+        except httpx.HTTPError as exc:
+            raise _RetryableGeminiError(f"URL_ERROR: {exc}", reason="connection_error") from exc
+
+        _raise_for_status(resp.status_code, resp.text, resp.headers)
+        try:
+            response = resp.json()
+        except Exception as exc:
+            raise GeminiServiceError("GEMINI_FAILED", f"UNEXPECTED: {exc}") from exc
+        return response, _usage_tokens(response)
+
+    return await _call_gemini(path, payload, attempt)
 
 
 # [function] Gemini 응답 텍스트 추출
@@ -66,24 +300,162 @@ def _strip_json_fence(raw_text: str) -> str:
     return cleaned
 
 
-# [function] 텍스트를 받아 AI 요약 결과 반환
-async def summarize(text: str) -> dict:
-    if not text or not text.strip():
-        raise GeminiServiceError("GEMINI_FAILED", "EMPTY_SUMMARY_INPUT")
-
-    truncated_text = text[:SUMMARY_MAX_CHARS]
-    prompt_text = SUMMARIZE_PROMPT.format(text=truncated_text)
-    payload = {
+# [function] generateContent / streamGenerateContent 공통 요청 본문
+def _generate_payload(prompt_text: str) -> dict:
+    return {
         "contents": [{"parts": [{"text": prompt_text}]}],
         "generationConfig": {"temperature": 0.2},
     }
 
-    response = await asyncio.to_thread(
-        _post_gemini,
+
+# [function] 프롬프트로 generateContent 호출 후 응답 텍스트 반환
+async def _generate(prompt_text: str) -> str:
+    response = await _post_gemini(
         f"models/{GEMINI_MODEL_SUMMARY}:generateContent",
-        payload,
+        _generate_payload(prompt_text),
     )
-    raw = _extract_text_from_generate_content(response)
+    return _extract_text_from_generate_content(response)
+
+
+# [function] 스트리밍 응답 조각에서 텍스트 추출 (마지막 조각처럼 텍스트가 없으면 빈 문자열)
+def _extract_text_from_stream_chunk(chunk: dict) -> str:
+    try:
+        parts = chunk["candidates"][0].get("content", {}).get("parts", [])
+    except Exception as exc:
+        raise GeminiServiceError("GEMINI_FAILED", f"INVALID_STREAM_RESPONSE: {chunk}") from exc
+    return "".join(part.get("text", "") for part in parts)
+
+
+# [function] 프롬프트로 streamGenerateContent(SSE) 호출 - 텍스트 조각마다 on_text 호출, 전체 응답 텍스트 반환
+# 첫 조각을 받기 전 실패만 재시도 (이미 전달한 부분 텍스트는 되돌릴 수 없음)
+async def _stream_generate(prompt_text: str, on_text: Callable[[str], None]) -> str:
+    client = _get_http_client()
+    path = f"models/{GEMINI_MODEL_SUMMARY}:streamGenerateContent"
+    payload = _generate_payload(prompt_text)
+
+    async def attempt() -> tuple[str, int | None]:
+        pieces = []
+        usage_tokens = None
+        try:
+            async with client.stream(
+                "POST",
+                path,
+                params={"alt": "sse"},
+                json=payload,
+                headers={"x-goog-api-key": GEMINI_API_KEY},
+            ) as resp:
+                if resp.status_code >= 400:
+                    body = (await resp.aread()).decode("utf-8", errors="replace")
+                    _raise_for_status(resp.status_code, body, resp.headers)
+
+                async for line in resp.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[len("data:"):].strip()
+                    if not data:
+                        continue
+                    try:
+                        chunk = json.loads(data)
+                    except ValueError as exc:
+                        raise GeminiServiceError("GEMINI_FAILED", f"INVALID_STREAM_EVENT: {data}") from exc
+                    usage_tokens = _usage_tokens(chunk) or usage_tokens
+                    piece = _extract_text_from_stream_chunk(chunk)
+                    if piece:
+                        pieces.append(piece)
+                        on_text(piece)
+        except httpx.TimeoutException as exc:
+            raise _RetryableGeminiError(f"TIMEOUT: {exc}", can_retry=not pieces, reason="timeout") from exc
+        except httpx.HTTPError as exc:
+            raise _RetryableGeminiError(
+                f"URL_ERROR: {exc}",
+                can_retry=not pieces,
+                reason="connection_error",
+            ) from exc
+
+        raw = "".join(pieces).strip()
+        if not raw:
+            raise GeminiServiceError("GEMINI_FAILED", "EMPTY_STREAM_RESPONSE")
+        return raw, usage_tokens
+
+    return await _call_gemini(path, payload, attempt)
+
+
+# [const] 스트리밍 JSON 에서 값을 따라갈 키 ("title": " / "summary": " 까지 일치해야 값 시작)
+_SUMMARY_KEY_PATTERN = re.compile(r'"(title|summary)"\s*:\s*"')
+# [const] JSON 단일 문자 이스케이프
+_JSON_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+
+# [class] 요약 JSON 스트리밍 파서 - 응답 조각을 받아 title/summary 문자열 값을 생성되는 대로 디코딩
+class SummaryStreamParser:
+    def __init__(self):
+        self.buffer = ""
+        self.values = {"title": "", "summary": ""}
+        self._pos = 0
+        self._field: str | None = None
+
+    # [function] 응답 조각 추가 - 새로 디코딩된 (필드, 텍스트) 목록 반환
+    def feed(self, piece: str) -> list[tuple[str, str]]:
+        self.buffer += piece
+        deltas = []
+        while self._pos < len(self.buffer):
+            if self._field is None:
+                # [key] 다음 title/summary 키 탐색 (키가 덜 도착했으면 다음 조각에서 다시 탐색)
+                match = _SUMMARY_KEY_PATTERN.search(self.buffer, self._pos)
+                if not match:
+                    break
+                self._field = match.group(1)
+                self._pos = match.end()
+                continue
+
+            decoded, consumed, closed = self._decode_string(self._pos)
+            if decoded:
+                self.values[self._field] += decoded
+                deltas.append((self._field, decoded))
+            self._pos += consumed
+            if closed:
+                self._field = None
+                continue
+            break
+        return deltas
+
+    # [function] 문자열 값 디코딩 - (디코딩 텍스트, 소비한 길이, 닫는 따옴표 도달 여부), 이스케이프가 잘렸으면 그 앞에서 멈춤
+    def _decode_string(self, start: int) -> tuple[str, int, bool]:
+        buffer = self.buffer
+        out = []
+        pos = start
+        while pos < len(buffer):
+            char = buffer[pos]
+            if char == '"':
+                return "".join(out), pos + 1 - start, True
+            if char != "\\":
+                out.append(char)
+                pos += 1
+                continue
+
+            if pos + 1 >= len(buffer):
+                break
+            escape = buffer[pos + 1]
+            if escape != "u":
+                out.append(_JSON_ESCAPES.get(escape, escape))
+                pos += 2
+                continue
+
+            # [unicode] \uXXXX (서로게이트 쌍이면 \uXXXX\uXXXX) 가 모두 도착해야 디코딩
+            if pos + 6 > len(buffer):
+                break
+            length = 6
+            if 0xD800 <= int(buffer[pos + 2:pos + 6], 16) <= 0xDBFF:
+                if pos + 12 > len(buffer):
+                    break
+                length = 12
+            out.append(json.loads(f'"{buffer[pos:pos + length]}"'))
+            pos += length
+        return "".join(out), pos - start, False
+
+
+# [function] 요약 응답 JSON 에서 title/summary 추출
+def _parse_summary_json(raw: str) -> dict:
     cleaned_raw = _strip_json_fence(raw)
 
     try:
@@ -105,20 +477,134 @@ async def summarize(text: str) -> dict:
     return {"title": title, "summary": summary}
 
 
-# [function] 단일 텍스트 임베딩 생성
-async def embed_text(text: str) -> list[float]:
+# [function] 연속된 텍스트 조각을 최대 max_chars 길이의 그룹으로 묶기
+def _group_texts(texts: list[str], max_chars: int) -> list[str]:
+    groups = []
+    current: list[str] = []
+    current_length = 0
+    for text in texts:
+        if current and current_length + len(text) > max_chars:
+            groups.append("\n".join(current))
+            current, current_length = [], 0
+        current.append(text)
+        current_length += len(text) + 1
+    if current:
+        groups.append("\n".join(current))
+    return groups
+
+
+# [function] map 단계 - 구간 그룹을 병렬로 부분 요약 (결과는 구간 순서 유지)
+async def _map_summaries(groups: list[str]) -> list[str]:
+    semaphore = asyncio.Semaphore(SUMMARY_MAP_CONCURRENCY)
+
+    async def run_map(group: str) -> str:
+        async with semaphore:
+            return await _generate(SUMMARIZE_MAP_PROMPT.format(text=group))
+
+    return list(await asyncio.gather(*(run_map(group) for group in groups)))
+
+
+# [function] map 단계 입력 구간 - 문장 경계 기준으로 SUMMARY_MAP_GROUP_CHARS 자 이하씩 겹침 없이 나눔
+# (임베딩용 청크는 앞뒤가 겹쳐 그대로 묶으면 같은 내용이 두 번 요약되므로 쓰지 않음)
+def _map_groups(text: str) -> list[str]:
+    spans = pdf_service.iter_chunk_spans(text, SUMMARY_MAP_GROUP_CHARS, 0, count_tokens=len)
+    return [text[start:end] for start, end in spans]
+
+
+# [function] 부분 요약에 구간 번호를 붙여 하나의 reduce 입력으로 합침
+def _number_partials(partials: list[str]) -> str:
+    return "\n\n".join(f"[구간 {idx + 1}]\n{partial.strip()}" for idx, partial in enumerate(partials))
+
+
+# [function] map-reduce 최종 프롬프트 - 전체 구간을 부분 요약한 뒤 통합 요청 프롬프트 생성
+async def _build_reduce_prompt(text: str) -> str:
+    partials = await _map_summaries(await asyncio.to_thread(_map_groups, text))
+
+    # [reduce] 번호 붙인 부분 요약이 한 번에 넣을 수 있는 길이를 넘으면 한 단계 더 요약 (잘라 내지 않음)
+    numbered = _number_partials(partials)
+    while len(partials) > 1 and len(numbered) > SUMMARY_MAX_CHARS:
+        groups = _group_texts(partials, SUMMARY_MAP_GROUP_CHARS)
+        # [merge] 부분 요약이 커서 하나도 묶이지 않으면 이웃한 두 개씩 묶음 (단계마다 개수가 줄어 반드시 끝남)
+        if len(groups) == len(partials):
+            groups = ["\n".join(partials[idx:idx + 2]) for idx in range(0, len(partials), 2)]
+        partials = await _map_summaries(groups)
+        numbered = _number_partials(partials)
+
+    if len(numbered) > SUMMARY_MAX_CHARS:
+        raise GeminiServiceError("GEMINI_FAILED", f"SUMMARY_REDUCE_TOO_LONG chars={len(numbered)}")
+    return SUMMARIZE_REDUCE_PROMPT.format(text=numbered)
+
+
+# [function] 요약 방식 결정
+def _use_map_reduce(text: str) -> bool:
+    if SUMMARY_MODE == "map_reduce":
+        return True
+    if SUMMARY_MODE == "truncate":
+        return False
+    return len(text) > SUMMARY_MAX_CHARS
+
+
+# [function] 텍스트를 받아 AI 요약 결과 반환 - 긴 문서는 구간 단위 map-reduce 로 전체 내용 반영
+# on_delta 가 있으면 최종 요약을 streamGenerateContent 로 받아 (필드, 부분 텍스트)를 생성되는 대로 전달
+async def summarize(
+    text: str,
+    on_delta: Callable[[str, str], None] | None = None,
+) -> dict:
     if not text or not text.strip():
-        raise GeminiServiceError("GEMINI_FAILED", "EMPTY_EMBED_INPUT")
+        raise GeminiServiceError("GEMINI_FAILED", "EMPTY_SUMMARY_INPUT")
 
-    payload = {"content": {"parts": [{"text": text}]}}
-    response = await asyncio.to_thread(
-        _post_gemini,
-        f"models/{GEMINI_MODEL_EMBEDDING}:embedContent",
-        payload,
+    # [cache] 같은 원문/모델/요약 방식 조합이면 이전 요약 재사용
+    map_reduce = _use_map_reduce(text)
+    mode_key = f"map_reduce:{SUMMARY_MAP_GROUP_CHARS}" if map_reduce else "truncate"
+    cache_key = (
+        f"{GEMINI_MODEL_SUMMARY}:{SUMMARY_MAX_CHARS}:{mode_key}:{cache_service.sha256_hex(text)}"
     )
+    cached = await cache_service.get_async(cache_service.summary_cache, cache_key)
+    if cached is not None:
+        if on_delta is not None:
+            on_delta("title", cached["title"])
+            on_delta("summary", cached["summary"])
+        return dict(cached)
+
+    if map_reduce:
+        prompt_text = await _build_reduce_prompt(text)
+    else:
+        prompt_text = SUMMARIZE_PROMPT.format(text=text[:SUMMARY_MAX_CHARS])
+
+    if on_delta is None:
+        raw = await _generate(prompt_text)
+    else:
+        parser = SummaryStreamParser()
+
+        def forward(piece: str) -> None:
+            for field, delta in parser.feed(piece):
+                on_delta(field, delta)
+
+        raw = await _stream_generate(prompt_text, forward)
 
+    # [parse] 스트리밍 여부와 관계없이 전체 응답으로 최종 결과를 검증/저장
+    result = _parse_summary_json(raw)
+    await cache_service.set_async(cache_service.summary_cache, cache_key, result)
+    return dict(result)
+
+
+# [function] 질문과 검색된 발췌문(번호 순서)으로 답변 생성 - generateContent 1회
+async def answer_question(question: str, contexts: list[str]) -> str:
+    if not question or not question.strip() or not contexts:
+        raise GeminiServiceError("GEMINI_FAILED", "EMPTY_ANSWER_INPUT")
+
+    context_text = "\n\n".join(f"[{idx}] {context}" for idx, context in enumerate(contexts, start=1))
+    raw = await _generate(ANSWER_PROMPT.format(context=context_text, question=question.strip()))
+    answer = (raw or "").strip()
+    if not answer:
+        raise GeminiServiceError("GEMINI_FAILED", "EMPTY_ANSWER")
+    return answer
+
+
+# [function] 임베딩 응답에서 벡터 값 추출
+def _extract_embedding_values(embedding: dict, response: dict) -> list[float]:
     try:
-        values = response["embedding"]["values"]
+        values = embedding["values"]
     except Exception as exc:
         raise GeminiServiceError("GEMINI_FAILED", f"INVALID_EMBED_RESPONSE: {response}") from exc
 
@@ -127,10 +613,81 @@ async def embed_text(text: str) -> list[float]:
     return values
 
 
-# [function] 청크 리스트 임베딩 생성
+# [function] 단일 텍스트 임베딩 생성
+async def embed_text(text: str) -> list[float]:
+    if not text or not text.strip():
+        raise GeminiServiceError("GEMINI_FAILED", "EMPTY_EMBED_INPUT")
+
+    payload = {"content": {"parts": [{"text": text}]}}
+    response = await _post_gemini(
+        f"models/{GEMINI_MODEL_EMBEDDING}:embedContent",
+        payload,
+    )
+
+    embedding = response.get("embedding") if isinstance(response, dict) else None
+    return _extract_embedding_values(embedding or {}, response)
+
+
+# [function] 청크 묶음 임베딩 생성 (batchEmbedContents 1회 호출)
+async def embed_batch(texts: list[str]) -> list[list[float]]:
+    if not texts:
+        return []
+    if any(not text or not text.strip() for text in texts):
+        raise GeminiServiceError("GEMINI_FAILED", "EMPTY_EMBED_INPUT")
+
+    model_name = f"models/{GEMINI_MODEL_EMBEDDING}"
+    payload = {
+        "requests": [
+            {"model": model_name, "content": {"parts": [{"text": text}]}}
+            for text in texts
+        ]
+    }
+    response = await _post_gemini(
+        f"{model_name}:batchEmbedContents",
+        payload,
+    )
+
+    embeddings = response.get("embeddings") if isinstance(response, dict) else None
+    if not isinstance(embeddings, list) or len(embeddings) != len(texts):
+        raise GeminiServiceError("GEMINI_FAILED", f"INVALID_BATCH_EMBED_RESPONSE: {response}")
+    return [_extract_embedding_values(embedding, response) for embedding in embeddings]
+
+
+# [function] 청크 리스트 임베딩 생성 - 캐시 미스 청크만 배치로 묶어 동시 요청, 결과는 청크 순서 유지
 async def embed_chunks(chunks: list[str]) -> list[list[float]]:
-    vectors = []
-    for chunk in chunks:
-        vector = await embed_text(chunk)
-        vectors.append(vector)
-    return vectors
+    if not chunks:
+        return []
+
+    # [cache] 문서 단위 캐시 - 청크 구성(원문 + 청킹 파라미터)과 모델이 같으면 그대로 재사용
+    chunk_hashes = [cache_service.sha256_hex(chunk) for chunk in chunks]
+    document_key = f"{GEMINI_MODEL_EMBEDDING}:{cache_service.sha256_hex(':'.join(chunk_hashes))}"
+    cached_vectors = await cache_service.get_async(cache_service.document_embedding_cache, document_key)
+    if cached_vectors is not None:
+        return list(cached_vectors)
+
+    # [cache] 청크 단위 캐시 - 다른 문서와 겹치는 청크는 API 호출 생략 (한 번에 조회)
+    vectors: list[list[float] | None] = await cache_service.get_many_async(
+        cache_service.chunk_embedding_cache,
+        [f"{GEMINI_MODEL_EMBEDDING}:{chunk_hash}" for chunk_hash in chunk_hashes],
+    )
+    missing_indexes = [idx for idx, vector in enumerate(vectors) if vector is None]
+
+    batches = [
+        missing_indexes[start:start + EMBED_BATCH_SIZE]
+        for start in range(0, len(missing_indexes), EMBED_BATCH_SIZE)
+    ]
+    semaphore = asyncio.Semaphore(EMBED_CONCURRENCY)
+
+    async def run_batch(batch_indexes: list[int]) -> None:
+        async with semaphore:
+            batch_vectors = await embed_batch([chunks[idx] for idx in batch_indexes])
+        for idx, vector in zip(batch_indexes, batch_vectors):
+            vectors[idx] = vector
+        await cache_service.set_many_async(
+            cache_service.chunk_embedding_cache,
+            [(f"{GEMINI_MODEL_EMBEDDING}:{chunk_hashes[idx]}", vectors[idx]) for idx in batch_indexes],
+        )
+
+    await asyncio.gather(*(run_batch(batch) for batch in batches))
+    await cache_service.set_async(cache_service.document_embedding_cache, document_key, list(vectors))
+    return list(vectors)
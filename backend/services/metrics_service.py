@@ -0,0 +1,218 @@
+# [Service] 파이프라인 계측 - 단계별 소요 시간/Gemini 호출/처리량 Prometheus 메트릭
+import os
+import time
+from contextlib import contextmanager
+from services import cache_service, rate_limit_service
+from settings import get_settings
+
+try:
+    from prometheus_client import (
+        CONTENT_TYPE_LATEST,
+        CollectorRegistry,
+        Counter,
+        Gauge,
+        Histogram,
+        REGISTRY,
+        generate_latest,
+        multiprocess,
+    )
+    from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+except ImportError:
+    CONTENT_TYPE_LATEST = "text/plain; charset=utf-8"
+    CollectorRegistry = Counter = Gauge = Histogram = REGISTRY = generate_latest = multiprocess = None
+    CounterMetricFamily = GaugeMetricFamily = None
+
+# [settings] 메트릭 수집 여부 (prometheus_client 가 없으면 항상 비활성)
+settings = get_settings()
+METRICS_ENABLED = settings.metrics_enabled and Counter is not None
+# [settings] 멀티 워커 모드 - PROMETHEUS_MULTIPROC_DIR 가 있으면 워커마다 메트릭을 파일로 기록하고 /metrics 에서 합산
+# (prometheus_client 가 임포트 시점에 같은 환경변수를 읽으므로 serve.py 가 워커 기동 전에 지정)
+PROMETHEUS_MULTIPROC_DIR = settings.prometheus_multiproc_dir
+MULTIPROCESS = METRICS_ENABLED and bool(PROMETHEUS_MULTIPROC_DIR)
+
+# [const] 단계별 소요 시간 히스토그램 구간(초) - PDF 파싱(ms)부터 긴 문서 요약(수십 초)까지
+STAGE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+# [const] 서킷 브레이커 상태 -> 게이지 값
+BREAKER_STATE_VALUES = {"closed": 0, "half_open": 1, "open": 2}
+
+
+# [class] prometheus_client 가 없거나 비활성일 때 쓰는 빈 메트릭
+class _NoopMetric:
+    def labels(self, *args, **kwargs):
+        return self
+
+    def observe(self, value: float) -> None:
+        return None
+
+    def inc(self, amount: float = 1) -> None:
+        return None
+
+    def dec(self, amount: float = 1) -> None:
+        return None
+
+
+# [function] 메트릭 생성 (비활성이면 빈 메트릭)
+def _metric(factory, name: str, documentation: str, labelnames=(), **kwargs):
+    if not METRICS_ENABLED:
+        return _NoopMetric()
+    return factory(name, documentation, labelnames, **kwargs)
+
+
+# [metric] 파이프라인 단계별 소요 시간 (pdf_parse, ocr, extract, chunk, dedup, embed, summarize, save, document)
+STAGE_SECONDS = _metric(
+    Histogram,
+    "pipeline_stage_seconds",
+    "Time spent in each document pipeline stage",
+    ("stage",),
+    buckets=STAGE_BUCKETS,
+)
+# [metric] 처리 완료 문서 수 (status: COMPLETED | FAILED, error_code)
+DOCUMENTS_TOTAL = _metric(
+    Counter,
+    "pipeline_documents_total",
+    "Documents processed by the pipeline",
+    ("status", "error_code"),
+)
+# [metric] 추출 페이지 수 (source: text | ocr)
+PAGES_TOTAL = _metric(Counter, "pipeline_pages_total", "Pages extracted from PDFs", ("source",))
+# [metric] 생성 청크 수
+CHUNKS_TOTAL = _metric(Counter, "pipeline_chunks_total", "Chunks produced by the chunker")
+# [metric] 유사 중복으로 판정된 문서 수 / 재사용한 청크 임베딩 수
+NEAR_DUPLICATES_TOTAL = _metric(Counter, "pipeline_near_duplicates_total", "Documents matched to a near-duplicate")
+REUSED_EMBEDDINGS_TOTAL = _metric(
+    Counter,
+    "pipeline_reused_embeddings_total",
+    "Chunk embeddings reused from near-duplicate documents",
+)
+# [metric] 처리 중인 문서 수 (멀티 워커면 살아 있는 워커 합계)
+JOBS_IN_PROGRESS = _metric(
+    Gauge,
+    "pipeline_jobs_in_progress",
+    "Documents currently being processed",
+    multiprocess_mode="livesum",
+)
+
+# [metric] Gemini 호출 수/소요 시간/진행 중 호출 수 (시도 단위, status: HTTP 코드 또는 timeout 등)
+GEMINI_REQUESTS_TOTAL = _metric(
+    Counter,
+    "gemini_requests_total",
+    "Gemini API attempts by model, method and status",
+    ("model", "method", "status"),
+)
+GEMINI_REQUEST_SECONDS = _metric(
+    Histogram,
+    "gemini_request_seconds",
+    "Gemini API attempt latency",
+    ("model", "method"),
+    buckets=STAGE_BUCKETS,
+)
+GEMINI_IN_FLIGHT = _metric(
+    Gauge,
+    "gemini_requests_in_flight",
+    "Gemini API attempts currently in flight",
+    ("model",),
+    multiprocess_mode="livesum",
+)
+GEMINI_RETRIES_TOTAL = _metric(
+    Counter,
+    "gemini_retries_total",
+    "Gemini API retries by model and reason",
+    ("model", "reason"),
+)
+
+
+# [function] 단계 소요 시간 기록
+def observe_stage(stage: str, seconds: float) -> None:
+    STAGE_SECONDS.labels(stage).observe(seconds)
+
+
+# [function] 블록 실행 시간을 단계 소요 시간으로 기록
+@contextmanager
+def stage_timer(stage: str):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_stage(stage, time.perf_counter() - started)
+
+
+# [function] Gemini 호출 1회 결과 기록
+def record_gemini_request(model: str, method: str, status: str, seconds: float) -> None:
+    GEMINI_REQUESTS_TOTAL.labels(model, method, status).inc()
+    GEMINI_REQUEST_SECONDS.labels(model, method).observe(seconds)
+
+
+# [class] 요청 시점에 값을 읽어 오는 수집기 - 캐시 적중/실패, 작업 큐 길이, 서킷 브레이커 상태
+# 모두 /metrics 요청을 받은 워커 프로세스 하나의 값 (멀티 워커면 pid 레이블로 구분, 합산되지 않음)
+class _RuntimeCollector:
+    # [function] 등록 시 collect 를 미리 호출하지 않도록 빈 설명 반환 (job_service/DB 설정 임포트 지연)
+    def describe(self):
+        return []
+
+    def collect(self):
+        # [cache] 캐시별 적중/실패/제거 횟수와 크기
+        process = [str(os.getpid())] if MULTIPROCESS else []
+        process_labels = ["pid"] if MULTIPROCESS else []
+
+        # [cache] 캐시별 적중/실패/제거 횟수와 크기 (횟수는 프로세스별, 공유 캐시 크기는 모든 워커 합계)
+        hits = CounterMetricFamily("cache_hits", "Cache hits (per process)", labels=["cache", *process_labels])
+        misses = CounterMetricFamily("cache_misses", "Cache misses (per process)", labels=["cache", *process_labels])
+        evictions = CounterMetricFamily(
+            "cache_evictions",
+            "Cache evictions (per process)",
+            labels=["cache", *process_labels],
+        )
+        size = GaugeMetricFamily("cache_entries", "Cache entries", labels=["cache", *process_labels])
+        for stats in cache_service.get_cache_stats():
+            hits.add_metric([stats["name"], *process], stats["hits"])
+            misses.add_metric([stats["name"], *process], stats["misses"])
+            evictions.add_metric([stats["name"], *process], stats["evictions"])
+            size.add_metric([stats["name"], *process], stats["size"])
+        yield from (hits, misses, evictions, size)
+
+        # [queue] 대기 작업 수와 워커 수 (job_service 는 이 모듈을 임포트하므로 수집 시점에 임포트)
+        from services import job_service
+
+        queue_size = GaugeMetricFamily(
+            "pipeline_queue_size",
+            "Documents waiting in the job queue (per process)",
+            labels=process_labels,
+        )
+        queue_size.add_metric(process, job_service.queue_size())
+        workers = GaugeMetricFamily("pipeline_workers", "Pipeline worker tasks (per process)", labels=process_labels)
+        workers.add_metric(process, job_service.worker_count())
+        yield from (queue_size, workers)
+
+        # [circuit] 모델별 서킷 브레이커 상태 (0 closed, 1 half_open, 2 open) - 브레이커는 워커마다 따로 동작
+        breaker_state = GaugeMetricFamily(
+            "gemini_circuit_state",
+            "Gemini circuit breaker state (0 closed, 1 half_open, 2 open, per process)",
+            labels=["model", *process_labels],
+        )
+        for stats in rate_limit_service.get_stats()["breakers"]:
+            breaker_state.add_metric([stats["name"], *process], BREAKER_STATE_VALUES.get(stats["state"], 0))
+        yield breaker_state
+
+
+# [registry] 노출할 수집기 - 멀티 워커면 모든 워커의 메트릭 파일을 합산하는 별도 레지스트리 + 이 프로세스의 런타임 값
+_registry = None
+if MULTIPROCESS:
+    _registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(_registry)
+    _registry.register(_RuntimeCollector())
+elif METRICS_ENABLED:
+    _registry = REGISTRY
+    REGISTRY.register(_RuntimeCollector())
+
+
+# [function] 워커 종료 시 이 프로세스의 livesum 게이지(처리 중 문서/진행 중 Gemini 호출)를 합계에서 제외
+def mark_process_dead() -> None:
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(os.getpid())
+
+
+# [function] Prometheus 텍스트 형식 메트릭 - (본문, Content-Type), 비활성이면 None
+def render_latest() -> tuple[bytes, str] | None:
+    if _registry is None:
+        return None
+    return generate_latest(_registry), CONTENT_TYPE_LATEST
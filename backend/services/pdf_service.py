@@ -1,21 +1,54 @@
 # [Service] PDF 텍스트 추출 로직
+import asyncio
+import importlib.util
+import io
+import logging
+import mmap
 import os
-import PyPDF2
-from io import BytesIO
-from typing import List
+import re
+import threading
+from bisect import bisect_right
+from collections import deque
+from functools import lru_cache
+from typing import TYPE_CHECKING, List
+from services import cache_service, metrics_service
+from settings import get_settings
 
-try:
-    import pytesseract
-    from pdf2image import convert_from_bytes
-except ImportError:
-    pytesseract = None
-    convert_from_bytes = None
+# [import] PyPDF2/pytesseract/pdf2image/프로세스 풀은 처음 쓰는 함수 안에서 import (앱/스크립트 기동 시간 단축)
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# [settings] OCR 설정
+settings = get_settings()
+OCR_ENABLED = settings.ocr_enabled
+OCR_LANG = settings.ocr_lang
+OCR_DPI = settings.ocr_dpi
+# [settings] 페이지 단위 OCR 설정 - 텍스트 레이어가 이 길이 미만인 페이지만 OCR, 워커 프로세스 수, 한 번에 래스터화할 페이지 수
+OCR_PAGE_MIN_TEXT_LENGTH = settings.ocr_page_min_text_length
+OCR_WORKERS = settings.ocr_workers
+OCR_WINDOW_PAGES = settings.ocr_window_pages
+
+# [settings] 업로드 스트리밍 시 한 번에 읽어 디스크에 기록할 크기
+UPLOAD_CHUNK_BYTES = settings.upload_chunk_bytes
+
+# [settings] 청크 토큰 수 추정 - 토큰 1개에 해당하는 평균 글자 수 (ASCII / 한글 등 그 외 문자)
+CHUNK_ASCII_CHARS_PER_TOKEN = settings.chunk_ascii_chars_per_token
+CHUNK_NON_ASCII_CHARS_PER_TOKEN = settings.chunk_non_ascii_chars_per_token
 
-# [env] OCR 설정
-OCR_ENABLED = os.getenv("OCR_ENABLED", "true").lower() == "true"
-OCR_LANG = os.getenv("OCR_LANG", "kor+eng")
-OCR_DPI = int(os.getenv("OCR_DPI", "200"))
-OCR_MIN_TEXT_LENGTH = int(os.getenv("OCR_MIN_TEXT_LENGTH", "300"))
+# [const] 페이지 사이 구분자 - 원문 텍스트에서 페이지 경계를 유지
+PAGE_SEPARATOR = "\n"
+# [const] 문장 끝 - 종결 부호(+닫는 따옴표/괄호) 뒤에 공백이 오거나 문단(줄바꿈)이 끝나는 위치 (3.14 같은 소수점은 제외)
+_SENTENCE_END_PATTERN = re.compile(r"[.!?…。！？]+[\"'”’)\]]*(?:[ \t]*\n+|(?=\s|$))|\n+")
+_WORD_PATTERN = re.compile(r"\S+")
+_NON_SPACE_PATTERN = re.compile(r"\S")
+# [const] 문단이 끝날 때 청크를 먼저 자르는 최소 비율 (겹침을 뺀 새 내용 max_tokens - overlap_tokens 대비)
+CHUNK_PARAGRAPH_MIN_FILL = 0.6
+
+# [state] OCR 프로세스 풀 (최초 OCR 시 생성)
+_ocr_executor: "ProcessPoolExecutor | None" = None
+_ocr_executor_lock = threading.Lock()
 
 
 # [function] 공백 정규화
@@ -23,86 +56,417 @@ def _normalize_text(text: str) -> str:
     return " ".join((text or "").split())
 
 
-# [function] OCR 기반 텍스트 추출
-def _extract_text_with_ocr(file_bytes: bytes) -> str:
-    if not OCR_ENABLED:
-        return ""
-    if pytesseract is None or convert_from_bytes is None:
-        return ""
+# [function] OCR 라이브러리(pytesseract, pdf2image) 설치 여부 - import 하지 않고 확인
+@lru_cache(maxsize=1)
+def _ocr_libraries_installed() -> bool:
+    return all(importlib.util.find_spec(name) is not None for name in ("pytesseract", "pdf2image"))
+
+
+# [function] OCR 프로세스 풀 반환 (최초 호출 시 생성)
+def _get_ocr_executor() -> "ProcessPoolExecutor":
+    global _ocr_executor
+    with _ocr_executor_lock:
+        if _ocr_executor is None:
+            from concurrent.futures import ProcessPoolExecutor
+
+            _ocr_executor = ProcessPoolExecutor(max_workers=OCR_WORKERS)
+        return _ocr_executor
+
 
-    images = convert_from_bytes(file_bytes, dpi=OCR_DPI)
-    ocr_texts = []
+# [function] 서버 종료 시 OCR 프로세스 풀 정리
+def shutdown_ocr_executor() -> None:
+    global _ocr_executor
+    with _ocr_executor_lock:
+        if _ocr_executor is not None:
+            _ocr_executor.shutdown(wait=False, cancel_futures=True)
+            _ocr_executor = None
+
+
+# [function] 연속된 페이지 번호를 최대 OCR_WINDOW_PAGES 크기의 (시작, 끝) 구간으로 묶기
+def _page_windows(page_numbers: list[int], window_size: int) -> list[tuple[int, int]]:
+    windows = []
+    for page_number in sorted(page_numbers):
+        if windows:
+            first, last = windows[-1]
+            if page_number == last + 1 and last - first + 1 < window_size:
+                windows[-1] = (first, page_number)
+                continue
+        windows.append((page_number, page_number))
+    return windows
+
+
+# [function] 페이지 구간 OCR (워커 프로세스에서 실행) - 해당 구간만 래스터화해 메모리 사용량 제한
+def _ocr_page_window(
+    pdf_path: str,
+    first_page: int,
+    last_page: int,
+    dpi: int,
+    lang: str,
+) -> list[str]:
+    import pytesseract
+    from pdf2image import convert_from_path
+
+    images = convert_from_path(pdf_path, dpi=dpi, first_page=first_page, last_page=last_page)
+    texts = []
     for image in images:
-        text = pytesseract.image_to_string(image, lang=OCR_LANG)
-        ocr_texts.append(text)
-    return _normalize_text("\n".join(ocr_texts))
+        texts.append(pytesseract.image_to_string(image, lang=lang))
+        image.close()
+    return texts
+
+
+# [function] 지정 페이지만 OCR - 페이지 구간을 프로세스 풀에 분산 (페이지 번호는 1부터)
+def _extract_pages_with_ocr(pdf_path: str, page_numbers: list[int]) -> dict[int, str]:
+    if not OCR_ENABLED or not page_numbers:
+        return {}
+    if not _ocr_libraries_installed():
+        return {}
+
+    windows = _page_windows(page_numbers, OCR_WINDOW_PAGES)
+    executor = _get_ocr_executor()
+    futures = [
+        executor.submit(_ocr_page_window, pdf_path, first, last, OCR_DPI, OCR_LANG)
+        for first, last in windows
+    ]
+
+    ocr_pages = {}
+    for (first, last), future in zip(windows, futures):
+        # [fallback] OCR 실패 구간은 텍스트 레이어 결과를 그대로 사용
+        try:
+            texts = future.result()
+        except Exception:
+            logger.warning("OCR failed for pages=%s-%s", first, last, exc_info=True)
+            continue
+        for offset, text in enumerate(texts):
+            ocr_pages[first + offset] = _normalize_text(text)
+    return ocr_pages
 
 
-# [function] PDF 파일에서 텍스트 추출 후 반환
-async def extract_text(file, max_file_size_bytes: int | None = None) -> str:
+# [function] PDF 페이지별 텍스트 추출 (블로킹) - 페이지마다 텍스트 레이어/OCR 중 하나를 선택
+def _parse_pdf_pages(pdf_buffer: mmap.mmap, pdf_path: str) -> list[dict]:
+    import PyPDF2
+
+    # [parse] 페이지별 텍스트 레이어 추출 - 메모리 맵 파일을 그대로 읽어 복사본을 만들지 않음
+    try:
+        with metrics_service.stage_timer("pdf_parse"):
+            reader = PyPDF2.PdfReader(pdf_buffer)
+            pages_text = []
+            for page in reader.pages:
+                page_text = page.extract_text() or ""
+                pages_text.append(_normalize_text(page_text))
+    except Exception as exc:
+        raise ValueError("PDF_PARSE_FAILED") from exc
+
+    # [hybrid] 텍스트 레이어가 빈약한 페이지만 OCR 보조 추출
+    weak_pages = [
+        idx + 1
+        for idx, page_text in enumerate(pages_text)
+        if len(page_text) < OCR_PAGE_MIN_TEXT_LENGTH
+    ]
+    if weak_pages:
+        with metrics_service.stage_timer("ocr"):
+            ocr_pages = _extract_pages_with_ocr(pdf_path, weak_pages)
+    else:
+        ocr_pages = {}
+
+    pages = []
+    for idx, page_text in enumerate(pages_text):
+        page_number = idx + 1
+        source = "text"
+        ocr_text = ocr_pages.get(page_number, "")
+        if len(ocr_text) > len(page_text):
+            page_text = ocr_text
+            source = "ocr"
+        if page_text:
+            pages.append({"page": page_number, "text": page_text, "source": source})
+
+    if not pages:
+        raise ValueError("PDF_PARSE_FAILED")
+    return pages
+
+
+# [function] 추출 결과 캐시 키 - 파일 해시 + 추출 결과에 영향을 주는 OCR 설정
+def _extraction_cache_key(pdf_buffer: mmap.mmap) -> str:
+    ocr_settings = (
+        f"{OCR_ENABLED}:{OCR_LANG}:{OCR_DPI}:{OCR_PAGE_MIN_TEXT_LENGTH}"
+    )
+    return f"{cache_service.sha256_hex(pdf_buffer)}:{ocr_settings}"
+
+
+# [function] 캐시 확인 후 PDF 페이지별 텍스트 추출 (블로킹)
+def _extract_pages_cached(pdf_buffer: mmap.mmap, pdf_path: str) -> list[dict]:
+    cache_key = _extraction_cache_key(pdf_buffer)
+    cached = cache_service.extraction_cache.get(cache_key)
+    if cached is not None:
+        return [dict(page) for page in cached]
+
+    pages = _parse_pdf_pages(pdf_buffer, pdf_path)
+    cache_service.extraction_cache.set(cache_key, pages)
+    return [dict(page) for page in pages]
+
+
+# [function] 업로드 파일을 청크 단위로 UPLOAD_DIR 에 기록 - 파일별 크기 제한 검사 (요청 전체 크기는 request_limit_service 가 파싱 전에 제한)
+async def save_upload(file, dest_path: str, max_file_size_bytes: int | None = None) -> None:
     # [validation] 파일 기본 검증
     if not file or not file.filename:
         raise ValueError("INVALID_FILE")
     if not file.filename.lower().endswith(".pdf"):
         raise ValueError("INVALID_FILE")
-
-    # [read] 업로드 파일 바이트 읽기
-    file_bytes = await file.read()
-    if not file_bytes:
-        raise ValueError("INVALID_FILE")
-    if max_file_size_bytes is not None and len(file_bytes) > max_file_size_bytes:
+    # [validation] 크기를 미리 알 수 있으면 읽기 전에 거절
+    declared_size = getattr(file, "size", None)
+    if max_file_size_bytes is not None and declared_size is not None and declared_size > max_file_size_bytes:
         raise ValueError("INVALID_FILE")
 
-    # [parse] 페이지별 텍스트 추출
+    # [stream] 업로드 본문을 UPLOAD_CHUNK_BYTES 단위로 읽어 바로 기록
+    total_size = 0
     try:
-        reader = PyPDF2.PdfReader(BytesIO(file_bytes))
-        pages_text = []
-        for page in reader.pages:
-            page_text = page.extract_text() or ""
-            pages_text.append(page_text)
-    except Exception as exc:
-        raise ValueError("PDF_PARSE_FAILED") from exc
+        with open(dest_path, "wb") as fp:
+            while True:
+                chunk = await file.read(UPLOAD_CHUNK_BYTES)
+                if not chunk:
+                    break
+                total_size += len(chunk)
+                if max_file_size_bytes is not None and total_size > max_file_size_bytes:
+                    raise ValueError("INVALID_FILE")
+                await asyncio.to_thread(fp.write, chunk)
+        if total_size == 0:
+            raise ValueError("INVALID_FILE")
+    except Exception:
+        try:
+            os.remove(dest_path)
+        except FileNotFoundError:
+            pass
+        raise
 
-    # [normalize] 1차(PyPDF2) 텍스트 정리
-    joined_text = "\n".join(pages_text)
-    normalized = _normalize_text(joined_text)
 
-    # [fallback] 텍스트가 부족하면 OCR 보조 추출
-    if len(normalized) < OCR_MIN_TEXT_LENGTH:
-        ocr_text = _extract_text_with_ocr(file_bytes)
-        if len(ocr_text) > len(normalized):
-            normalized = ocr_text
+# [function] 서버 시작 예열 (블로킹) - PyPDF2 파싱/텍스트 추출 경로를 한 번 실행하고 tesseract 실행 파일 확인, 필요하면 OCR 프로세스 풀 기동
+def warm_up(start_ocr_pool: bool = False) -> dict:
+    import PyPDF2
 
-    if not normalized:
-        raise ValueError("PDF_PARSE_FAILED")
-    return normalized
+    writer = PyPDF2.PdfWriter()
+    writer.add_blank_page(width=72, height=72)
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    for page in PyPDF2.PdfReader(io.BytesIO(buffer.getvalue())).pages:
+        page.extract_text()
 
+    ocr_available = False
+    if OCR_ENABLED and _ocr_libraries_installed():
+        import pytesseract
 
-# [function] 원문을 청크 단위로 분할
+        try:
+            pytesseract.get_tesseract_version()
+            ocr_available = True
+        except Exception:
+            logger.warning("tesseract is not available; scanned pages will not be OCR'd")
+    if ocr_available and start_ocr_pool:
+        list(_get_ocr_executor().map(abs, range(OCR_WORKERS)))
+    return {"ocr_available": ocr_available}
+
+
+# [function] 파일을 메모리 맵으로 연 뒤 캐시 확인 및 페이지별 텍스트 추출 (블로킹)
+def _extract_pages_from_path(path: str) -> list[dict]:
+    try:
+        fp = open(path, "rb")
+    except OSError as exc:
+        raise ValueError("INVALID_FILE") from exc
+
+    with fp:
+        try:
+            pdf_buffer = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as exc:
+            # [validation] 빈 파일은 메모리 맵을 만들 수 없음
+            raise ValueError("INVALID_FILE") from exc
+        with pdf_buffer:
+            return _extract_pages_cached(pdf_buffer, path)
+
+
+# [function] 저장된 PDF 파일에서 페이지별 텍스트 추출 후 반환 ({"page", "text", "source"} 목록)
+async def extract_pages(path: str) -> list[dict]:
+    # [parse] 파일 읽기/해시 계산/PyPDF2/OCR은 CPU·블로킹 작업이므로 스레드에서 실행
+    return await asyncio.to_thread(_extract_pages_from_path, path)
+
+
+# [function] 페이지 목록을 원문 텍스트로 결합
+def join_pages(pages: list[dict]) -> str:
+    return PAGE_SEPARATOR.join(page["text"] for page in pages)
+
+
+# [function] 저장된 PDF 파일에서 텍스트 추출 후 반환
+async def extract_text(path: str) -> str:
+    return join_pages(await extract_pages(path))
+
+
+# [function] 텍스트 토큰 수 추정 - ASCII 는 CHUNK_ASCII_CHARS_PER_TOKEN 자, 한글 등 그 외 문자는 CHUNK_NON_ASCII_CHARS_PER_TOKEN 자당 1토큰
+# 조각별 값을 더하면 전체 값과 같도록(가산적) 소수로 반환하고, 공백은 앞 토큰에 붙는 것으로 보고 세지 않음
+def estimate_tokens(text: str) -> float:
+    if text.isascii():
+        non_ascii = 0
+    else:
+        # [count] UTF-8 추가 바이트 수로 비ASCII 문자 수 근사 (한글/한자는 정확), 문자 단위 루프 없이 C 수준에서 계산
+        non_ascii = (len(text.encode("utf-8")) - len(text)) // 2
+    spaces = text.count(" ") + text.count("\n")
+    ascii_chars = max(0, len(text) - non_ascii - spaces)
+    return ascii_chars / CHUNK_ASCII_CHARS_PER_TOKEN + non_ascii / CHUNK_NON_ASCII_CHARS_PER_TOKEN
+
+
+# [function] 청킹 파라미터 검증
+def _validate_chunk_params(max_tokens: int, overlap_tokens: int) -> None:
+    if max_tokens <= 0:
+        raise ValueError("INVALID_CHUNK_SIZE")
+    if overlap_tokens < 0 or overlap_tokens >= max_tokens:
+        raise ValueError("INVALID_CHUNK_OVERLAP")
+
+
+# [function] 공백을 제외한 (시작, 끝) 범위 - 문자열 복사 없이 오프셋만 이동
+def _trim_span(text: str, start: int, end: int) -> tuple[int, int]:
+    match = _NON_SPACE_PATTERN.search(text, start, end)
+    if match is None:
+        return end, end
+    start = match.start()
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return start, end
+
+
+# [function] 한도를 넘는 긴 문장을 단어 경계에서 나눔 (단어 하나가 한도를 넘으면 글자 수로 자름)
+def _split_long_unit(text: str, start: int, end: int, max_tokens: int, count_tokens):
+    piece_start = None
+    piece_end = start
+    piece_tokens = 0.0
+    for word in _WORD_PATTERN.finditer(text, start, end):
+        word_tokens = count_tokens(word.group())
+        if word_tokens > max_tokens:
+            if piece_start is not None:
+                yield piece_start, piece_end, piece_tokens
+                piece_start = None
+            step = max(1, int(max_tokens * min(CHUNK_ASCII_CHARS_PER_TOKEN, CHUNK_NON_ASCII_CHARS_PER_TOKEN)))
+            for cut in range(word.start(), word.end(), step):
+                cut_end = min(cut + step, word.end())
+                yield cut, cut_end, count_tokens(text[cut:cut_end])
+            continue
+        if piece_start is not None and piece_tokens + word_tokens > max_tokens:
+            yield piece_start, piece_end, piece_tokens
+            piece_start = None
+        if piece_start is None:
+            piece_start = word.start()
+            piece_tokens = 0.0
+        piece_end = word.end()
+        piece_tokens += word_tokens
+    if piece_start is not None:
+        yield piece_start, piece_end, piece_tokens
+
+
+# [function] 문장 단위 (시작, 끝, 토큰 수, 문단 끝 여부) 생성 - 원문을 한 번만 훑음
+def _iter_sentence_units(text: str, max_tokens: int, count_tokens):
+    position = 0
+    text_length = len(text)
+    while position < text_length:
+        match = _SENTENCE_END_PATTERN.search(text, position)
+        boundary = match.end() if match else text_length
+        paragraph_end = match is not None and "\n" in match.group()
+        start, end = _trim_span(text, position, boundary)
+        position = boundary
+        if start >= end:
+            continue
+        tokens = count_tokens(text[start:end])
+        if tokens <= max_tokens:
+            yield start, end, tokens, paragraph_end
+            continue
+        # [long] 나눈 조각 중 마지막 조각에만 문단 끝 여부 유지
+        previous = None
+        for piece in _split_long_unit(text, start, end, max_tokens, count_tokens):
+            if previous is not None:
+                yield (*previous, False)
+            previous = piece
+        if previous is not None:
+            yield (*previous, paragraph_end)
+
+
+# [function] 토큰 한도 청크의 (시작, 끝) 오프셋 생성 - 문장/문단 경계에서만 자르고, 뒤쪽 문장들을 overlap_tokens 이내로 다음 청크에 겹침
+# 각 문장은 창에 한 번 들어가고 한 번 빠지므로 전체가 선형 시간이며, 청크 문자열은 호출 측에서 필요할 때만 잘라 만듦
+def iter_chunk_spans(
+    text: str,
+    max_tokens: int = 512,
+    overlap_tokens: int = 64,
+    count_tokens=None,
+):
+    _validate_chunk_params(max_tokens, overlap_tokens)
+    count_tokens = count_tokens or estimate_tokens
+    window: deque[tuple[int, int, float]] = deque()
+    window_tokens = 0.0
+    # [state] 마지막 청크 이후 새로 들어온 문장 수/토큰 수 - 겹침 문장만 남은 창은 청크로 내보내지 않음
+    fresh_units = 0
+    fresh_tokens = 0.0
+
+    for start, end, tokens, paragraph_end in _iter_sentence_units(text, max_tokens, count_tokens):
+        if window and window_tokens + tokens > max_tokens:
+            if fresh_units:
+                yield window[0][0], window[-1][1]
+                fresh_units, fresh_tokens = 0, 0.0
+            # [overlap] 겹칠 분량과 새 문장이 들어갈 자리만 남기고 앞 문장부터 제거
+            while window and (window_tokens > overlap_tokens or window_tokens + tokens > max_tokens):
+                window_tokens -= window.popleft()[2]
+        window.append((start, end, tokens))
+        window_tokens += tokens
+        fresh_units += 1
+        fresh_tokens += tokens
+
+        # [paragraph] 새 내용이 충분히 쌓였고 문단(페이지)이 끝나면 다음 문단 중간까지 끌고 가지 않고 여기서 자름
+        if paragraph_end and fresh_tokens >= (max_tokens - overlap_tokens) * CHUNK_PARAGRAPH_MIN_FILL:
+            yield window[0][0], window[-1][1]
+            fresh_units, fresh_tokens = 0, 0.0
+            # [progress] 최소 한 문장은 빼서 다음 청크의 시작이 항상 앞으로 이동
+            window_tokens -= window.popleft()[2]
+            while window and window_tokens > overlap_tokens:
+                window_tokens -= window.popleft()[2]
+        if not window:
+            window_tokens = 0.0
+
+    if fresh_units:
+        yield window[0][0], window[-1][1]
+
+
+# [function] 원문을 청크 단위로 분할 (문장 경계 + 토큰 한도 + 겹침)
 def split_text_into_chunks(
     text: str,
-    chunk_size: int = 1200,
-    overlap: int = 200,
+    max_tokens: int = 512,
+    overlap_tokens: int = 64,
 ) -> List[str]:
     # [validation] 파라미터 검증
     if not text or not text.strip():
         return []
-    if chunk_size <= 0:
-        raise ValueError("INVALID_CHUNK_SIZE")
-    if overlap < 0 or overlap >= chunk_size:
-        raise ValueError("INVALID_CHUNK_OVERLAP")
+    return [text[start:end] for start, end in iter_chunk_spans(text, max_tokens, overlap_tokens)]
 
-    # [chunking] 겹침(overlap) 포함 슬라이딩 윈도우 분할
-    chunks = []
-    start = 0
-    step = chunk_size - overlap
-    text_length = len(text)
 
-    while start < text_length:
-        end = min(start + chunk_size, text_length)
-        chunk = text[start:end].strip()
-        if chunk:
-            chunks.append(chunk)
-        start += step
+# [function] 페이지 목록을 청크 단위로 분할 - 청크마다 걸쳐 있는 페이지 범위 포함
+def split_pages_into_chunks(
+    pages: list[dict],
+    max_tokens: int = 512,
+    overlap_tokens: int = 64,
+) -> list[dict]:
+    # [validation] 파라미터 검증
+    text = join_pages(pages)
+    if not text.strip():
+        return []
+
+    # [offset] 결합 텍스트에서 각 페이지 시작 위치
+    page_offsets = []
+    offset = 0
+    for page in pages:
+        page_offsets.append(offset)
+        offset += len(page["text"]) + len(PAGE_SEPARATOR)
+
+    # [chunking] 공백을 제외한 청크 범위로 시작/끝 페이지 결정
+    chunks = []
+    for chunk_start, chunk_end in iter_chunk_spans(text, max_tokens, overlap_tokens):
+        first_page = pages[bisect_right(page_offsets, chunk_start) - 1]
+        last_page = pages[bisect_right(page_offsets, chunk_end - 1) - 1]
+        chunks.append(
+            {
+                "text": text[chunk_start:chunk_end],
+                "page_start": first_page["page"],
+                "page_end": last_page["page"],
+            }
+        )
 
     return chunks
@@ -0,0 +1,62 @@
+# [Service] 요청 단위 프로파일링 - PROFILING_ENABLED=true 일 때 ?profile=1 요청 하나를 pyinstrument 로 기록
+import logging
+import os
+import time
+import uuid
+from fastapi import Request
+from settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+# [settings] 프로파일링 설정 (운영에서는 끄고 필요할 때만 켬)
+settings = get_settings()
+PROFILING_ENABLED = settings.profiling_enabled
+PROFILE_DIR = settings.profile_dir
+PROFILE_INTERVAL = settings.profile_interval
+
+# [import] pyinstrument 는 프로파일링을 켠 경우에만 로딩 (없으면 프로파일링 없이 통과)
+Profiler = SpeedscopeRenderer = None
+if PROFILING_ENABLED:
+    try:
+        from pyinstrument import Profiler
+        from pyinstrument.renderers import SpeedscopeRenderer
+    except ImportError:
+        pass
+
+
+# [function] 프로파일 결과 파일 저장 - speedscope 는 플레임그래프 뷰어(speedscope.app)용 JSON, 그 외는 HTML
+def _write_profile(profiler, request: Request, output: str) -> str:
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    name = request.url.path.strip("/").replace("/", "_") or "root"
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    suffix = uuid.uuid4().hex[:6]
+    if output == "speedscope":
+        path = os.path.join(PROFILE_DIR, f"{stamp}-{name}-{suffix}.speedscope.json")
+        content = profiler.output(renderer=SpeedscopeRenderer())
+    else:
+        path = os.path.join(PROFILE_DIR, f"{stamp}-{name}-{suffix}.html")
+        content = profiler.output_html()
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(content)
+    return path
+
+
+# [middleware] ?profile=1 (HTML) 또는 ?profile=speedscope 요청만 프로파일링, 결과 경로는 X-Profile-Path 헤더로 반환
+# 스트리밍 응답은 본문 전송 전까지(핸들러 실행)만 기록되고, 스레드 풀/워커 프로세스 작업은 포함되지 않음
+async def profile_request(request: Request, call_next):
+    output = request.query_params.get("profile")
+    if not PROFILING_ENABLED or not output or Profiler is None:
+        return await call_next(request)
+
+    profiler = Profiler(interval=PROFILE_INTERVAL, async_mode="enabled")
+    profiler.start()
+    try:
+        response = await call_next(request)
+    finally:
+        profiler.stop()
+
+    try:
+        response.headers["X-Profile-Path"] = _write_profile(profiler, request, output)
+    except Exception:
+        logger.exception("Failed to write profile for path=%s", request.url.path)
+    return response
@@ -0,0 +1,220 @@
+# [Service] 저장된 청크 기반 질의응답 - BM25 + 임베딩 유사도 하이브리드 검색으로 고른 상위 청크만 Gemini 에 전달, 답변 캐시
+import asyncio
+import numpy as np
+from sqlalchemy import and_, or_, select
+from database import SessionLocal
+from models.summary import DocumentChunk, Summary
+from services import cache_service, llm_service, vector_service
+from services.bm25_service import bm25_index
+from settings import get_settings
+
+# [settings] 답변 청크 수, 검색기별 후보 수, BM25 가중치, 문맥/질문 길이 제한
+settings = get_settings()
+QA_TOP_K = settings.qa_top_k
+QA_MAX_TOP_K = settings.qa_max_top_k
+QA_CANDIDATE_K = settings.qa_candidate_k
+QA_BM25_WEIGHT = settings.qa_bm25_weight
+QA_MAX_CONTEXT_CHARS = settings.qa_max_context_chars
+QA_QUESTION_MAX_CHARS = settings.qa_question_max_chars
+
+# [const] 관련 청크가 없을 때 답변 (Gemini 호출 없음)
+NO_ANSWER = "제공된 문서에서 답을 찾을 수 없습니다."
+
+
+# [function] 질문 정규화 - 공백 정리 (캐시 키가 공백 차이로 갈리지 않도록)
+def normalize_question(question: str) -> str:
+    return " ".join((question or "").split())
+
+
+# [function] 질의 벡터와 청크 임베딩의 코사인 유사도 (차원이 다르면 0)
+def _cosine_scores(query_vector: list[float], embeddings: dict[tuple[int, int], object]) -> dict[tuple[int, int], float]:
+    if not embeddings:
+        return {}
+    query = np.asarray(query_vector, dtype=np.float32)
+    query_norm = float(np.linalg.norm(query)) or 1.0
+    scores = {}
+    for key, raw in embeddings.items():
+        vector = vector_service.decode_embedding(raw)
+        if vector.shape != query.shape:
+            scores[key] = 0.0
+            continue
+        scores[key] = float(vector @ query) / ((float(np.linalg.norm(vector)) or 1.0) * query_norm)
+    return scores
+
+
+# [function] 청크 키 목록 조건 ((document_id, chunk_index) 쌍)
+def _chunk_key_filter(keys):
+    return or_(
+        *(
+            and_(DocumentChunk.document_id == document_id, DocumentChunk.chunk_index == chunk_index)
+            for document_id, chunk_index in keys
+        )
+    )
+
+
+# [function] 하이브리드 점수 - BM25 는 후보 중 최고점 대비 비율, 임베딩은 코사인 유사도(음수는 0)를 QA_BM25_WEIGHT 로 가중 합산
+def fuse_scores(
+    bm25_scores: dict[tuple[int, int], float],
+    vector_scores: dict[tuple[int, int], float],
+    bm25_weight: float = QA_BM25_WEIGHT,
+) -> list[tuple[tuple[int, int], float, float, float]]:
+    max_bm25 = max(bm25_scores.values(), default=0.0)
+    ranked = []
+    for key in bm25_scores.keys() | vector_scores.keys():
+        bm25 = bm25_scores.get(key, 0.0)
+        vector = max(0.0, vector_scores.get(key, 0.0))
+        score = bm25_weight * (bm25 / max_bm25 if max_bm25 else 0.0) + (1.0 - bm25_weight) * vector
+        ranked.append((key, score, bm25, vector))
+    ranked.sort(key=lambda item: (-item[1], item[0]))
+    return ranked
+
+
+# [function] 하이브리드 검색 (블로킹) - 상위 청크의 본문/쪽 번호/문서 제목 포함, document_id 가 있으면 그 문서 안에서만
+def retrieve(
+    question: str,
+    query_vector: list[float],
+    top_k: int,
+    document_id: int | None = None,
+    bm25_weight: float = QA_BM25_WEIGHT,
+) -> list[dict]:
+    db = SessionLocal()
+    try:
+        if document_id is not None:
+            # [document] 문서 하나의 청크는 많지 않으므로 임베딩을 모두 읽어 정확히 비교
+            bm25_scores = {
+                (hit[0], hit[1]): hit[2]
+                for hit in bm25_index.search(question, QA_CANDIDATE_K, document_id=document_id)
+            }
+            rows = db.execute(
+                select(DocumentChunk.chunk_index, DocumentChunk.embedding).where(DocumentChunk.document_id == document_id)
+            ).all()
+            vector_scores = _cosine_scores(query_vector, {(document_id, row.chunk_index): row.embedding for row in rows})
+        else:
+            # [all] 임베딩 top-k 와 BM25 top-k 후보를 합치고, 한쪽에만 있는 후보는 나머지 점수를 채움
+            vector_scores = {
+                (hit[0], hit[1]): hit[2] for hit in vector_service.search_chunks(query_vector, QA_CANDIDATE_K)
+            }
+            bm25_scores = {
+                (hit[0], hit[1]): hit[2]
+                for hit in bm25_index.search(question, QA_CANDIDATE_K, extra_keys=set(vector_scores))
+            }
+            missing = [key for key in bm25_scores if key not in vector_scores]
+            if missing:
+                rows = db.execute(
+                    select(DocumentChunk.document_id, DocumentChunk.chunk_index, DocumentChunk.embedding)
+                    .where(_chunk_key_filter(missing))
+                ).all()
+                vector_scores.update(
+                    _cosine_scores(query_vector, {(row.document_id, row.chunk_index): row.embedding for row in rows})
+                )
+
+        ranked = fuse_scores(bm25_scores, vector_scores, bm25_weight)[:top_k]
+        if not ranked:
+            return []
+
+        # [load] 선택된 청크의 본문과 문서 제목만 조회
+        chunk_rows = db.execute(
+            select(
+                DocumentChunk.document_id,
+                DocumentChunk.chunk_index,
+                DocumentChunk.page_start,
+                DocumentChunk.page_end,
+                DocumentChunk.chunk_text,
+            ).where(_chunk_key_filter([key for key, *_ in ranked]))
+        ).all()
+        chunks_by_key = {(row.document_id, row.chunk_index): row for row in chunk_rows}
+        document_rows = db.execute(
+            select(Summary.id, Summary.summary_title, Summary.original_filename)
+            .where(Summary.id.in_({key[0] for key, *_ in ranked}))
+        ).all()
+        documents_by_id = {row.id: row for row in document_rows}
+    finally:
+        db.close()
+
+    results = []
+    for key, score, bm25, vector in ranked:
+        row = chunks_by_key.get(key)
+        document = documents_by_id.get(key[0])
+        if not row or not document:
+            continue
+        results.append(
+            {
+                "document_id": key[0],
+                "chunk_index": key[1],
+                "title": document.summary_title,
+                "filename": document.original_filename,
+                "page_start": row.page_start,
+                "page_end": row.page_end,
+                "text": row.chunk_text,
+                "score": score,
+                "bm25_score": bm25,
+                "vector_score": vector,
+            }
+        )
+    return results
+
+
+# [function] 답변 프롬프트 발췌문 - 순위 순으로 QA_MAX_CONTEXT_CHARS 안에서 채움 (첫 청크는 잘라서라도 포함)
+def build_contexts(chunks: list[dict], max_chars: int = QA_MAX_CONTEXT_CHARS) -> tuple[list[str], list[dict]]:
+    contexts, used = [], []
+    remaining = max_chars
+    for chunk in chunks:
+        pages = f"p.{chunk['page_start']}" if chunk["page_start"] == chunk["page_end"] else f"p.{chunk['page_start']}-{chunk['page_end']}"
+        header = f"({chunk['title'] or chunk['filename']}, {pages})\n"
+        text = chunk["text"]
+        if len(header) + len(text) > remaining:
+            if contexts:
+                break
+            text = text[:max(0, remaining - len(header))]
+        contexts.append(header + text)
+        used.append(chunk)
+        remaining -= len(header) + len(text)
+    return contexts, used
+
+
+# [function] 문서 답변 캐시 버전 - 요약이 끝난 문서의 수정 시각 (없으면 NOT_FOUND, 처리 중/실패면 NOT_READY)
+def _document_version(document_id: int) -> str:
+    db = SessionLocal()
+    try:
+        row = db.execute(select(Summary.status, Summary.updated_at).where(Summary.id == document_id)).first()
+    finally:
+        db.close()
+    if not row:
+        raise ValueError("NOT_FOUND")
+    if row.status != "COMPLETED":
+        raise ValueError("NOT_READY")
+    return row.updated_at.isoformat()
+
+
+# [function] 질문에 답변 - 캐시 확인 -> 질문 임베딩 -> 하이브리드 검색 -> 상위 청크로 Gemini 1회 호출
+# 잘못된 질문은 ValueError("INVALID_QUERY"), Gemini 실패는 GeminiServiceError
+async def answer(question: str, document_id: int | None = None, top_k: int | None = None) -> dict:
+    question = normalize_question(question)
+    if not question or len(question) > QA_QUESTION_MAX_CHARS:
+        raise ValueError("INVALID_QUERY")
+    top_k = min(top_k or QA_TOP_K, QA_MAX_TOP_K)
+
+    # [cache] 같은 질문/범위/버전이면 이전 답변 재사용 (문서는 수정 시각, 전체는 색인된 청크 수가 바뀌면 새로 답변)
+    if document_id is not None:
+        scope = f"document:{document_id}:{await asyncio.to_thread(_document_version, document_id)}"
+    else:
+        scope = f"all:{await asyncio.to_thread(bm25_index.size)}"
+    cache_key = (
+        f"{llm_service.GEMINI_MODEL_SUMMARY}:{QA_BM25_WEIGHT}:{top_k}:{QA_MAX_CONTEXT_CHARS}:{scope}:"
+        f"{cache_service.sha256_hex(question)}"
+    )
+    cached = await cache_service.get_async(cache_service.answer_cache, cache_key)
+    if cached is not None:
+        return {**cached, "cached": True}
+
+    query_vector = await llm_service.embed_text(question)
+    chunks = await asyncio.to_thread(retrieve, question, query_vector, top_k, document_id)
+    result = {"question": question, "document_id": document_id, "answer": NO_ANSWER, "sources": []}
+    if not chunks:
+        return {**result, "cached": False}
+
+    contexts, used = build_contexts(chunks)
+    result["answer"] = await llm_service.answer_question(question, contexts)
+    result["sources"] = used
+    await cache_service.set_async(cache_service.answer_cache, cache_key, result)
+    return {**result, "cached": False}
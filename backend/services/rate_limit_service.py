@@ -0,0 +1,290 @@
+# [Service] Gemini 호출 보호 - 모델별 토큰 버킷(RPM/TPM) 속도 제한과 서킷 브레이커
+import asyncio
+import threading
+import time
+from services import shared_state_service
+from settings import get_settings
+
+# [settings] 모델별 분당 요청 수(RPM) / 분당 토큰 수(TPM) 한도 (0 이면 제한 없음)
+settings = get_settings()
+GEMINI_SUMMARY_RPM = settings.gemini_summary_rpm
+GEMINI_SUMMARY_TPM = settings.gemini_summary_tpm
+GEMINI_EMBED_RPM = settings.gemini_embed_rpm
+GEMINI_EMBED_TPM = settings.gemini_embed_tpm
+# [settings] 서킷 브레이커 - 연속 실패 횟수 임계값, 차단 유지 시간(초)
+GEMINI_CIRCUIT_FAILURE_THRESHOLD = settings.gemini_circuit_failure_threshold
+GEMINI_CIRCUIT_RESET_SECONDS = settings.gemini_circuit_reset_seconds
+
+
+# [class] 토큰 버킷 - 분당 한도만큼 채워지고 초당 limit/60 씩 보충, 부족하면 대기 (예약 방식이라 먼저 온 요청부터 처리)
+class TokenBucket:
+    def __init__(self, limit_per_minute: int):
+        self.capacity = max(0, limit_per_minute)
+        self.rate = self.capacity / 60.0
+        self._tokens = float(self.capacity)
+        self._updated_at = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    # [function] 경과 시간만큼 토큰 보충 (잠금 보유 상태에서 호출)
+    def _refill_locked(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    # [function] 토큰 예약 - 대기해야 하는 시간(초) 반환
+    def reserve(self, amount: float) -> float:
+        if self.capacity == 0 or amount <= 0:
+            return 0.0
+        # [clamp] 한 번에 버킷 용량보다 많이 요구하면 용량만큼만 차감 (영원히 대기하지 않도록)
+        amount = min(amount, self.capacity)
+        with self._lock:
+            now = time.monotonic()
+            self._refill_locked(now)
+            self._tokens -= amount
+            wait = 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+            return max(wait, self._blocked_until - now)
+
+    # [function] 실제 사용량과 예약량 차이 정산 (양수면 추가 차감, 음수면 반환)
+    def adjust(self, delta: float) -> None:
+        if self.capacity == 0 or delta == 0:
+            return
+        with self._lock:
+            self._refill_locked(time.monotonic())
+            self._tokens = min(self.capacity, self._tokens - delta)
+
+    # [function] 지정 시간 동안 새 예약을 막음 (429/Retry-After 수신 시)
+    def pause(self, seconds: float) -> None:
+        if self.capacity == 0 or seconds <= 0:
+            return
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+    # [function] 현재 상태 반환
+    def stats(self) -> dict:
+        with self._lock:
+            self._refill_locked(time.monotonic())
+            return {"limit_per_minute": self.capacity, "available": round(self._tokens, 1)}
+
+
+# [class] 프로세스 간 공유 토큰 버킷 - SHARED_STATE_PATH SQLite 파일의 행 하나를 모든 워커가 함께 차감 (TokenBucket 과 같은 인터페이스)
+class SharedTokenBucket:
+    def __init__(self, name: str, limit_per_minute: int):
+        self.name = name
+        self.capacity = max(0, limit_per_minute)
+        self.rate = self.capacity / 60.0
+
+    # [function] 버킷 행 조회 + 경과 시간만큼 보충 -> (토큰, 차단 종료 시각) (트랜잭션 안에서 호출, 여러 프로세스가 공유하므로 벽시계 기준)
+    def _refill(self, conn, now: float) -> tuple[float, float]:
+        row = conn.execute(
+            "SELECT tokens, updated_at, blocked_until FROM token_buckets WHERE name = ?",
+            (self.name,),
+        ).fetchone()
+        if row is None:
+            return float(self.capacity), 0.0
+        tokens, updated_at, blocked_until = row
+        return min(self.capacity, tokens + max(0.0, now - updated_at) * self.rate), blocked_until
+
+    # [function] 버킷 행 저장 (트랜잭션 안에서 호출)
+    def _store(self, conn, tokens: float, now: float, blocked_until: float) -> None:
+        conn.execute(
+            "INSERT OR REPLACE INTO token_buckets (name, tokens, updated_at, blocked_until) VALUES (?, ?, ?, ?)",
+            (self.name, tokens, now, blocked_until),
+        )
+
+    # [function] 토큰 예약 - 대기해야 하는 시간(초) 반환
+    def reserve(self, amount: float) -> float:
+        if self.capacity == 0 or amount <= 0:
+            return 0.0
+        amount = min(amount, self.capacity)
+        with shared_state_service.transaction() as conn:
+            now = time.time()
+            tokens, blocked_until = self._refill(conn, now)
+            tokens -= amount
+            self._store(conn, tokens, now, blocked_until)
+        wait = 0.0 if tokens >= 0 else -tokens / self.rate
+        return max(wait, blocked_until - now)
+
+    # [function] 실제 사용량과 예약량 차이 정산 (양수면 추가 차감, 음수면 반환)
+    def adjust(self, delta: float) -> None:
+        if self.capacity == 0 or delta == 0:
+            return
+        with shared_state_service.transaction() as conn:
+            now = time.time()
+            tokens, blocked_until = self._refill(conn, now)
+            self._store(conn, min(self.capacity, tokens - delta), now, blocked_until)
+
+    # [function] 지정 시간 동안 모든 워커의 새 예약을 막음 (429/Retry-After 수신 시)
+    def pause(self, seconds: float) -> None:
+        if self.capacity == 0 or seconds <= 0:
+            return
+        with shared_state_service.transaction() as conn:
+            now = time.time()
+            tokens, blocked_until = self._refill(conn, now)
+            self._store(conn, tokens, now, max(blocked_until, now + seconds))
+
+    # [function] 현재 상태 반환
+    def stats(self) -> dict:
+        tokens, _ = self._refill(shared_state_service.connection(), time.time())
+        return {"limit_per_minute": self.capacity, "available": round(tokens, 1)}
+
+
+# [function] 토큰 버킷 생성 - SHARED_STATE_BACKEND=sqlite 면 프로세스 간 공유 버킷
+def _create_bucket(name: str, limit_per_minute: int):
+    if shared_state_service.USE_SHARED_STATE:
+        return SharedTokenBucket(name, limit_per_minute)
+    return TokenBucket(limit_per_minute)
+
+
+# [class] 모델별 속도 제한 - RPM 버킷과 TPM 버킷을 모두 통과해야 호출
+class ModelRateLimiter:
+    def __init__(self, model: str, rpm: int, tpm: int):
+        self.model = model
+        self.requests = _create_bucket(f"{model}:rpm", rpm)
+        self.tokens = _create_bucket(f"{model}:tpm", tpm)
+        # [shared] 공유 버킷은 SQLite 쓰기 잠금을 최대 SHARED_STATE_TIMEOUT 초 기다리므로 이벤트 루프 밖(스레드)에서 실행
+        self._shared = isinstance(self.requests, SharedTokenBucket)
+
+    # [function] 버킷 연산 실행 - 공유 버킷이면 스레드에서, 프로세스 내부 버킷이면 바로 실행
+    async def _run(self, func, *args):
+        if self._shared:
+            return await asyncio.to_thread(func, *args)
+        return func(*args)
+
+    # [function] RPM/TPM 버킷 예약 - 대기해야 하는 시간(초) 반환
+    def _reserve(self, requests: int, tokens: int) -> float:
+        return max(self.requests.reserve(requests), self.tokens.reserve(tokens))
+
+    # [function] RPM/TPM 버킷 차단
+    def _pause(self, seconds: float) -> None:
+        self.requests.pause(seconds)
+        self.tokens.pause(seconds)
+
+    # [function] 요청 수/예상 토큰 수만큼 예약 후 필요한 만큼 대기
+    async def acquire(self, requests: int, tokens: int) -> None:
+        wait = await self._run(self._reserve, requests, tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    # [function] 응답의 실제 토큰 사용량으로 TPM 버킷 정산
+    async def settle(self, estimated_tokens: int, actual_tokens: int | None) -> None:
+        if actual_tokens is not None:
+            await self._run(self.tokens.adjust, actual_tokens - estimated_tokens)
+
+    # [function] 429 수신 시 같은 모델의 다른 호출도 함께 멈춤
+    async def pause(self, seconds: float) -> None:
+        await self._run(self._pause, seconds)
+
+    # [function] 현재 상태 반환
+    def stats(self) -> dict:
+        return {"model": self.model, "rpm": self.requests.stats(), "tpm": self.tokens.stats()}
+
+
+# [class] 서킷 브레이커 - 연속 실패가 임계값에 도달하면 일정 시간 즉시 실패, 이후 시험 호출 1건으로 복구 확인
+class CircuitBreaker:
+    def __init__(self, name: str, failure_threshold: int, reset_seconds: float):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_seconds = reset_seconds
+        self._lock = threading.Lock()
+        self.reset()
+
+    # [function] 닫힘 상태로 초기화
+    def reset(self) -> None:
+        with self._lock:
+            self._state = "closed"
+            self._failures = 0
+            self._opened_at = 0.0
+            self._probe_in_flight = False
+
+    # [function] 지금 호출하면 차단되는지 확인 (시험 호출 자리를 차지하지 않음, 속도 제한 대기 전에 빠르게 실패하기 위함)
+    def is_blocked(self) -> bool:
+        with self._lock:
+            if self._state == "open":
+                return time.monotonic() - self._opened_at < self.reset_seconds
+            return self._state == "half_open" and self._probe_in_flight
+
+    # [function] 호출 허용 여부 - 열림 상태면 차단, 차단 시간이 지나면 시험 호출 1건만 허용
+    # 허용된 호출은 record_success/record_failure/release_probe 중 하나로 반드시 끝내야 함
+    def allow(self) -> bool:
+        with self._lock:
+            if self._state == "closed":
+                return True
+            if self._state == "open":
+                if time.monotonic() - self._opened_at < self.reset_seconds:
+                    return False
+                self._state = "half_open"
+                self._probe_in_flight = False
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+            return True
+
+    # [function] 성공 기록 - 닫힘 상태로 복귀
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = "closed"
+            self._failures = 0
+            self._probe_in_flight = False
+
+    # [function] 실패 기록 - 임계값 도달 또는 시험 호출 실패 시 열림
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._probe_in_flight = False
+            if self._state == "half_open" or self._failures >= self.failure_threshold:
+                self._state = "open"
+                self._opened_at = time.monotonic()
+
+    # [function] 결과 없이 끝난 호출(취소 등)의 시험 호출 자리 반환 - 반열림 상태를 유지해 다음 호출이 다시 시험
+    def release_probe(self) -> None:
+        with self._lock:
+            self._probe_in_flight = False
+
+    # [function] 현재 상태 반환
+    def stats(self) -> dict:
+        with self._lock:
+            return {"name": self.name, "state": self._state, "failures": self._failures}
+
+
+# [state] 모델별 속도 제한/서킷 브레이커 (최초 사용 시 생성)
+_limiters: dict[str, ModelRateLimiter] = {}
+_breakers: dict[str, CircuitBreaker] = {}
+_registry_lock = threading.Lock()
+
+
+# [function] 모델별 속도 제한 반환 - 임베딩 모델은 EMBED 한도, 그 외는 SUMMARY 한도
+def get_limiter(model: str, embedding: bool) -> ModelRateLimiter:
+    with _registry_lock:
+        limiter = _limiters.get(model)
+        if limiter is None:
+            if embedding:
+                limiter = ModelRateLimiter(model, GEMINI_EMBED_RPM, GEMINI_EMBED_TPM)
+            else:
+                limiter = ModelRateLimiter(model, GEMINI_SUMMARY_RPM, GEMINI_SUMMARY_TPM)
+            _limiters[model] = limiter
+        return limiter
+
+
+# [function] 모델별 서킷 브레이커 반환
+def get_breaker(model: str) -> CircuitBreaker:
+    with _registry_lock:
+        breaker = _breakers.get(model)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                model,
+                GEMINI_CIRCUIT_FAILURE_THRESHOLD,
+                GEMINI_CIRCUIT_RESET_SECONDS,
+            )
+            _breakers[model] = breaker
+        return breaker
+
+
+# [function] 전체 속도 제한/서킷 브레이커 상태 조회
+def get_stats() -> dict:
+    with _registry_lock:
+        limiters = list(_limiters.values())
+        breakers = list(_breakers.values())
+    return {
+        "limiters": [limiter.stats() for limiter in limiters],
+        "breakers": [breaker.stats() for breaker in breakers],
+    }
@@ -0,0 +1,59 @@
+# [Service] 업로드 요청 크기 제한 - multipart 본문을 Starlette 가 파싱/스풀링하기 전에 MAX_REQUEST_SIZE_MB 초과 요청을 413 으로 거절
+from fastapi import HTTPException
+from starlette.responses import JSONResponse
+from settings import get_settings
+
+# [settings] 업로드 요청 전체 크기 한도 (기본: MAX_UPLOAD_FILES x MAX_FILE_SIZE_MB + 1MB)
+settings = get_settings()
+MAX_REQUEST_SIZE_BYTES = settings.max_request_size_mb * 1024 * 1024
+
+# [const] 한도 초과 에러 코드
+REQUEST_TOO_LARGE = "REQUEST_TOO_LARGE"
+
+
+# [class] ASGI 미들웨어 - Content-Length 가 한도를 넘으면 본문을 읽지 않고 거절, 없거나 거짓이면 읽은 바이트를 세다가 넘는 순간 중단
+# (파일별 MAX_FILE_SIZE_MB 는 pdf_service.save_upload 가 스풀링 후 검사)
+class RequestSizeLimitMiddleware:
+    def __init__(self, app, max_bytes: int = MAX_REQUEST_SIZE_BYTES):
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not _is_multipart(scope):
+            await self.app(scope, receive, send)
+            return
+
+        # [header] 선언된 크기로 먼저 거절 (업로드 본문을 한 바이트도 받지 않음)
+        content_length = _header(scope, b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > self.max_bytes:
+            response = JSONResponse({"detail": REQUEST_TOO_LARGE}, status_code=413, headers={"Connection": "close"})
+            await response(scope, receive, send)
+            return
+
+        # [stream] 청크 전송 등 크기를 모르면 받은 만큼 누적 - 넘으면 파싱 중인 라우터에 413 전달
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    raise HTTPException(status_code=413, detail=REQUEST_TOO_LARGE)
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+# [function] 요청 헤더 값 (없으면 None)
+def _header(scope, name: bytes) -> str | None:
+    for key, value in scope.get("headers", []):
+        if key.lower() == name:
+            return value.decode("latin-1")
+    return None
+
+
+# [function] multipart 업로드 요청 여부
+def _is_multipart(scope) -> bool:
+    content_type = _header(scope, b"content-type") or ""
+    return content_type.lower().startswith("multipart/form-data")
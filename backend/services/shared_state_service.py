@@ -0,0 +1,163 @@
+# [Service] 프로세스 간 공유 상태 - 워커 프로세스 여러 개가 같은 SQLite 파일로 캐시/속도 제한/작업 점유/문서 변경 알림을 공유
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from uuid import uuid4
+from settings import get_settings
+
+# [settings] 공유 상태 저장소 (memory: 프로세스 내부만 | sqlite: SHARED_STATE_PATH 파일을 모든 워커가 공유)
+settings = get_settings()
+SHARED_STATE_BACKEND = settings.shared_state_backend
+SHARED_STATE_PATH = settings.shared_state_path
+# [settings] 잠금 대기 시간(초), 문서 변경 알림 보관 시간(초)
+SHARED_STATE_TIMEOUT = settings.shared_state_timeout
+SHARED_EVENT_RETENTION_SECONDS = settings.shared_event_retention_seconds
+
+# [const] sqlite 저장소 사용 여부
+USE_SHARED_STATE = SHARED_STATE_BACKEND == "sqlite"
+
+# [const] 저장소 스키마 - 캐시 항목, 토큰 버킷, 작업 점유, 문서 변경 알림
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS cache_entries ("
+    " cache TEXT NOT NULL, key TEXT NOT NULL, stored_at REAL NOT NULL, used_at REAL NOT NULL,"
+    " value BLOB NOT NULL, PRIMARY KEY (cache, key))",
+    "CREATE INDEX IF NOT EXISTS ix_cache_entries_used_at ON cache_entries (cache, used_at)",
+    "CREATE TABLE IF NOT EXISTS token_buckets ("
+    " name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL, blocked_until REAL NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS claims ("
+    " name TEXT PRIMARY KEY, pid INTEGER NOT NULL, owner TEXT NOT NULL, claimed_at REAL NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS document_events ("
+    " seq INTEGER PRIMARY KEY AUTOINCREMENT, document_id INTEGER NOT NULL, created_at REAL NOT NULL)",
+)
+
+# [state] 스레드별 연결, 프로세스 식별자 (pid 재사용과 구분)
+_local = threading.local()
+_schema_lock = threading.Lock()
+_schema_pid: int | None = None
+_owner = uuid4().hex
+
+
+# [function] 현재 스레드의 저장소 연결 (fork 후에는 새로 연결)
+def _connect() -> sqlite3.Connection:
+    global _schema_pid
+    conn = getattr(_local, "conn", None)
+    if conn is not None and getattr(_local, "pid", None) == os.getpid():
+        return conn
+
+    conn = sqlite3.connect(SHARED_STATE_PATH, timeout=SHARED_STATE_TIMEOUT, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    with _schema_lock:
+        if _schema_pid != os.getpid():
+            for statement in SCHEMA:
+                conn.execute(statement)
+            _schema_pid = os.getpid()
+    _local.conn = conn
+    _local.pid = os.getpid()
+    return conn
+
+
+# [function] 읽기-수정-쓰기를 다른 프로세스와 겹치지 않게 실행 (쓰기 잠금을 먼저 잡음)
+@contextmanager
+def transaction():
+    conn = _connect()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+# [function] 현재 스레드의 저장소 연결 (자동 커밋 모드, 읽기 전용 조회용)
+def connection() -> sqlite3.Connection:
+    return _connect()
+
+
+# [function] 단일 문장 실행 (자동 커밋)
+def execute(sql: str, params: tuple = ()) -> sqlite3.Cursor:
+    return _connect().execute(sql, params)
+
+
+# [function] 저장소 준비 - 파일/스키마 생성 (memory 면 아무 일도 하지 않음)
+def initialize() -> None:
+    if USE_SHARED_STATE:
+        _connect()
+
+
+# [function] 프로세스 생존 여부
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+# [function] 이름 단위 작업 점유 - 살아 있는 다른 프로세스가 점유 중이면 False (memory 면 항상 True)
+def claim(name: str) -> bool:
+    if not USE_SHARED_STATE:
+        return True
+    pid = os.getpid()
+    with transaction() as conn:
+        row = conn.execute("SELECT pid, owner FROM claims WHERE name = ?", (name,)).fetchone()
+        # [stale] 점유 프로세스가 종료됐거나, 같은 pid 를 재사용한 이전 프로세스의 점유면 가져옴
+        if row is not None and row[1] != _owner and row[0] != pid and _pid_alive(row[0]):
+            return False
+        conn.execute(
+            "INSERT OR REPLACE INTO claims (name, pid, owner, claimed_at) VALUES (?, ?, ?, ?)",
+            (name, pid, _owner, time.time()),
+        )
+    return True
+
+
+# [function] 작업 점유 해제 (자신이 점유한 경우만)
+def release(name: str) -> None:
+    if not USE_SHARED_STATE:
+        return
+    execute("DELETE FROM claims WHERE name = ? AND owner = ?", (name, _owner))
+
+
+# [function] 저장 완료 문서 알림 기록 - 다른 워커의 인메모리 인덱스가 이어서 반영 (오래된 알림은 정리)
+def publish_document(document_id: int) -> None:
+    if not USE_SHARED_STATE:
+        return
+    now = time.time()
+    with transaction() as conn:
+        conn.execute(
+            "INSERT INTO document_events (document_id, created_at) VALUES (?, ?)",
+            (document_id, now),
+        )
+        conn.execute(
+            "DELETE FROM document_events WHERE created_at < ?",
+            (now - SHARED_EVENT_RETENTION_SECONDS,),
+        )
+
+
+# [function] 마지막으로 발급된 문서 알림 번호 (인덱스 전체 적재 직전에 기록, 알림이 모두 정리돼도 유지)
+def latest_document_event() -> int:
+    if not USE_SHARED_STATE:
+        return 0
+    row = execute("SELECT seq FROM sqlite_sequence WHERE name = 'document_events'").fetchone()
+    return row[0] if row else 0
+
+
+# [function] 알림 번호 이후 저장된 문서 ID 목록과 새 알림 번호 - 알림이 정리돼 이어 받을 수 없으면 ID 목록 None
+def documents_since(seq: int) -> tuple[list[int] | None, int]:
+    if not USE_SHARED_STATE:
+        return [], seq
+    rows = execute(
+        "SELECT seq, document_id FROM document_events WHERE seq > ? ORDER BY seq",
+        (seq,),
+    ).fetchall()
+    if not rows:
+        return [], seq
+    # [gap] 알림 번호는 쓰기 잠금 순서대로 연속 발급되므로 빈 번호는 정리된 알림
+    if rows[0][0] != seq + 1:
+        return None, rows[-1][0]
+    return [document_id for _, document_id in rows], rows[-1][0]
@@ -0,0 +1,239 @@
+# [Service] 청크 임베딩 저장 형식 변환 및 유사도 검색 인덱스
+import logging
+import threading
+import numpy as np
+from sqlalchemy import select, text
+from database import SessionLocal
+from models.summary import DocumentChunk, USE_PGVECTOR
+from services import shared_state_service
+from settings import get_settings
+
+try:
+    import hnswlib
+except ImportError:
+    hnswlib = None
+
+logger = logging.getLogger(__name__)
+
+# [settings] 인덱스 설정 - auto 이면 hnswlib(ANN)가 설치된 경우 사용, 없으면 NumPy 행렬 전수 비교
+settings = get_settings()
+VECTOR_INDEX_BACKEND = settings.vector_index_backend
+VECTOR_INDEX_LOAD_BATCH = settings.vector_index_load_batch
+HNSW_M = settings.hnsw_m
+HNSW_EF_CONSTRUCTION = settings.hnsw_ef_construction
+HNSW_EF_SEARCH = settings.hnsw_ef_search
+
+
+# [function] 임베딩을 DB 저장 형식으로 변환 - pgvector 면 리스트, 그 외에는 float32 바이너리
+def encode_embedding(values: list[float]):
+    if USE_PGVECTOR:
+        return [float(value) for value in values]
+    return np.asarray(values, dtype=np.float32).tobytes()
+
+
+# [function] DB 저장 형식을 float32 벡터로 복원
+def decode_embedding(raw) -> np.ndarray:
+    if isinstance(raw, (bytes, bytearray, memoryview)):
+        return np.frombuffer(raw, dtype=np.float32)
+    return np.asarray(raw, dtype=np.float32)
+
+
+# [function] 코사인 유사도 계산을 위한 L2 정규화
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+# [class] 청크 임베딩 인메모리 인덱스 - (document_id, chunk_index) 단위로 top-k 코사인 검색
+class VectorIndex:
+    def __init__(self, backend: str = "auto"):
+        self.backend = backend
+        # [backend] numpy 가 아니고 hnswlib 가 설치돼 있으면 ANN(HNSW) 사용
+        self.use_hnsw = backend != "numpy" and hnswlib is not None
+        if backend == "hnsw" and hnswlib is None:
+            logger.warning("hnswlib is not installed; falling back to numpy vector index")
+        self._lock = threading.Lock()
+        self._clear()
+
+    # [function] 인덱스 상태 초기화
+    def _clear(self) -> None:
+        self._loaded = False
+        # [sync] 마지막으로 반영한 공유 문서 알림 번호 (다른 워커 프로세스가 저장한 문서 반영용)
+        self._event_cursor = 0
+        self._dim: int | None = None
+        self._indexed_documents: set[int] = set()
+        # [buffer] 용량을 2배씩 늘리는 버퍼 - 앞쪽 _size 행만 유효
+        self._matrix: np.ndarray | None = None
+        self._doc_array = np.empty(0, dtype=np.int64)
+        self._chunk_array = np.empty(0, dtype=np.int64)
+        self._hnsw = None
+        self._size = 0
+
+    # [function] 버퍼 용량 확보 (잠금 보유 상태에서 호출)
+    def _reserve_locked(self, required: int) -> None:
+        capacity = len(self._doc_array)
+        if required <= capacity:
+            return
+        new_capacity = max(required, capacity * 2, 1024)
+        self._doc_array = np.resize(self._doc_array, new_capacity)
+        self._chunk_array = np.resize(self._chunk_array, new_capacity)
+        if self._hnsw is not None:
+            self._hnsw.resize_index(new_capacity)
+        elif not self.use_hnsw:
+            matrix = np.empty((new_capacity, self._dim), dtype=np.float32)
+            if self._matrix is not None:
+                matrix[:self._size] = self._matrix[:self._size]
+            self._matrix = matrix
+
+    # [function] 문서 하나의 청크 벡터 추가 (잠금 보유 상태에서 호출)
+    def _add_locked(self, document_id: int, chunk_indexes: list[int], vectors: np.ndarray) -> None:
+        if document_id in self._indexed_documents or len(vectors) == 0:
+            return
+        if self._dim is None:
+            self._dim = vectors.shape[1]
+        if vectors.shape[1] != self._dim:
+            logger.warning(
+                "Skip vectors with dim=%s for document_id=%s (index dim=%s)",
+                vectors.shape[1],
+                document_id,
+                self._dim,
+            )
+            return
+
+        vectors = _normalize_rows(vectors.astype(np.float32, copy=False))
+        self._indexed_documents.add(document_id)
+
+        if self.use_hnsw and self._hnsw is None:
+            self._hnsw = hnswlib.Index(space="ip", dim=self._dim)
+            self._hnsw.init_index(
+                max_elements=max(1024, len(vectors)),
+                ef_construction=HNSW_EF_CONSTRUCTION,
+                M=HNSW_M,
+            )
+            self._hnsw.set_ef(HNSW_EF_SEARCH)
+
+        start = self._size
+        end = start + len(vectors)
+        self._reserve_locked(end)
+        self._doc_array[start:end] = document_id
+        self._chunk_array[start:end] = chunk_indexes
+        if self._hnsw is not None:
+            self._hnsw.add_items(vectors, np.arange(start, end))
+        else:
+            self._matrix[start:end] = vectors
+        self._size = end
+
+    # [function] DB 에 저장된 청크 임베딩을 배치 단위로 적재 (document_ids 가 있으면 해당 문서만)
+    def _load_locked(self, document_ids: list[int] | None = None) -> None:
+        db = SessionLocal()
+        try:
+            stmt = (
+                select(
+                    DocumentChunk.document_id,
+                    DocumentChunk.chunk_index,
+                    DocumentChunk.embedding,
+                )
+                .order_by(DocumentChunk.document_id, DocumentChunk.chunk_index)
+                .execution_options(yield_per=VECTOR_INDEX_LOAD_BATCH)
+            )
+            if document_ids is not None:
+                stmt = stmt.where(DocumentChunk.document_id.in_(document_ids))
+            current_document = None
+            chunk_indexes: list[int] = []
+            vectors: list[np.ndarray] = []
+            for document_id, chunk_index, raw in db.execute(stmt):
+                if document_id != current_document and vectors:
+                    self._add_locked(current_document, chunk_indexes, np.vstack(vectors))
+                    chunk_indexes, vectors = [], []
+                current_document = document_id
+                chunk_indexes.append(chunk_index)
+                vectors.append(decode_embedding(raw))
+            if vectors:
+                self._add_locked(current_document, chunk_indexes, np.vstack(vectors))
+        finally:
+            db.close()
+        self._loaded = True
+
+    # [function] 최초 검색 전에 인덱스 적재, 이후에는 다른 워커가 저장한 문서만 이어서 적재
+    def ensure_loaded(self) -> None:
+        with self._lock:
+            if not self._loaded:
+                self._event_cursor = shared_state_service.latest_document_event()
+                self._load_locked()
+                return
+            document_ids, self._event_cursor = shared_state_service.documents_since(self._event_cursor)
+            if document_ids is None:
+                cursor = self._event_cursor
+                self._clear()
+                self._event_cursor = cursor
+                self._load_locked()
+            elif document_ids:
+                self._load_locked(document_ids)
+
+    # [function] 새로 저장된 문서의 청크 벡터 추가 (아직 적재 전이면 적재 시 DB 에서 읽음)
+    def add_document(self, document_id: int, chunk_indexes: list[int], vectors: list[list[float]]) -> None:
+        with self._lock:
+            if not self._loaded or len(vectors) == 0:
+                return
+            self._add_locked(document_id, chunk_indexes, np.asarray(vectors, dtype=np.float32))
+
+    # [function] 인덱스 비우기 (다음 검색 시 DB 에서 다시 적재)
+    def reset(self) -> None:
+        with self._lock:
+            self._clear()
+
+    # [function] 코사인 유사도 top-k 검색 - (document_id, chunk_index, score) 목록
+    def search(self, query: list[float], top_k: int) -> list[tuple[int, int, float]]:
+        self.ensure_loaded()
+        with self._lock:
+            if self._size == 0 or top_k <= 0:
+                return []
+            query_vector = np.asarray(query, dtype=np.float32).reshape(1, -1)
+            if query_vector.shape[1] != self._dim:
+                return []
+            query_vector = _normalize_rows(query_vector)[0]
+
+            k = min(top_k, self._size)
+            if self._hnsw is not None:
+                labels, distances = self._hnsw.knn_query(query_vector, k=k)
+                positions = labels[0]
+                scores = 1.0 - distances[0]
+            else:
+                similarities = self._matrix[:self._size] @ query_vector
+                positions = np.argpartition(-similarities, k - 1)[:k]
+                positions = positions[np.argsort(-similarities[positions])]
+                scores = similarities[positions]
+
+            return [
+                (int(self._doc_array[pos]), int(self._chunk_array[pos]), float(score))
+                for pos, score in zip(positions, scores)
+            ]
+
+
+# [instance] 앱 전체에서 공유하는 청크 인덱스
+chunk_index = VectorIndex(VECTOR_INDEX_BACKEND)
+
+
+# [function] pgvector 사용 시 DB 의 ANN 인덱스로 top-k 검색
+def _search_pgvector(query: list[float], top_k: int) -> list[tuple[int, int, float]]:
+    db = SessionLocal()
+    try:
+        # [ef_search] 메모리 HNSW 인덱스와 같은 탐색 폭 (top_k 보다 작으면 결과가 모자라므로 top_k 이상)
+        db.execute(text(f"SET LOCAL hnsw.ef_search = {max(HNSW_EF_SEARCH, int(top_k))}"))
+        distance = DocumentChunk.embedding.cosine_distance(query)
+        rows = db.execute(
+            select(DocumentChunk.document_id, DocumentChunk.chunk_index, distance.label("distance"))
+            .order_by(distance)
+            .limit(top_k)
+        ).all()
+        return [(row.document_id, row.chunk_index, 1.0 - float(row.distance)) for row in rows]
+    finally:
+        db.close()
+
+
+# [function] 질의 벡터로 유사 청크 검색 (블로킹)
+def search_chunks(query: list[float], top_k: int) -> list[tuple[int, int, float]]:
+    if USE_PGVECTOR:
+        return _search_pgvector(query, top_k)
+    return chunk_index.search(query, top_k)
@@ -0,0 +1,73 @@
+# [Service] 서버 시작 예열 - 첫 요청이 커넥션 생성/모듈 초기화/인덱스 적재 비용을 떠안지 않도록 미리 준비
+import asyncio
+import logging
+import time
+from sqlalchemy import text
+from database import get_async_engine, get_engine
+from models.summary import USE_PGVECTOR
+from services import bm25_service, dedup_service, pdf_service, vector_service
+from settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+# [settings] 예열 설정 - DB 커넥션 수(동기/비동기 풀 각각), OCR 프로세스 풀 기동, 검색/중복 탐지 인덱스 적재
+settings = get_settings()
+WARMUP_ENABLED = settings.warmup_enabled
+WARMUP_DB_CONNECTIONS = settings.warmup_db_connections
+WARMUP_OCR_POOL = settings.warmup_ocr_pool
+WARMUP_INDEXES = settings.warmup_indexes
+
+
+# [function] 동기 엔진 풀에 커넥션을 미리 열어 둠 (블로킹)
+def _warm_sync_pool(count: int) -> None:
+    connections = [get_engine().connect() for _ in range(count)]
+    try:
+        for connection in connections:
+            connection.execute(text("SELECT 1"))
+    finally:
+        for connection in connections:
+            connection.close()
+
+
+# [function] 비동기 엔진 풀에 커넥션을 미리 열어 둠
+async def _warm_async_pool(count: int) -> None:
+    async def open_one():
+        async with get_async_engine().connect() as connection:
+            await connection.execute(text("SELECT 1"))
+
+    await asyncio.gather(*(open_one() for _ in range(count)))
+
+
+# [function] 검색/질의응답/중복 탐지 인메모리 인덱스 적재 (블로킹, pgvector 는 DB 에서 검색하므로 임베딩 인덱스 제외)
+def _warm_indexes() -> None:
+    if not USE_PGVECTOR:
+        vector_service.chunk_index.ensure_loaded()
+    bm25_service.bm25_index.ensure_loaded()
+    if dedup_service.DEDUP_ENABLED:
+        dedup_service.signature_index.ensure_loaded()
+
+
+# [function] 서버 시작 예열 실행 - 단계별 소요 시간(ms) 반환, 실패해도 서버 기동은 계속
+async def warm_up() -> dict:
+    if not WARMUP_ENABLED:
+        return {}
+
+    timings: dict[str, float] = {}
+
+    async def step(name: str, awaitable) -> None:
+        started = time.perf_counter()
+        try:
+            await awaitable
+        except Exception:
+            logger.exception("Warmup step failed: %s", name)
+        timings[name] = round((time.perf_counter() - started) * 1000, 1)
+
+    if WARMUP_DB_CONNECTIONS:
+        await step("db_sync_pool", asyncio.to_thread(_warm_sync_pool, WARMUP_DB_CONNECTIONS))
+        await step("db_async_pool", _warm_async_pool(WARMUP_DB_CONNECTIONS))
+    await step("pdf", asyncio.to_thread(pdf_service.warm_up, WARMUP_OCR_POOL))
+    if WARMUP_INDEXES:
+        await step("indexes", asyncio.to_thread(_warm_indexes))
+
+    logger.info("Warmup finished in ms: %s", timings)
+    return timings
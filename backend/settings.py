@@ -0,0 +1,197 @@
+# [settings] 환경변수 설정 - 모든 설정값을 한 곳에서 읽어 타입/기본값/범위를 맞춘 객체로 제공
+import os
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable
+
+
+# [function] 환경변수 값을 기본값 타입으로 변환 (bool 은 "true" 일 때만 True)
+def _parse(name: str, raw: str, cast: Callable[[str], Any]) -> Any:
+    if cast is bool:
+        return raw.lower() == "true"
+    try:
+        return cast(raw)
+    except ValueError as exc:
+        raise ValueError(f"{name} must be {cast.__name__}, got {raw!r}") from exc
+
+
+# [function] 설정 필드 정의 - 객체 생성 시 환경변수를 읽고 범위(minimum/maximum)로 보정
+def _env(
+    name: str,
+    default: Any,
+    *,
+    cast: Callable[[str], Any] | None = None,
+    minimum: float | None = None,
+    maximum: float | None = None,
+    lower: bool = False,
+):
+    cast = cast or type(default)
+
+    def read() -> Any:
+        raw = os.getenv(name)
+        value = default if raw is None else _parse(name, raw, cast)
+        if isinstance(value, str) and lower:
+            value = value.lower()
+        if value is not None and minimum is not None:
+            value = max(minimum, value)
+        if value is not None and maximum is not None:
+            value = min(maximum, value)
+        return value
+
+    return field(default_factory=read)
+
+
+# [class] 앱 설정 - 필드 이름은 환경변수 이름의 소문자 (변수별 설명은 .env.example 참고)
+@dataclass(frozen=True)
+class Settings:
+    # [db] DB 연결/커넥션 풀
+    database_url: str | None = _env("DATABASE_URL", None, cast=str)
+    async_database_url: str = _env("ASYNC_DATABASE_URL", "")
+    db_pool_size: int = _env("DB_POOL_SIZE", 10)
+    db_max_overflow: int = _env("DB_MAX_OVERFLOW", 20)
+    db_pool_timeout: int = _env("DB_POOL_TIMEOUT", 30)
+    db_pool_recycle: int = _env("DB_POOL_RECYCLE", 1800)
+    auto_create_tables: bool = _env("AUTO_CREATE_TABLES", True)
+
+    # [gemini] 모델/요약 방식
+    gemini_api_key: str | None = _env("GEMINI_API_KEY", None, cast=str)
+    gemini_model_summary: str = _env("GEMINI_MODEL_SUMMARY", "gemini-2.0-flash")
+    gemini_model_embedding: str = _env("GEMINI_MODEL_EMBEDDING", "text-embedding-004")
+    summary_max_chars: int = _env("SUMMARY_MAX_CHARS", 40000)
+    summary_mode: str = _env("SUMMARY_MODE", "auto", lower=True)
+    summary_map_group_chars: int = _env("SUMMARY_MAP_GROUP_CHARS", 12000)
+    summary_map_concurrency: int = _env("SUMMARY_MAP_CONCURRENCY", 4, minimum=1)
+    embed_batch_size: int = _env("EMBED_BATCH_SIZE", 100, minimum=1, maximum=100)
+    embed_concurrency: int = _env("EMBED_CONCURRENCY", 4, minimum=1)
+
+    # [gemini] HTTP 커넥션 풀/타임아웃 (keep-alive 수는 비우면 최대 커넥션 수)
+    gemini_api_base_url: str = _env("GEMINI_API_BASE_URL", "https://generativelanguage.googleapis.com/v1beta")
+    gemini_http_max_connections: int = _env("GEMINI_HTTP_MAX_CONNECTIONS", 20)
+    gemini_http_max_keepalive: int | None = _env("GEMINI_HTTP_MAX_KEEPALIVE", None, cast=int)
+    gemini_http_keepalive_expiry: float = _env("GEMINI_HTTP_KEEPALIVE_EXPIRY", 30.0)
+    gemini_http_timeout: float = _env("GEMINI_HTTP_TIMEOUT", 60.0)
+    gemini_http_connect_timeout: float = _env("GEMINI_HTTP_CONNECT_TIMEOUT", 10.0)
+    gemini_http2: bool = _env("GEMINI_HTTP2", True)
+
+    # [gemini] 속도 제한/재시도/서킷 브레이커
+    gemini_summary_rpm: int = _env("GEMINI_SUMMARY_RPM", 1000)
+    gemini_summary_tpm: int = _env("GEMINI_SUMMARY_TPM", 1000000)
+    gemini_embed_rpm: int = _env("GEMINI_EMBED_RPM", 1500)
+    gemini_embed_tpm: int = _env("GEMINI_EMBED_TPM", 1000000)
+    gemini_chars_per_token: float = _env("GEMINI_CHARS_PER_TOKEN", 3.0, minimum=0.5)
+    gemini_retry_max_attempts: int = _env("GEMINI_RETRY_MAX_ATTEMPTS", 4, minimum=1)
+    gemini_retry_base_delay: float = _env("GEMINI_RETRY_BASE_DELAY", 1.0)
+    gemini_retry_max_delay: float = _env("GEMINI_RETRY_MAX_DELAY", 30.0)
+    gemini_circuit_failure_threshold: int = _env("GEMINI_CIRCUIT_FAILURE_THRESHOLD", 5)
+    gemini_circuit_reset_seconds: float = _env("GEMINI_CIRCUIT_RESET_SECONDS", 30.0)
+
+    # [upload] 업로드 제한/저장, 목록/검색 페이지 크기
+    max_upload_files: int = _env("MAX_UPLOAD_FILES", 10)
+    max_file_size_mb: int = _env("MAX_FILE_SIZE_MB", 20)
+    max_request_size_mb: int | None = _env("MAX_REQUEST_SIZE_MB", None, cast=int, minimum=1)
+    upload_dir: str = _env("UPLOAD_DIR", "uploads")
+    upload_chunk_bytes: int = _env("UPLOAD_CHUNK_BYTES", 1024 * 1024, minimum=64 * 1024)
+    batch_stream_poll_seconds: float = _env("BATCH_STREAM_POLL_SECONDS", 15.0, minimum=1.0)
+    summary_list_default_limit: int = _env("SUMMARY_LIST_DEFAULT_LIMIT", 50)
+    summary_list_max_limit: int = _env("SUMMARY_LIST_MAX_LIMIT", 200)
+    search_default_top_k: int = _env("SEARCH_DEFAULT_TOP_K", 10)
+    search_max_top_k: int = _env("SEARCH_MAX_TOP_K", 100)
+
+    # [download] 다운로드 압축(이 크기 미만은 압축 안 함)/스트리밍 조각 크기, 일괄 내보내기 배치 크기
+    download_compress_min_bytes: int = _env("DOWNLOAD_COMPRESS_MIN_BYTES", 1024, minimum=0)
+    download_gzip_level: int = _env("DOWNLOAD_GZIP_LEVEL", 6, minimum=1, maximum=9)
+    download_brotli_quality: int = _env("DOWNLOAD_BROTLI_QUALITY", 5, minimum=0, maximum=11)
+    download_chunk_bytes: int = _env("DOWNLOAD_CHUNK_BYTES", 64 * 1024, minimum=1024)
+    export_batch_size: int = _env("EXPORT_BATCH_SIZE", 200, minimum=1)
+
+    # [qa] 질의응답 - 답변에 넣을 청크 수, 검색기별 후보 수, BM25 가중치(나머지는 임베딩 유사도), BM25 파라미터, 문맥/질문 길이 제한
+    qa_top_k: int = _env("QA_TOP_K", 5, minimum=1)
+    qa_max_top_k: int = _env("QA_MAX_TOP_K", 20, minimum=1)
+    qa_candidate_k: int = _env("QA_CANDIDATE_K", 50, minimum=1)
+    qa_bm25_weight: float = _env("QA_BM25_WEIGHT", 0.6, minimum=0.0, maximum=1.0)
+    qa_max_context_chars: int = _env("QA_MAX_CONTEXT_CHARS", 8000, minimum=500)
+    qa_question_max_chars: int = _env("QA_QUESTION_MAX_CHARS", 1000, minimum=1)
+    bm25_k1: float = _env("BM25_K1", 1.2, minimum=0.0)
+    bm25_b: float = _env("BM25_B", 0.75, minimum=0.0, maximum=1.0)
+    bm25_load_batch: int = _env("BM25_LOAD_BATCH", 10000, minimum=1)
+
+    # [pipeline] 백그라운드 워커, 청킹
+    batch_concurrency: int = _env("BATCH_CONCURRENCY", 4, minimum=1)
+    chunk_max_tokens: int = _env("CHUNK_MAX_TOKENS", 512)
+    chunk_overlap_tokens: int = _env("CHUNK_OVERLAP_TOKENS", 64)
+    chunk_ascii_chars_per_token: float = _env("CHUNK_ASCII_CHARS_PER_TOKEN", 4.0, minimum=0.5)
+    chunk_non_ascii_chars_per_token: float = _env("CHUNK_NON_ASCII_CHARS_PER_TOKEN", 1.5, minimum=0.5)
+    chunk_insert_batch_size: int = _env("CHUNK_INSERT_BATCH_SIZE", 1000, minimum=1)
+    chunk_insert_use_copy: bool = _env("CHUNK_INSERT_USE_COPY", True)
+
+    # [ocr] 페이지 단위 OCR
+    ocr_enabled: bool = _env("OCR_ENABLED", True)
+    ocr_lang: str = _env("OCR_LANG", "kor+eng")
+    ocr_dpi: int = _env("OCR_DPI", 200)
+    ocr_page_min_text_length: int = _env("OCR_PAGE_MIN_TEXT_LENGTH", 50)
+    ocr_workers: int = _env("OCR_WORKERS", os.cpu_count() or 1, minimum=1)
+    ocr_window_pages: int = _env("OCR_WINDOW_PAGES", 4, minimum=1)
+
+    # [storage] 원문 압축, 임베딩/벡터 인덱스
+    text_compression: str = _env("TEXT_COMPRESSION", "gzip", lower=True)
+    text_compression_level: int = _env("TEXT_COMPRESSION_LEVEL", 6)
+    embedding_dim: int = _env("EMBEDDING_DIM", 768)
+    vector_index_backend: str = _env("VECTOR_INDEX_BACKEND", "auto", lower=True)
+    vector_index_load_batch: int = _env("VECTOR_INDEX_LOAD_BATCH", 10000)
+    hnsw_m: int = _env("HNSW_M", 16)
+    hnsw_ef_construction: int = _env("HNSW_EF_CONSTRUCTION", 200)
+    hnsw_ef_search: int = _env("HNSW_EF_SEARCH", 64)
+
+    # [cache] 콘텐츠 해시 캐시
+    cache_enabled: bool = _env("CACHE_ENABLED", True)
+    cache_max_entries: int = _env("CACHE_MAX_ENTRIES", 128)
+    cache_ttl_seconds: int = _env("CACHE_TTL_SECONDS", 0)
+    embed_cache_max_entries: int = _env("EMBED_CACHE_MAX_ENTRIES", 50000)
+    answer_cache_max_entries: int = _env("ANSWER_CACHE_MAX_ENTRIES", 1024)
+    shared_cache_evict_every: int = _env("SHARED_CACHE_EVICT_EVERY", 32, minimum=1)
+
+    # [dedup] 유사 중복 문서 탐지
+    dedup_enabled: bool = _env("DEDUP_ENABLED", True)
+    dedup_threshold: float = _env("DEDUP_THRESHOLD", 0.5)
+    dedup_num_perm: int = _env("DEDUP_NUM_PERM", 128)
+    dedup_lsh_bands: int = _env("DEDUP_LSH_BANDS", 32)
+    dedup_shingle_size: int = _env("DEDUP_SHINGLE_SIZE", 5, minimum=1)
+    dedup_max_candidates: int = _env("DEDUP_MAX_CANDIDATES", 3, minimum=1)
+    dedup_load_batch: int = _env("DEDUP_LOAD_BATCH", 10000)
+
+    # [server] 워커 간 공유 상태, 시작 예열, 멀티 워커 실행
+    shared_state_backend: str = _env("SHARED_STATE_BACKEND", "memory", lower=True)
+    shared_state_path: str = _env("SHARED_STATE_PATH", "shared_state.db")
+    shared_state_timeout: float = _env("SHARED_STATE_TIMEOUT", 5.0)
+    shared_event_retention_seconds: int = _env("SHARED_EVENT_RETENTION_SECONDS", 86400)
+    warmup_enabled: bool = _env("WARMUP_ENABLED", True)
+    warmup_db_connections: int = _env("WARMUP_DB_CONNECTIONS", 2, minimum=0)
+    warmup_ocr_pool: bool = _env("WARMUP_OCR_POOL", False)
+    warmup_indexes: bool = _env("WARMUP_INDEXES", False)
+    web_concurrency: int = _env("WEB_CONCURRENCY", os.cpu_count() or 1, minimum=1)
+    host: str = _env("HOST", "0.0.0.0")
+    port: int = _env("PORT", 8000)
+
+    # [observability] 메트릭/프로파일링
+    metrics_enabled: bool = _env("METRICS_ENABLED", True)
+    prometheus_multiproc_dir: str = _env("PROMETHEUS_MULTIPROC_DIR", "")
+    profiling_enabled: bool = _env("PROFILING_ENABLED", False)
+    profile_dir: str = _env("PROFILE_DIR", "profiles")
+    profile_interval: float = _env("PROFILE_INTERVAL", 0.001)
+
+    # [function] 다른 설정값에서 정해지는 기본값 채우기
+    def __post_init__(self):
+        if self.gemini_http_max_keepalive is None:
+            object.__setattr__(self, "gemini_http_max_keepalive", self.gemini_http_max_connections)
+        if self.max_request_size_mb is None:
+            # [upload] 업로드 요청 전체 한도 - 파일 수 x 파일 크기 + multipart 헤더 여유 1MB
+            object.__setattr__(self, "max_request_size_mb", self.max_upload_files * self.max_file_size_mb + 1)
+
+
+# [function] 설정 객체 반환 - 최초 호출 시 .env 를 읽고 한 번만 생성 (환경변수를 바꾼 뒤 다시 읽으려면 get_settings.cache_clear())
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    return Settings()
@@ -25,8 +25,63 @@ export async function summarizeBatch(files) {
   return res.json()
 }
 
-export async function fetchSummaries() {
-  const res = await request('/summaries')
+// NDJSON 응답을 한 줄(이벤트)씩 읽어 onEvent 호출, 마지막 done 이벤트 반환
+async function readNdjson(res, onEvent) {
+  const reader = res.body.getReader()
+  const decoder = new TextDecoder()
+  let buffer = ''
+  let done = null
+  while (true) {
+    const { value, done: finished } = await reader.read()
+    buffer += decoder.decode(value || new Uint8Array(), { stream: !finished })
+    const lines = buffer.split('\n')
+    buffer = lines.pop()
+    for (const line of lines) {
+      if (!line.trim()) continue
+      const event = JSON.parse(line)
+      if (event.event === 'done') done = event
+      onEvent(event)
+    }
+    if (finished) break
+  }
+  return done
+}
+
+export async function summarizeBatchStream(files, onEvent) {
+  const formData = new FormData()
+  files.forEach((file) => formData.append('files', file))
+  const res = await request('/summarize/batch/stream', {
+    method: 'POST',
+    body: formData,
+  })
+  return readNdjson(res, onEvent)
+}
+
+export async function summarizeStream(file, onEvent) {
+  const formData = new FormData()
+  formData.append('file', file)
+  const res = await request('/summarize/stream', {
+    method: 'POST',
+    body: formData,
+  })
+  return readNdjson(res, onEvent)
+}
+
+export async function fetchBatchStatus(ids) {
+  const params = new URLSearchParams()
+  ids.forEach((id) => params.append('ids', id))
+  const res = await request(`/summarize/batch/status?${params.toString()}`)
+  return res.json()
+}
+
+export async function fetchSummaries({ cursor, limit, status, filenamePrefix } = {}) {
+  const params = new URLSearchParams()
+  if (cursor) params.append('cursor', cursor)
+  if (limit) params.append('limit', limit)
+  if (status) params.append('status', status)
+  if (filenamePrefix) params.append('filename_prefix', filenamePrefix)
+  const query = params.toString()
+  const res = await request(query ? `/summaries?${query}` : '/summaries')
   return res.json()
 }
 
@@ -38,3 +93,20 @@ export async function fetchSummaryDetail(id) {
 export function getSummaryDownloadUrl(id) {
   return `${API_BASE}/summaries/${id}/download`
 }
+
+export function getSummaryExportUrl({ format = 'zip', status, ids } = {}) {
+  const params = new URLSearchParams({ format })
+  if (status) params.append('status', status)
+  if (ids) ids.forEach((id) => params.append('ids', id))
+  return `${API_BASE}/summaries/export?${params.toString()}`
+}
+
+export async function askQuestion(question, { documentId, topK } = {}) {
+  const path = documentId ? `/summaries/${documentId}/ask` : '/ask'
+  const res = await request(path, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify({ question, top_k: topK }),
+  })
+  return res.json()
+}
@@ -2,7 +2,7 @@ import { Button } from '@/components/ui/button'
 import { DropdownMenu, DropdownMenuContent, DropdownMenuItem, DropdownMenuTrigger } from '@/components/ui/dropdown-menu'
 import { Input } from '@/components/ui/input'
 import { Table, TableBody, TableCell, TableHead, TableHeader, TableRow } from '@/components/ui/table'
-import { fetchSummaries, fetchSummaryDetail, getSummaryDownloadUrl } from '@/lib/api'
+import { askQuestion, fetchSummaries, fetchSummaryDetail, getSummaryDownloadUrl, getSummaryExportUrl } from '@/lib/api'
 import { MoreHorizontal } from 'lucide-react'
 import { useEffect, useMemo, useState } from 'react'
 import { useLocation } from 'react-router-dom'
@@ -12,8 +12,14 @@ function SearchPage() {
   const [items, setItems] = useState([])
   const [selectedTitle, setSelectedTitle] = useState('')
   const [selectedSummary, setSelectedSummary] = useState('')
+  const [selectedId, setSelectedId] = useState(null)
+  const [question, setQuestion] = useState('')
+  const [answer, setAnswer] = useState(null)
+  const [asking, setAsking] = useState(false)
   const [error, setError] = useState('')
   const [page, setPage] = useState(1)
+  const [nextCursor, setNextCursor] = useState(null)
+  const [loadingMore, setLoadingMore] = useState(false)
   const location = useLocation()
   const pageSize = 10
 
@@ -21,23 +27,54 @@ function SearchPage() {
     try {
       setError('')
       const data = await fetchSummaries()
-      setItems(data)
+      setItems(data.items)
+      setNextCursor(data.next_cursor)
     } catch (e) {
       setError(`조회 실패: ${e.message}`)
     }
   }
 
+  const loadMoreSummaries = async () => {
+    if (!nextCursor) return
+    try {
+      setError('')
+      setLoadingMore(true)
+      const data = await fetchSummaries({ cursor: nextCursor })
+      setItems((prev) => [...prev, ...data.items])
+      setNextCursor(data.next_cursor)
+    } catch (e) {
+      setError(`조회 실패: ${e.message}`)
+    } finally {
+      setLoadingMore(false)
+    }
+  }
+
   const handleView = async (id) => {
     try {
       setError('')
       const detail = await fetchSummaryDetail(id)
       setSelectedTitle(detail.title || '(제목 없음)')
       setSelectedSummary(detail.summary || '(요약 없음)')
+      setSelectedId(id)
+      setAnswer(null)
     } catch (e) {
       setError(`상세 조회 실패: ${e.message}`)
     }
   }
 
+  const handleAsk = async () => {
+    if (!question.trim()) return
+    try {
+      setError('')
+      setAsking(true)
+      setAnswer(await askQuestion(question, { documentId: selectedId }))
+    } catch (e) {
+      setError(`질문 실패: ${e.message}`)
+    } finally {
+      setAsking(false)
+    }
+  }
+
   const filtered = useMemo(() => {
     const q = query.trim().toLowerCase()
     if (!q) return items
@@ -78,6 +115,9 @@ function SearchPage() {
             onChange={(e) => setQuery(e.target.value)}
             />
             <Button variant="outline" onClick={loadSummaries}>새로고침</Button>
+            <Button variant="outline" onClick={() => window.open(getSummaryExportUrl({ format: 'zip' }), '_blank')}>
+              전체 내보내기
+            </Button>
         </div>
 
       {/* 검색 결과 테이블 */}
@@ -131,6 +171,11 @@ function SearchPage() {
             : `${filtered.length}건 중 ${(page - 1) * pageSize + 1}-${Math.min(page * pageSize, filtered.length)}건`}
         </p>
         <div className="flex items-center gap-2">
+          {nextCursor && (
+            <Button variant="outline" size="sm" disabled={loadingMore} onClick={loadMoreSummaries}>
+              더 불러오기
+            </Button>
+          )}
           <Button variant="outline" size="sm" disabled={page === 1} onClick={() => setPage((p) => Math.max(1, p - 1))}>
             이전
           </Button>
@@ -153,6 +198,32 @@ function SearchPage() {
             <h3 className="mb-2 text-base font-semibold">{selectedTitle}</h3>
             {selectedSummary}
           </div>
+          {/* 선택한 문서에 질문 - 관련 청크만 근거로 답변 */}
+          <div className="flex gap-2">
+            <Input
+              placeholder="이 문서에 질문하기"
+              value={question}
+              onChange={(e) => setQuestion(e.target.value)}
+              onKeyDown={(e) => e.key === 'Enter' && handleAsk()}
+            />
+            <Button variant="outline" disabled={asking || !question.trim()} onClick={handleAsk}>
+              질문
+            </Button>
+          </div>
+          {answer && (
+            <div className="rounded-md border p-3 text-sm whitespace-pre-wrap">
+              {answer.answer}
+              {answer.sources.length > 0 && (
+                <ol className="mt-2 list-decimal pl-5 text-xs text-muted-foreground">
+                  {answer.sources.map((source) => (
+                    <li key={`${source.document_id}-${source.chunk_index}`}>
+                      p.{source.page_start}{source.page_end !== source.page_start ? `-${source.page_end}` : ''} · {source.text.slice(0, 80)}
+                    </li>
+                  ))}
+                </ol>
+              )}
+            </div>
+          )}
         </>
       )}
 
@@ -1,16 +1,48 @@
 import { Button } from '@/components/ui/button'
 import { Empty, EmptyContent, EmptyDescription, EmptyHeader, EmptyMedia, EmptyTitle } from '@/components/ui/empty'
 import { Progress } from '@/components/ui/progress'
-import { summarizeBatch } from '@/lib/api'
+import { fetchBatchStatus, summarizeBatchStream, summarizeStream } from '@/lib/api'
 import { IconCloud } from '@tabler/icons-react'
 import { useRef, useState } from 'react'
 import { useNavigate } from 'react-router-dom'
 
+const POLL_INTERVAL_MS = 2000
+
+const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms))
+
+const STAGE_LABELS = {
+  extract: '텍스트 추출',
+  chunk: '청킹',
+  dedup: '중복 탐지',
+  embed: '임베딩',
+  summarize: '요약',
+  save: '저장',
+}
+
+// 스트림 이벤트를 파일별 진행 문구로 변환
+const describeEvent = (event) => {
+  if (event.event === 'accepted') return '대기 중'
+  if (event.event === 'started') return '처리 시작'
+  if (event.event === 'stage') {
+    const label = STAGE_LABELS[event.stage] || event.stage
+    if (event.status === 'started') return `${label} 중`
+    if (event.stage === 'dedup' && event.duplicate_of) {
+      return `${label} 완료 (문서 #${event.duplicate_of} 유사, 청크 ${event.reused_chunks}개 재사용) ${Math.round(event.elapsed_ms)}ms`
+    }
+    const counts = event.chunks !== undefined ? ` (청크 ${event.chunks}개)` : event.pages !== undefined ? ` (${event.pages}페이지)` : ''
+    return `${label} 완료${counts} ${Math.round(event.elapsed_ms)}ms`
+  }
+  if (event.event === 'result') return event.status === 'COMPLETED' ? '완료' : `실패: ${event.message}`
+  return ''
+}
+
 function UploadPage() {
   const [files, setFiles] = useState([])
   const [progress, setProgress] = useState(0)
   const [uploading, setUploading] = useState(false)
   const [message, setMessage] = useState('')
+  const [fileStates, setFileStates] = useState({})
+  const [liveSummary, setLiveSummary] = useState({ title: '', summary: '' })
   const inputRef = useRef(null)
   const navigate = useNavigate()
 
@@ -19,12 +51,52 @@ function UploadPage() {
 
     try {
       setUploading(true)
-      setProgress(20)
-      const result = await summarizeBatch(files)
+      setFileStates({})
+      setLiveSummary({ title: '', summary: '' })
+      setProgress(10)
+
+      // 업로드 후 파일별/단계별 진행 이벤트를 스트림으로 수신, 파일마다 끝나는 즉시 결과 반영
+      // 파일이 하나면 요약 부분 텍스트(summary_delta)까지 받아 생성되는 대로 표시
+      let finished = 0
+      const stream = files.length === 1
+        ? (onEvent) => summarizeStream(files[0], onEvent)
+        : (onEvent) => summarizeBatchStream(files, onEvent)
+      const done = await stream((event) => {
+        if (event.event === 'summary_delta') {
+          setLiveSummary((prev) => ({ ...prev, [event.field]: prev[event.field] + event.text }))
+          return
+        }
+        const key = event.document_id || event.filename
+        if (event.event === 'accepted') {
+          setFileStates((prev) => ({ ...prev, [key]: { filename: event.filename, text: describeEvent(event) } }))
+          return
+        }
+        if (event.event === 'done') return
+        if (event.event === 'result') {
+          finished += 1
+          setProgress(10 + Math.round((90 * finished) / files.length))
+        }
+        setFileStates((prev) => ({
+          ...prev,
+          [key]: { filename: event.filename || prev[key]?.filename || '', text: describeEvent(event) },
+        }))
+      })
+
+      // 워커 미기동 등으로 PENDING 으로 남은 문서는 상태 폴링으로 마무리
+      let results = done?.results || []
+      const pendingIds = results.filter((item) => item.status === 'PENDING').map((item) => item.document_id)
+      let remaining = pendingIds.length
+      while (remaining > 0) {
+        await sleep(POLL_INTERVAL_MS)
+        const status = await fetchBatchStatus(pendingIds)
+        const statusById = new Map(status.results.map((item) => [item.document_id, item]))
+        results = results.map((item) => statusById.get(item.document_id) || item)
+        remaining = results.filter((item) => item.status === 'PENDING').length
+      }
       setProgress(100)
 
-      const completed = result.results.filter((item) => item.status === 'COMPLETED').length
-      const failed = result.results.filter((item) => item.status === 'FAILED').length
+      const completed = results.filter((item) => item.status === 'COMPLETED').length
+      const failed = results.filter((item) => item.status === 'FAILED').length
       setMessage(`완료 ${completed}건 / 실패 ${failed}건`)
       setFiles([])
       if (completed > 0) {
@@ -63,6 +135,15 @@ function UploadPage() {
         </div>
       )}
 
+      {/* 파일별 처리 단계 */}
+      {Object.keys(fileStates).length > 0 && (
+        <div className="w-full text-sm text-muted-foreground">
+          {Object.entries(fileStates).map(([key, state]) => (
+            <p key={key}>{state.filename}: {state.text}</p>
+          ))}
+        </div>
+      )}
+
       {/* 숨겨진 파일 input */}
       <input
         ref={inputRef}
@@ -73,6 +154,14 @@ function UploadPage() {
         onChange={(e) => setFiles(Array.from(e.target.files))}
       />
 
+      {/* 생성 중인 요약 (단일 파일 업로드) */}
+      {liveSummary.summary && (
+        <div className="w-full rounded-md border p-3 text-sm whitespace-pre-wrap">
+          <h3 className="mb-2 text-base font-semibold">{liveSummary.title}</h3>
+          {liveSummary.summary}
+        </div>
+      )}
+
       {/* 업로드 진행률 */}
       {uploading && <Progress value={progress} />}
 